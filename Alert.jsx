@@ -1,65 +1,65 @@
-import React from 'react';
-import { motion } from 'framer-motion';
-import { CheckCircle, AlertCircle, XCircle, Info, X } from 'lucide-react';
-
-const variants = {
-  success: {
-    bg: 'bg-green-50 dark:bg-green-900/20',
-    border: 'border-green-200 dark:border-green-800',
-    text: 'text-green-800 dark:text-green-200',
-    icon: CheckCircle
-  },
-  error: {
-    bg: 'bg-red-50 dark:bg-red-900/20',
-    border: 'border-red-200 dark:border-red-800',
-    text: 'text-red-800 dark:text-red-200',
-    icon: XCircle
-  },
-  warning: {
-    bg: 'bg-yellow-50 dark:bg-yellow-900/20',
-    border: 'border-yellow-200 dark:border-yellow-800',
-    text: 'text-yellow-800 dark:text-yellow-200',
-    icon: AlertCircle
-  },
-  info: {
-    bg: 'bg-blue-50 dark:bg-blue-900/20',
-    border: 'border-blue-200 dark:border-blue-800',
-    text: 'text-blue-800 dark:text-blue-200',
-    icon: Info
-  }
-};
-
-export default function Alert({ type = 'info', title, message, onClose, className = '' }) {
-  const variant = variants[type];
-  const Icon = variant.icon;
-
-  return (
-    <motion.div
-      initial={{ opacity: 0, y: -10 }}
-      animate={{ opacity: 1, y: 0 }}
-      exit={{ opacity: 0, y: -10 }}
-      className={`
-        ${variant.bg} ${variant.border} ${variant.text}
-        border rounded-lg p-4 ${className}
-      `}
-    >
-      <div className="flex items-start">
-        <Icon className="w-5 h-5 mt-0.5 mr-3 flex-shrink-0" />
-        <div className="flex-1">
-          {title && (
-            <h4 className="font-medium mb-1">{title}</h4>
-          )}
-          <p className="text-sm">{message}</p>
-        </div>
-        {onClose && (
-          <button
-            onClick={onClose}
-            className="ml-3 flex-shrink-0 p-1 rounded-md hover:bg-black hover:bg-opacity-10"
-          >
-            <X className="w-4 h-4" />
-          </button>
-        )}
-      </div>
-    </motion.div>
-  );
+import React from 'react';
+import { motion } from 'framer-motion';
+import { CheckCircle, AlertCircle, XCircle, Info, X } from 'lucide-react';
+
+const variants = {
+  success: {
+    bg: 'bg-green-50 dark:bg-green-900/20',
+    border: 'border-green-200 dark:border-green-800',
+    text: 'text-green-800 dark:text-green-200',
+    icon: CheckCircle
+  },
+  error: {
+    bg: 'bg-red-50 dark:bg-red-900/20',
+    border: 'border-red-200 dark:border-red-800',
+    text: 'text-red-800 dark:text-red-200',
+    icon: XCircle
+  },
+  warning: {
+    bg: 'bg-yellow-50 dark:bg-yellow-900/20',
+    border: 'border-yellow-200 dark:border-yellow-800',
+    text: 'text-yellow-800 dark:text-yellow-200',
+    icon: AlertCircle
+  },
+  info: {
+    bg: 'bg-blue-50 dark:bg-blue-900/20',
+    border: 'border-blue-200 dark:border-blue-800',
+    text: 'text-blue-800 dark:text-blue-200',
+    icon: Info
+  }
+};
+
+export default function Alert({ type = 'info', title, message, onClose, className = '' }) {
+  const variant = variants[type];
+  const Icon = variant.icon;
+
+  return (
+    <motion.div
+      initial={{ opacity: 0, y: -10 }}
+      animate={{ opacity: 1, y: 0 }}
+      exit={{ opacity: 0, y: -10 }}
+      className={`
+        ${variant.bg} ${variant.border} ${variant.text}
+        border rounded-lg p-4 ${className}
+      `}
+    >
+      <div className="flex items-start">
+        <Icon className="w-5 h-5 mt-0.5 mr-3 flex-shrink-0" />
+        <div className="flex-1">
+          {title && (
+            <h4 className="font-medium mb-1">{title}</h4>
+          )}
+          <p className="text-sm">{message}</p>
+        </div>
+        {onClose && (
+          <button
+            onClick={onClose}
+            className="ml-3 flex-shrink-0 p-1 rounded-md hover:bg-black hover:bg-opacity-10"
+          >
+            <X className="w-4 h-4" />
+          </button>
+        )}
+      </div>
+    </motion.div>
+  );
 }
\ No newline at end of file
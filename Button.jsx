@@ -1,58 +1,58 @@
-import React from 'react';
-import { motion } from 'framer-motion';
-
-const variants = {
-  primary: 'bg-blue-600 hover:bg-blue-700 text-white',
-  secondary: 'bg-gray-200 hover:bg-gray-300 text-gray-800 dark:bg-gray-700 dark:hover:bg-gray-600 dark:text-white',
-  success: 'bg-green-600 hover:bg-green-700 text-white',
-  danger: 'bg-red-600 hover:bg-red-700 text-white',
-  outline: 'border border-gray-300 dark:border-gray-600 hover:bg-gray-50 dark:hover:bg-gray-700 text-gray-700 dark:text-gray-300'
-};
-
-const sizes = {
-  sm: 'px-3 py-1.5 text-sm',
-  md: 'px-4 py-2',
-  lg: 'px-6 py-3 text-lg'
-};
-
-export default function Button({
-  children,
-  variant = 'primary',
-  size = 'md',
-  className = '',
-  disabled = false,
-  loading = false,
-  startIcon = null,
-  endIcon = null,
-  type = 'button',
-  ...props
-}) {
-  return (
-    <motion.button
-      type={type}
-      whileHover={!disabled && !loading ? { scale: 1.02 } : {}}
-      whileTap={!disabled && !loading ? { scale: 0.98 } : {}}
-      className={`
-        ${variants[variant]}
-        ${sizes[size]}
-        ${className}
-        rounded-lg font-medium transition-colors duration-200
-        disabled:opacity-50 disabled:cursor-not-allowed
-        flex items-center justify-center space-x-2
-      `}
-      disabled={disabled || loading}
-      aria-busy={loading}
-      {...props}
-    >
-      {loading ? (
-        <div className="w-4 h-4 border-2 border-current border-t-transparent rounded-full animate-spin" />
-      ) : (
-        <>
-          {startIcon && <span className="mr-1">{startIcon}</span>}
-          <span>{children}</span>
-          {endIcon && <span className="ml-1">{endIcon}</span>}
-        </>
-      )}
-    </motion.button>
-  );
-}
+import React from 'react';
+import { motion } from 'framer-motion';
+
+const variants = {
+  primary: 'bg-blue-600 hover:bg-blue-700 text-white',
+  secondary: 'bg-gray-200 hover:bg-gray-300 text-gray-800 dark:bg-gray-700 dark:hover:bg-gray-600 dark:text-white',
+  success: 'bg-green-600 hover:bg-green-700 text-white',
+  danger: 'bg-red-600 hover:bg-red-700 text-white',
+  outline: 'border border-gray-300 dark:border-gray-600 hover:bg-gray-50 dark:hover:bg-gray-700 text-gray-700 dark:text-gray-300'
+};
+
+const sizes = {
+  sm: 'px-3 py-1.5 text-sm',
+  md: 'px-4 py-2',
+  lg: 'px-6 py-3 text-lg'
+};
+
+export default function Button({
+  children,
+  variant = 'primary',
+  size = 'md',
+  className = '',
+  disabled = false,
+  loading = false,
+  startIcon = null,
+  endIcon = null,
+  type = 'button',
+  ...props
+}) {
+  return (
+    <motion.button
+      type={type}
+      whileHover={!disabled && !loading ? { scale: 1.02 } : {}}
+      whileTap={!disabled && !loading ? { scale: 0.98 } : {}}
+      className={`
+        ${variants[variant]}
+        ${sizes[size]}
+        ${className}
+        rounded-lg font-medium transition-colors duration-200
+        disabled:opacity-50 disabled:cursor-not-allowed
+        flex items-center justify-center space-x-2
+      `}
+      disabled={disabled || loading}
+      aria-busy={loading}
+      {...props}
+    >
+      {loading ? (
+        <div className="w-4 h-4 border-2 border-current border-t-transparent rounded-full animate-spin" />
+      ) : (
+        <>
+          {startIcon && <span className="mr-1">{startIcon}</span>}
+          <span>{children}</span>
+          {endIcon && <span className="ml-1">{endIcon}</span>}
+        </>
+      )}
+    </motion.button>
+  );
+}
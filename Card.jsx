@@ -1,15 +1,15 @@
-import React from 'react';
-import { motion } from 'framer-motion';
-
-export default function Card({ children, className = '', hover = true, ...props }) {
-  return (
-    <motion.div
-      whileHover={hover ? { y: -2, boxShadow: "0 10px 25px -5px rgba(0, 0, 0, 0.1)" } : {}}
-      transition={{ duration: 0.2 }}
-      className={`bg-white dark:bg-gray-800 rounded-xl shadow-sm border border-gray-200 dark:border-gray-700 ${className}`}
-      {...props}
-    >
-      {children}
-    </motion.div>
-  );
+import React from 'react';
+import { motion } from 'framer-motion';
+
+export default function Card({ children, className = '', hover = true, ...props }) {
+  return (
+    <motion.div
+      whileHover={hover ? { y: -2, boxShadow: "0 10px 25px -5px rgba(0, 0, 0, 0.1)" } : {}}
+      transition={{ duration: 0.2 }}
+      className={`bg-white dark:bg-gray-800 rounded-xl shadow-sm border border-gray-200 dark:border-gray-700 ${className}`}
+      {...props}
+    >
+      {children}
+    </motion.div>
+  );
 }
\ No newline at end of file
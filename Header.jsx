@@ -1,53 +1,53 @@
-import React from 'react';
-import { Menu, Sun, Moon, Bell } from 'lucide-react';
-import { motion } from 'framer-motion';
-
-export default function Header({ darkMode, setDarkMode, sidebarOpen, setSidebarOpen }) {
-  return (
-    <header className="bg-white dark:bg-gray-800 shadow-sm border-b border-gray-200 dark:border-gray-700">
-      <div className="flex items-center justify-between px-6 py-4">
-        <div className="flex items-center space-x-4">
-          <button
-            onClick={() => setSidebarOpen(!sidebarOpen)}
-            className="p-2 rounded-md hover:bg-gray-100 dark:hover:bg-gray-700 lg:hidden"
-          >
-            <Menu className="w-5 h-5 text-gray-600 dark:text-gray-300" />
-          </button>
-          
-          <div>
-            <h2 className="text-lg font-semibold text-gray-800 dark:text-white">
-              Gestion Mutualiste
-            </h2>
-            <p className="text-sm text-gray-500 dark:text-gray-400">
-              Système de gestion MODEP
-            </p>
-          </div>
-        </div>
-
-        <div className="flex items-center space-x-4">
-          <button className="p-2 rounded-md hover:bg-gray-100 dark:hover:bg-gray-700 relative">
-            <Bell className="w-5 h-5 text-gray-600 dark:text-gray-300" />
-            <span className="absolute -top-1 -right-1 w-3 h-3 bg-red-500 rounded-full"></span>
-          </button>
-
-          <motion.button
-            whileHover={{ scale: 1.05 }}
-            whileTap={{ scale: 0.95 }}
-            onClick={() => setDarkMode(!darkMode)}
-            className="p-2 rounded-md hover:bg-gray-100 dark:hover:bg-gray-700 transition-colors duration-200"
-          >
-            {darkMode ? (
-              <Sun className="w-5 h-5 text-yellow-500" />
-            ) : (
-              <Moon className="w-5 h-5 text-gray-600" />
-            )}
-          </motion.button>
-
-          <div className="w-8 h-8 bg-gradient-to-r from-blue-500 to-purple-600 rounded-full flex items-center justify-center">
-            <span className="text-white text-sm font-medium">A</span>
-          </div>
-        </div>
-      </div>
-    </header>
-  );
+import React from 'react';
+import { Menu, Sun, Moon, Bell } from 'lucide-react';
+import { motion } from 'framer-motion';
+
+export default function Header({ darkMode, setDarkMode, sidebarOpen, setSidebarOpen }) {
+  return (
+    <header className="bg-white dark:bg-gray-800 shadow-sm border-b border-gray-200 dark:border-gray-700">
+      <div className="flex items-center justify-between px-6 py-4">
+        <div className="flex items-center space-x-4">
+          <button
+            onClick={() => setSidebarOpen(!sidebarOpen)}
+            className="p-2 rounded-md hover:bg-gray-100 dark:hover:bg-gray-700 lg:hidden"
+          >
+            <Menu className="w-5 h-5 text-gray-600 dark:text-gray-300" />
+          </button>
+          
+          <div>
+            <h2 className="text-lg font-semibold text-gray-800 dark:text-white">
+              Gestion Mutualiste
+            </h2>
+            <p className="text-sm text-gray-500 dark:text-gray-400">
+              Système de gestion MODEP
+            </p>
+          </div>
+        </div>
+
+        <div className="flex items-center space-x-4">
+          <button className="p-2 rounded-md hover:bg-gray-100 dark:hover:bg-gray-700 relative">
+            <Bell className="w-5 h-5 text-gray-600 dark:text-gray-300" />
+            <span className="absolute -top-1 -right-1 w-3 h-3 bg-red-500 rounded-full"></span>
+          </button>
+
+          <motion.button
+            whileHover={{ scale: 1.05 }}
+            whileTap={{ scale: 0.95 }}
+            onClick={() => setDarkMode(!darkMode)}
+            className="p-2 rounded-md hover:bg-gray-100 dark:hover:bg-gray-700 transition-colors duration-200"
+          >
+            {darkMode ? (
+              <Sun className="w-5 h-5 text-yellow-500" />
+            ) : (
+              <Moon className="w-5 h-5 text-gray-600" />
+            )}
+          </motion.button>
+
+          <div className="w-8 h-8 bg-gradient-to-r from-blue-500 to-purple-600 rounded-full flex items-center justify-center">
+            <span className="text-white text-sm font-medium">A</span>
+          </div>
+        </div>
+      </div>
+    </header>
+  );
 }
\ No newline at end of file
@@ -0,0 +1,90 @@
+# api/adhesion.py
+"""État d'adhésion : le droit de l'adhérent et sa cotisation évoluent ensemble.
+
+Les signaux (signals.py) appellent ces fonctions après l'enregistrement. La
+valeur d'origine (a_droit, cotisation) est gardée en mémoire à la lecture :
+aucune relecture de la ligne, et chaque ligne est écrite au plus une fois.
+"""
+from dateutil.relativedelta import relativedelta
+from django.utils import timezone
+
+from . import modifications, recherche, stats
+from .models import Adherent, Cotisation
+
+DUREE = relativedelta(months=+1)
+
+DROIT_PAR_COTISATION = {'oui': 'ayant_droit', 'non': 'sans_droit'}
+
+
+def valeur_suivie(instance):
+    """Champ pilotant l'autre côté, tel que chargé (None si différé)."""
+    champ = 'a_droit' if isinstance(instance, Adherent) else 'cotisation'
+    return instance.__dict__.get(champ)
+
+
+def appliquer_droit(cotisation, a_droit, aujourd_hui=None):
+    """Aligne une cotisation (en mémoire) sur le droit de l'adhérent."""
+    if a_droit == 'ayant_droit':
+        cotisation.cotisation = 'oui'
+        cotisation.date_debut = aujourd_hui or timezone.now().date()
+        cotisation.date_fin = cotisation.date_debut + DUREE
+    else:
+        cotisation.cotisation = 'non'
+        cotisation.date_debut = None
+        cotisation.date_fin = None
+    return cotisation
+
+
+def cotisation_initiale(adherent, aujourd_hui=None):
+    """Cotisation (non enregistrée) d'un nouvel adhérent : un mois à partir d'aujourd'hui s'il a droit."""
+    return appliquer_droit(Cotisation(adherent=adherent, cin=adherent.cin), adherent.a_droit, aujourd_hui)
+
+
+def adherent_enregistre(adherent, created):
+    """Crée la cotisation d'un nouvel adhérent, ou la resynchronise si son droit a changé."""
+    avant, adherent._adhesion_valeur = adherent._adhesion_valeur, valeur_suivie(adherent)
+    if created:
+        cotisation = cotisation_initiale(adherent)
+    elif adherent._adhesion_valeur is None or adherent._adhesion_valeur == avant:
+        return
+    else:
+        # Une cotisation par adhérent (CIN unique) ; créée si elle manque
+        cotisation = adherent.cotisations.first()
+        if cotisation is not None:
+            appliquer_droit(cotisation, adherent.a_droit)
+        elif adherent.a_droit == 'ayant_droit':
+            cotisation = cotisation_initiale(adherent)
+        else:
+            return
+    cotisation._disable_signal = True
+    cotisation.save()
+
+
+def cotisation_enregistree(cotisation, created):
+    """Reporte le statut d'une cotisation modifiée sur le droit de l'adhérent.
+
+    Un seul UPDATE ciblé (sans relire l'adhérent) ; les compteurs et le cache
+    de suggestions sont ajustés comme pour un renouvellement en masse.
+    """
+    avant, cotisation._adhesion_valeur = cotisation._adhesion_valeur, valeur_suivie(cotisation)
+    if getattr(cotisation, '_disable_signal', False) or created:
+        return
+    if cotisation._adhesion_valeur is None or cotisation._adhesion_valeur == avant:
+        return
+
+    a_droit = DROIT_PAR_COTISATION[cotisation.cotisation]
+    ancien = 'sans_droit' if a_droit == 'ayant_droit' else 'ayant_droit'
+    modifies = Adherent.objects.filter(pk=cotisation.adherent_id, a_droit=ancien).update(a_droit=a_droit)
+    stats.deplacer('adherents_droit', ancien, a_droit, modifies)
+    if modifies:
+        modifications.journaliser(Adherent, [cotisation.adherent_id])
+
+    # Adhérent déjà chargé (select_related) : même valeur en mémoire, sans nouvelle cascade
+    if Cotisation.adherent.is_cached(cotisation):
+        adherent = cotisation.adherent
+        adherent.a_droit = a_droit
+        adherent._adhesion_valeur = a_droit
+        if 'a_droit' in getattr(adherent, '_stats_valeurs', {}):
+            adherent._stats_valeurs['a_droit'] = a_droit
+    if modifies:
+        recherche.cache_suggestions.clear()
@@ -1,9 +1,10 @@
-from django.contrib import admin
-from .models import Adherent, Cotisation, Soin
-
-# Register your models here.
-
-admin.site.register(Adherent)
-admin.site.register(Cotisation)
-admin.site.register(Soin)
-
+from django.contrib import admin
+from .models import Adherent, Cotisation, Soin, Statistique, TachePdf
+
+# Register your models here.
+
+admin.site.register(Adherent)
+admin.site.register(Cotisation)
+admin.site.register(Soin)
+admin.site.register(Statistique)
+admin.site.register(TachePdf)
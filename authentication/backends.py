@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+
+TAILLE_MAX = 1000
+
+# id -> (échéance, modèle, base, champs, valeurs), propre au processus
+_utilisateurs = {}
+
+
+def invalider(user_id):
+    _utilisateurs.pop(user_id, None)
+
+
+def vider():
+    _utilisateurs.clear()
+
+
+def _instance(entree):
+    # Instance neuve à chaque requête : rien de partagé entre threads (cache des permissions, last_login)
+    _, modele, base, champs, valeurs = entree
+    return modele.from_db(base, champs, valeurs)
+
+
+class CacheModelBackend(ModelBackend):
+    """ModelBackend dont get_user(), appelé à chaque requête authentifiée par session,
+    garde l'utilisateur en mémoire du processus pendant AUTH_CACHE_TTL secondes.
+
+    L'entrée est retirée à la déconnexion et à tout enregistrement de l'utilisateur
+    (mot de passe, is_active...) dans ce processus (signals.py) ; les autres
+    processus la relisent au plus tard à l'échéance.
+    """
+
+    def get_user(self, user_id):
+        maintenant = time.monotonic()
+        entree = _utilisateurs.get(user_id)
+        if entree is not None and entree[0] > maintenant:
+            return _instance(entree)
+        user = super().get_user(user_id)
+        if user is None:
+            return None
+        if len(_utilisateurs) >= TAILLE_MAX:
+            _utilisateurs.clear()
+        # Valeurs des champs seulement (immuables) : l'instance lue n'est jamais partagée
+        champs = [champ.attname for champ in user._meta.concrete_fields]
+        entree = (maintenant + getattr(settings, 'AUTH_CACHE_TTL', 30), type(user), user._state.db,
+                  champs, [getattr(user, champ) for champ in champs])
+        _utilisateurs[user_id] = entree
+        return user
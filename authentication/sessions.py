@@ -0,0 +1,32 @@
+"""Sessions « cached_db » lues dans le cache local du processus, écrites en base.
+
+Les entrées du cache expirent après AUTH_CACHE_TTL secondes au plus (et non à
+l'expiration de la session) : une déconnexion faite dans un autre worker y est
+vue dans ce délai, la base restant la référence.
+"""
+from django.conf import settings
+from django.contrib.sessions.backends import cached_db
+
+
+class _CacheBorne:
+    """Cache dont les durées de conservation sont plafonnées à `ttl` secondes."""
+
+    def __init__(self, cache, ttl):
+        self._cache = cache
+        self._ttl = ttl
+
+    def set(self, key, value, timeout=None, version=None):
+        timeout = self._ttl if timeout is None else min(timeout, self._ttl)
+        return self._cache.set(key, value, timeout, version=version)
+
+    def __contains__(self, key):
+        return key in self._cache
+
+    def __getattr__(self, nom):
+        return getattr(self._cache, nom)
+
+
+class SessionStore(cached_db.SessionStore):
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._cache = _CacheBorne(self._cache, getattr(settings, 'AUTH_CACHE_TTL', 30))
@@ -0,0 +1,20 @@
+from django.contrib.auth.models import User
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import backends
+
+
+# ✅ Cache des utilisateurs (voir backends.py) : plus d'entrée périmée dans ce processus
+@receiver(user_logged_out)
+def oublier_utilisateur_deconnecte(sender, request, user, **kwargs):
+    if user is not None:
+        backends.invalider(user.pk)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def oublier_utilisateur_modifie(sender, instance, **kwargs):
+    # Mot de passe, is_active, droits : la prochaine requête relit l'utilisateur
+    backends.invalider(instance.pk)
@@ -0,0 +1,73 @@
+from unittest import mock
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from authentication import backends
+
+BACKEND = 'authentication.backends.CacheModelBackend'
+
+
+class CacheAuthentificationTests(TestCase):
+    def setUp(self):
+        backends.vider()
+        self.addCleanup(backends.vider)
+        self.user = User.objects.create_user('agent', password='motdepasse1')
+
+    def test_requete_sans_lecture_session_ni_utilisateur(self):
+        self.client.force_login(self.user, backend=BACKEND)
+        self.client.get('/api/dashboard/stats/')
+        with CaptureQueriesContext(connection) as requetes:
+            response = self.client.get('/api/dashboard/stats/')
+        self.assertEqual(response.wsgi_request.user, self.user)
+        # Seuls les compteurs du tableau de bord sont lus
+        self.assertEqual(len(requetes), 1)
+
+    def test_invalidation(self):
+        backend = backends.CacheModelBackend()
+        backend.get_user(self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(backend.get_user(self.user.pk), self.user)
+
+        self.user.set_password('nouveau-mot-de-passe')
+        self.user.save()
+        with self.assertNumQueries(1):
+            self.assertTrue(backend.get_user(self.user.pk).check_password('nouveau-mot-de-passe'))
+
+        self.client.force_login(self.user, backend=BACKEND)
+        self.client.logout()
+        with self.assertNumQueries(1):
+            backend.get_user(self.user.pk)
+
+    def test_mot_de_passe_change_ferme_les_sessions(self):
+        self.client.force_login(self.user, backend=BACKEND)
+        self.assertTrue(self.client.get('/api/dashboard/stats/').wsgi_request.user.is_authenticated)
+        self.user.set_password('nouveau-mot-de-passe')
+        self.user.save()
+        self.assertFalse(self.client.get('/api/dashboard/stats/').wsgi_request.user.is_authenticated)
+
+    def test_instances_independantes(self):
+        backend = backends.CacheModelBackend()
+        backend.get_user(self.user.pk)
+        premier, second = backend.get_user(self.user.pk), backend.get_user(self.user.pk)
+        self.assertIsNot(premier, second)
+        premier.get_all_permissions()
+        premier.first_name = 'Modifie'
+        self.assertFalse(hasattr(second, '_perm_cache'))
+        self.assertEqual(second.first_name, '')
+        self.assertFalse(second._state.adding)
+
+    def test_sessions_ouvertes_avec_model_backend(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertTrue(self.client.get('/api/dashboard/stats/').wsgi_request.user.is_authenticated)
+
+    def test_echec_laisse_la_main_aux_backends_suivants(self):
+        with mock.patch.object(ModelBackend, 'authenticate', autospec=True, return_value=None) as verifier:
+            self.assertIsNone(authenticate(username='agent', password='faux'))
+        self.assertEqual([type(appel.args[0]) for appel in verifier.call_args_list],
+                         [backends.CacheModelBackend, ModelBackend])
+        self.assertEqual(authenticate(username='agent', password='motdepasse1'), self.user)
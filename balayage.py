@@ -0,0 +1,57 @@
+# api/balayage.py
+"""Balayage des échéances : les cotisations arrivées à date_fin passent à 'non'.
+
+Seules les échéances franchies depuis le passage précédent sont traitées,
+plus les cotisations écrites depuis (journal des modifications) : une date_fin
+saisie ou importée déjà sous la marque est expirée au passage suivant. La date
+et le curseur du journal atteints sont gardés en base (MarqueReprise) et
+avancés dans la même transaction que l'expiration. Relancer le balayage le
+même jour sans écriture ne coûte que deux lectures ; un passage interrompu est
+simplement refait en entier. Le balayage compacte aussi le journal des
+modifications, une fois par jour (compacter_journal).
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from . import modifications, renouvellement
+from .models import MarqueReprise
+
+MARQUE = 'expiration_cotisations'
+COMPACTION = 'compaction_modifications'
+
+
+def balayer(jour=None, complet=False, dry_run=False):
+    """Expire les cotisations échues entre la marque et `jour` (exclu), ou écrites depuis le passage précédent.
+
+    `complet` ignore la marque : rattrape une date_fin modifiée hors journal (UPDATE direct en base).
+    """
+    jour = jour or timezone.now().date()
+    with transaction.atomic():
+        # Verrou sur la marque : deux balayages simultanés ne traitent pas le même intervalle
+        marque, _ = MarqueReprise.objects.select_for_update().get_or_create(nom=MARQUE)
+        depuis, curseur = (None, None) if complet else (marque.valeur, marque.curseur)
+        if depuis is not None and depuis >= jour and curseur == modifications.curseur_actuel():
+            return {'operation': 'expirer', 'section': None, 'dry_run': dry_run, 'date_reference': jour,
+                    'depuis': depuis, 'cotisations': 0, 'adherents': 0}
+
+        rapport = renouvellement.expirer(date_reference=jour, dry_run=dry_run, depuis=depuis,
+                                         curseur=curseur or 0)
+        if not dry_run:
+            # Lu après l'expiration : ses propres lignes de journal ne sont pas reprises au passage suivant
+            marque.valeur = max(jour, depuis or jour)
+            marque.curseur = modifications.curseur_actuel()
+            marque.save(update_fields=['valeur', 'curseur', 'maj_le'])
+    return rapport
+
+
+def compacter_journal(jour=None):
+    """Compacte le journal des modifications si ce n'est pas déjà fait ce jour ; renvoie les lignes supprimées."""
+    jour = jour or timezone.now().date()
+    with transaction.atomic():
+        marque, _ = MarqueReprise.objects.select_for_update().get_or_create(nom=COMPACTION)
+        if marque.valeur is not None and marque.valeur >= jour:
+            return 0
+        supprimees = modifications.compacter()
+        marque.valeur = jour
+        marque.save(update_fields=['valeur', 'maj_le'])
+    return supprimees
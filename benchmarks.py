@@ -0,0 +1,247 @@
+# api/benchmarks.py
+"""Suite de benchmarks de l'API (commande bench_api).
+
+Chaque scénario rejoue une requête HTTP (client de test Django) sur un jeu de
+données synthétique : centiles de latence, nombre de requêtes SQL et pic
+mémoire (tracemalloc) sont enregistrés en JSON et comparés à une référence,
+par défaut celle versionnée avec le code (bench_api_reference.json).
+"""
+import os
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import date
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.db.models import Max, Min
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from . import donnees_synthetiques
+from .models import Cotisation, Soin
+
+# Jeux de données : (adhérents, soins)
+ECHELLES = {'10k': (1000, 10000), '100k': (10000, 100000), '1m': (50000, 1000000)}
+MESURES_DUREE = ('p50_ms', 'p90_ms')
+SEUIL_DUREE_MS = 1.0  # écart absolu ignoré (bruit de mesure)
+SEUIL_MEMOIRE_KO = 64
+# Référence versionnée : médiane de 5 passages bench_api --echelle 10k sur SQLite, à régénérer après un gain voulu
+# (sans recu_pdf, qui dépend des bibliothèques natives de WeasyPrint : scénario absent = non comparé)
+REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_api_reference.json')
+META_COMPARABLE = ('adherents', 'soins', 'base')
+
+SCENARIOS = {}
+
+
+def scenario(nom):
+    def enregistrer(fonction):
+        SCENARIOS[nom] = fonction
+        return fonction
+    return enregistrer
+
+
+def client():
+    # Premier hôte explicite de ALLOWED_HOSTS ; avec DEBUG et une liste vide, localhost est accepté
+    hote = next((h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')), 'localhost')
+    return Client(HTTP_HOST=hote)
+
+
+class Contexte:
+    """Client HTTP et bornes des ids du jeu de données, partagés par les scénarios."""
+
+    def __init__(self, client, rng):
+        self.client = client
+        self.rng = rng
+        self.appels = 0
+        self.soins = Soin.objects.aggregate(min=Min('id'), max=Max('id'))
+        self.cotisations = Cotisation.objects.aggregate(min=Min('id'), max=Max('id'))
+        self.soin_pdf = self.soins['min']
+
+    def numero(self):
+        # Paramètre distinct à chaque appel : mesure la réponse calculée, pas le cache des réponses
+        self.appels += 1
+        return self.appels
+
+    def id_au_hasard(self, bornes):
+        return self.rng.randint(bornes['min'], bornes['max'])
+
+    def verifier(self, response):
+        if response.status_code >= 400:
+            raise RuntimeError(f"{response.status_code} sur {response.request['PATH_INFO']}")
+        return response
+
+    def get(self, url, **params):
+        return self.verifier(self.client.get(url, params))
+
+    def envoyer(self, methode, url, donnees):
+        return self.verifier(getattr(self.client, methode)(url, donnees, content_type='application/json'))
+
+
+@scenario('liste_adherents')
+def _liste_adherents(ctx):
+    return ctx.get('/api/adherents/', page_size=50, _=ctx.numero())
+
+
+@scenario('liste_soins')
+def _liste_soins(ctx):
+    return ctx.get('/api/soins/', page_size=50, _=ctx.numero())
+
+
+@scenario('liste_soins_compacte')
+def _liste_soins_compacte(ctx):
+    return ctx.get('/api/soins/', page_size=50, compact=1, expand='adherent', _=ctx.numero())
+
+
+@scenario('filtre_adherents')
+def _filtre_adherents(ctx):
+    return ctx.get('/api/adherents/', statut='retraite', a_droit='ayant_droit', _=ctx.numero())
+
+
+@scenario('filtre_soins')
+def _filtre_soins(ctx):
+    mois = date.today().replace(day=1)
+    return ctx.get('/api/soins/', date_soin__year=mois.year, date_soin__month=mois.month,
+                   statut_dossier='rejet', _=ctx.numero())
+
+
+@scenario('recherche')
+def _recherche(ctx):
+    return ctx.get('/api/adherents/', search=ctx.rng.choice(donnees_synthetiques.NOMS)[:4], _=ctx.numero())
+
+
+@scenario('etat_expire_dans')
+def _etat_expire_dans(ctx):
+    return ctx.get('/api/adherents/etat/', expire_dans=7, _=ctx.numero())
+
+
+@scenario('creation_adherent')
+def _creation_adherent(ctx):
+    numero = ctx.numero()
+    return ctx.envoyer('post', '/api/adherents/', {
+        'nom': 'Bench', 'prenom': f'P{numero}', 'date_naissance': '1985-06-01', 'cin': f'BA{numero:07d}',
+        'sexe': 'homme', 'statut': 'actif', 'a_droit': 'ayant_droit', 'numero_tel': '0600000000',
+        'rib': '0' * 24, 'ville': 'Casablanca', 'adresse': 'Port', 'salaire': '8000.00',
+        'organisme_employeur': 'marsa_maroc', 'section_cotisation': 'marsa_maroc',
+    })
+
+
+@scenario('maj_cotisation')
+def _maj_cotisation(ctx):
+    # Bascule oui/non : droit de l'adhérent, compteurs, situation et journal suivent
+    cotisation_id = ctx.id_au_hasard(ctx.cotisations)
+    valeur = 'oui' if ctx.numero() % 2 else 'non'
+    return ctx.envoyer('patch', f'/api/cotisations/{cotisation_id}/', {'cotisation': valeur})
+
+
+@scenario('creation_soin')
+def _creation_soin(ctx):
+    soin = Soin.objects.values('adherent_id').get(id=ctx.id_au_hasard(ctx.soins))
+    jour = date.today().isoformat()
+    return ctx.envoyer('post', '/api/soins/', {
+        'adherent_id': soin['adherent_id'], 'num_recu': f'B{ctx.numero()}', 'statut_dossier': 'recu',
+        'montant_dossier': '250.00', 'type_beneficier': 'Adherent', 'date_soin': jour, 'date_fin_soin': jour,
+    })
+
+
+@scenario('saisie_lot')
+def _saisie_lot(ctx):
+    # 200 dossiers en une requête (à comparer à 200 fois creation_soin)
+    soin = Soin.objects.values('adherent_id').get(id=ctx.id_au_hasard(ctx.soins))
+    jour = date.today().isoformat()
+    numero = ctx.numero()
+    return ctx.envoyer('post', '/api/soins/lot/', [{
+        'adherent_id': soin['adherent_id'], 'num_recu': f'L{numero}-{i}', 'statut_dossier': 'recu',
+        'montant_dossier': '250.00', 'type_beneficier': 'Adherent', 'date_soin': jour, 'date_fin_soin': jour,
+    } for i in range(200)])
+
+
+@scenario('recu_pdf')
+def _recu_pdf(ctx):
+    # Un reçu différent à chaque appel : rendu WeasyPrint (cache PDF vide pour ce soin)
+    ctx.soin_pdf += 1
+    return ctx.verifier(ctx.client.get(f'/recu/{ctx.soin_pdf}/'))
+
+
+@scenario('dashboard')
+def _dashboard(ctx):
+    return ctx.get('/api/dashboard/stats/')
+
+
+@scenario('rapport_soins')
+def _rapport_soins(ctx):
+    return ctx.get('/api/soins/rapport/', grouper='organisme,statut', _=ctx.numero())
+
+
+def centile(valeurs, rang):
+    """Centile au rang le plus proche (valeurs triées)."""
+    valeurs = sorted(valeurs)
+    return valeurs[max(0, min(len(valeurs) - 1, round(rang / 100 * len(valeurs)) - 1))]
+
+
+def mesurer(fonction, ctx, repetitions):
+    durees, requetes = [], []
+    fonction(ctx)  # échauffement : templates, caches de processus
+    for _ in range(repetitions):
+        with CaptureQueriesContext(connection) as capture:
+            debut = time.perf_counter()
+            fonction(ctx)
+            durees.append((time.perf_counter() - debut) * 1000)
+        requetes.append(len(capture))
+    # Pic mémoire sur un appel séparé : tracemalloc ralentit les appels mesurés
+    tracemalloc.start()
+    try:
+        fonction(ctx)
+        pic = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'p50_ms': round(statistics.median(durees), 3),
+        'p90_ms': round(centile(durees, 90), 3),
+        'p99_ms': round(centile(durees, 99), 3),
+        'max_ms': round(max(durees), 3),
+        'requetes': round(statistics.median(requetes)),
+        'memoire_ko': round(pic / 1024, 1),
+    }
+
+
+def meta(adherents, soins, repetitions):
+    return {
+        'date': date.today().isoformat(), 'adherents': adherents, 'soins': soins, 'repetitions': repetitions,
+        'base': connection.vendor, 'python': platform.python_version(), 'django': django.get_version(),
+    }
+
+
+def ecarts_meta(resultats, reference):
+    """Différences de jeu de données ou de base qui rendent la référence non comparable."""
+    return [
+        f"{cle} {reference.get('meta', {}).get(cle)} -> {resultats['meta'][cle]}"
+        for cle in META_COMPARABLE if reference.get('meta', {}).get(cle) != resultats['meta'][cle]
+    ]
+
+
+def comparer(resultats, reference, tolerance=0.25):
+    """Régressions de `resultats` par rapport à `reference` (même format JSON).
+
+    Durées et mémoire : au-delà de `tolerance` (relative) et d'un seuil absolu ;
+    requêtes SQL : toute augmentation.
+    """
+    regressions = []
+    for nom, mesures in resultats['scenarios'].items():
+        avant = reference.get('scenarios', {}).get(nom)
+        if avant is None:
+            continue
+        for mesure in MESURES_DUREE + ('memoire_ko', 'requetes'):
+            ancien, nouveau = avant.get(mesure), mesures[mesure]
+            if ancien is None:
+                continue
+            if mesure == 'requetes':
+                regresse = nouveau > ancien
+            else:
+                seuil = SEUIL_MEMOIRE_KO if mesure == 'memoire_ko' else SEUIL_DUREE_MS
+                regresse = nouveau > ancien * (1 + tolerance) and nouveau - ancien > seuil
+            if regresse:
+                regressions.append({'scenario': nom, 'mesure': mesure, 'reference': ancien, 'actuel': nouveau})
+    return regressions
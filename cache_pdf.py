@@ -0,0 +1,126 @@
+# api/cache_pdf.py
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+from django.conf import settings
+
+from . import rendu_pdf
+
+# Intervalle minimal entre deux purges automatiques (par processus)
+INTERVALLE_PURGE = 600
+_derniere_purge = 0.0
+
+
+def dossier_cache():
+    return os.path.join(settings.MEDIA_ROOT, 'pdf_cache')
+
+
+def empreinte(template_name, html_string):
+    """Hash du source du template (et de sa feuille de style) et du HTML rendu : identifie un PDF."""
+    h = hashlib.sha256()
+    h.update(rendu_pdf.source(template_name).encode('utf-8'))
+    h.update(b'\0')
+    h.update(html_string.encode('utf-8'))
+    return h.hexdigest()
+
+
+def chemin_cache(cle):
+    return os.path.join(dossier_cache(), cle[:2], f'{cle}.pdf')
+
+
+def marquer_acces(chemin):
+    """Note que le PDF vient d'être servi (ou revalidé) : atime posé explicitement, mtime inchangé.
+
+    La purge suit l'atime ; mtime reste la date d'écriture du contenu.
+    """
+    try:
+        os.utime(chemin, (time.time(), os.stat(chemin).st_mtime))
+    except FileNotFoundError:
+        pass
+
+
+def obtenir(cle, template_name, html_string):
+    """Renvoie le chemin du PDF en cache, en le rendant seulement s'il n'existe pas."""
+    chemin = chemin_cache(cle)
+    if os.path.exists(chemin):
+        marquer_acces(chemin)
+        return chemin
+
+    os.makedirs(os.path.dirname(chemin), exist_ok=True)
+    fd, temporaire = tempfile.mkstemp(suffix='.pdf', dir=os.path.dirname(chemin))
+    try:
+        with os.fdopen(fd, 'wb') as fichier:
+            rendu_pdf.ecrire_pdf(template_name, html_string, fichier)
+        os.replace(temporaire, chemin)
+    except BaseException:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+
+    # Jamais le PDF que l'appelant va ouvrir, même plus gros que PDF_CACHE_TAILLE_MAX
+    purger_si_necessaire(garder=chemin)
+    return chemin
+
+
+def rendre(template_name, html_string):
+    return obtenir(empreinte(template_name, html_string), template_name, html_string)
+
+
+def publier(chemin, destination):
+    """Place le PDF du cache à `destination` (lien physique, sinon copie) s'il a changé."""
+    if os.path.exists(destination):
+        if os.path.samefile(chemin, destination):
+            return destination
+        os.remove(destination)
+    try:
+        os.link(chemin, destination)
+    except OSError:
+        shutil.copyfile(chemin, destination)
+    return destination
+
+
+def purger(taille_max=None, age_max=None, garder=None):
+    """Supprime les PDF non servis depuis `age_max`, puis les moins récemment servis au-delà de la taille max.
+
+    `garder` : chemin à ne pas supprimer (compté dans la taille).
+    """
+    if taille_max is None:
+        taille_max = getattr(settings, 'PDF_CACHE_TAILLE_MAX', 500 * 1024 * 1024)
+    if age_max is None:
+        age_max = getattr(settings, 'PDF_CACHE_AGE_MAX', 90 * 24 * 3600)
+
+    racine = dossier_cache()
+    if not os.path.isdir(racine):
+        return 0
+
+    fichiers = []
+    for dossier, _, noms in os.walk(racine):
+        for nom in noms:
+            if nom.endswith('.pdf'):
+                chemin = os.path.join(dossier, nom)
+                stat = os.stat(chemin)
+                fichiers.append((stat.st_atime, stat.st_size, chemin))
+
+    limite = time.time() - age_max
+    fichiers.sort()
+    total = sum(taille for _, taille, _ in fichiers)
+    supprimes = 0
+    for acces, taille, chemin in fichiers:
+        if acces >= limite and total <= taille_max:
+            break
+        if garder is not None and chemin == garder:
+            continue
+        os.remove(chemin)
+        total -= taille
+        supprimes += 1
+    return supprimes
+
+
+def purger_si_necessaire(garder=None):
+    global _derniere_purge
+    if time.time() - _derniere_purge >= INTERVALLE_PURGE:
+        _derniere_purge = time.time()
+        purger(garder=garder)
@@ -0,0 +1,88 @@
+# api/cache_reponses.py
+"""ETag et cache des réponses GET des listes et fiches (adhérents, cotisations, soins).
+
+La version d'une table est le dernier id de son journal (modifications.py) :
+une lecture sur index, la même pour tous les processus. Toute écriture change
+la version, donc l'ETag et la clé du cache : il n'y a rien à purger, les
+anciennes entrées expirent d'elles-mêmes.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Subquery
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+from . import modifications
+from .models import Modification
+
+ALIAS = 'reponses'
+
+
+def cache():
+    # Cache dédié s'il est configuré (settings.CACHES['reponses']), sinon le cache par défaut
+    return caches[ALIAS if ALIAS in settings.CACHES else 'default']
+
+
+def versions(tables):
+    """Id et date de la dernière écriture de chaque table, en une requête (une lecture d'index par table).
+
+    La date distingue un id réutilisé après un rollback (SQLite).
+    """
+    dernieres = [
+        Subquery(Modification.objects.filter(table=table).order_by('-id').values('id')[:1])
+        for table in tables
+    ]
+    lignes = {
+        table: (id_, date)
+        for table, id_, date in Modification.objects.filter(id__in=dernieres).values_list('table', 'id', 'date')
+    }
+    return tuple(lignes.get(table) for table in tables)
+
+
+def empreinte(request, versions_tables):
+    """Clé de la réponse : URL absolue, format négocié et versions des tables lues.
+
+    Le schéma et l'hôte en font partie : les liens de pagination sont absolus.
+    """
+    source = '|'.join([request.build_absolute_uri(), request.accepted_media_type or '',
+                       repr(versions_tables)])
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+class CacheReponseMixin:
+    """list() et retrieve() : 304 si l'ETag du client est à jour, sinon données sérialisées en cache.
+
+    `tables_cache` : autres tables lues par le serializer (ex. l'adhérent imbriqué d'un soin).
+    """
+    tables_cache = ()
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('stream'):
+            # Export NDJSON (StreamingListMixin) : jamais mis en cache
+            return super().list(request, *args, **kwargs)
+        return self._conditionnelle(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._conditionnelle(request, super().retrieve, *args, **kwargs)
+
+    def _conditionnelle(self, request, vue, *args, **kwargs):
+        tables = (modifications.TABLES[self.queryset.model],) + tuple(self.tables_cache)
+        cle = empreinte(request, versions(tables))
+        etag = f'"{cle[:32]}"'
+        non_modifie = get_conditional_response(request, etag=etag)
+        if non_modifie is not None:
+            return non_modifie
+
+        donnees = cache().get(cle)
+        if donnees is None:
+            response = vue(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            cache().set(cle, response.data)
+        else:
+            response = Response(donnees)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
@@ -0,0 +1,124 @@
+# api/donnees_synthetiques.py
+"""Jeux de données synthétiques pour les commandes de benchmark (bench_*)."""
+import random
+from contextlib import contextmanager
+from datetime import date, timedelta
+from itertools import accumulate
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+
+from . import import_adherents, modifications, rapports_soins, stats
+from .models import Adherent, Cotisation, Soin
+
+NOMS = ['Alaoui', 'Bennani', 'Chraibi', 'El Idrissi', 'Fassi', 'Haddad', 'Lahlou', 'Mansouri',
+        'Naciri', 'Ouazzani', 'Rami', 'Saidi', 'Tazi', 'Zahraoui']
+PRENOMS = ['Ahmed', 'Fatima', 'Hélène', 'Karim', 'Leila', 'Mohamed', 'Nadia', 'Omar', 'Salma', 'Youssef']
+VILLES = ['Casablanca', 'Agadir', 'Tanger', 'Mohammedia', 'Safi', 'Nador', 'Jorf Lasfar']
+# Répartition approximative des effectifs portuaires
+ORGANISMES = [('anp', 0.35), ('marsa_maroc', 0.55), ('modep', 0.10)]
+BENEFICIAIRES = [('Adherent', 0.6), ('Conjoint', 0.25), ('Enfant', 0.15)]
+
+
+class _Annulation(Exception):
+    pass
+
+
+@contextmanager
+def jetable():
+    """Transaction annulée à la sortie : les données de benchmark ne restent pas en base."""
+    try:
+        with transaction.atomic():
+            yield
+            raise _Annulation
+    except _Annulation:
+        pass
+
+
+def _choix_pondere(rng, options):
+    return rng.choices([o for o, _ in options], weights=[p for _, p in options])[0]
+
+
+def adherents(debut, fin, rng=None, prefixe_cin='BK'):
+    """Instances Adherent (non enregistrées) numérotées de `debut` à `fin`.
+
+    Âge de 22 à 75 ans ; retraités à partir de 60 ans ; recrutement après 20 ans.
+    """
+    rng = rng or random.Random(42)
+    aujourd_hui = date.today()
+    lignes = []
+    for i in range(debut, fin):
+        organisme = _choix_pondere(rng, ORGANISMES)
+        age = rng.randint(22, 75)
+        retraite = age >= 60 and rng.random() < 0.85
+        lignes.append(Adherent(
+            nom=f'{rng.choice(NOMS)}{i}', prenom=rng.choice(PRENOMS),
+            date_naissance=aujourd_hui - timedelta(days=age * 365 + rng.randint(0, 364)),
+            cin=f'{prefixe_cin}{i:07d}', sexe=rng.choice(['homme', 'homme', 'femme']),
+            date_recrutement=aujourd_hui - timedelta(days=rng.randint(30, min(35, age - 20) * 365)),
+            statut='retraite' if retraite else 'actif',
+            a_droit='ayant_droit' if rng.random() < (0.7 if retraite else 0.82) else 'sans_droit',
+            numero_tel=f'06{rng.randint(0, 99999999):08d}', rib=f'{rng.randint(0, 10 ** 12):024d}',
+            ville=rng.choice(VILLES), adresse='Zone portuaire',
+            salaire=rng.randint(3000, 25000),
+            organisme_employeur=organisme, section_cotisation=organisme,
+        ))
+    return lignes
+
+
+def creer_adherents(nombre, debut=0, rng=None, lot=5000, avec_cotisations=True, prefixe_cin='BK'):
+    """Insère `nombre` adhérents (et leur cotisation) comme l'import par lots ; renvoie les adhérents.
+
+    NAX, index, état, compteurs et journal sont tenus à jour (import_adherents.inserer_en_masse),
+    mais aucune carte n'est mise en file.
+    """
+    rng = rng or random.Random(42)
+    crees = []
+    for depart in range(debut, debut + nombre, lot):
+        paquet = adherents(depart, min(depart + lot, debut + nombre), rng, prefixe_cin)
+        with transaction.atomic():
+            import_adherents.inserer_en_masse(
+                paquet, (lambda adherent: cotisation(adherent, rng)) if avec_cotisations else None,
+            )
+        crees.extend(paquet)
+    return crees
+
+
+def cotisation(adherent, rng):
+    if adherent.a_droit != 'ayant_droit':
+        return Cotisation(adherent=adherent, cin=adherent.cin, cotisation='non')
+    date_debut = date.today() - timedelta(days=rng.randint(0, 60))
+    return Cotisation(adherent=adherent, cin=adherent.cin, cotisation='oui',
+                      date_debut=date_debut, date_fin=date_debut + relativedelta(months=+1))
+
+
+def montant_soin(rng):
+    # Montants très dispersés : médiane vers 650 DH, quelques dossiers lourds (hospitalisations)
+    return round(min(max(rng.lognormvariate(6.5, 0.9), 50), 50000), 2)
+
+
+def creer_soins(adherents, nombre, rng=None, lot=5000):
+    """Insère `nombre` soins datés des 12 derniers mois.
+
+    Répartition inégale : une minorité d'adhérents (loi de Pareto) concentre
+    l'essentiel des dossiers, comme les maladies chroniques.
+    """
+    rng = rng or random.Random(42)
+    aujourd_hui = date.today()
+    cumul = list(accumulate(rng.paretovariate(1.5) for _ in adherents))
+    for depart in range(0, nombre, lot):
+        taille = min(depart + lot, nombre) - depart
+        paquet = []
+        for i, adherent in zip(range(depart, depart + taille), rng.choices(adherents, cum_weights=cumul, k=taille)):
+            date_soin = aujourd_hui - timedelta(days=rng.randint(0, 365))
+            paquet.append(Soin(
+                adherent=adherent, num_recu=f'R{i:07d}',
+                statut_dossier='recu' if rng.random() < 0.9 else 'rejet',
+                montant_dossier=montant_soin(rng),
+                type_beneficier=_choix_pondere(rng, BENEFICIAIRES),
+                date_soin=date_soin, date_fin_soin=date_soin + timedelta(days=rng.randint(0, 10)),
+            ))
+        Soin.objects.bulk_create(paquet)
+        stats.ajouter_en_masse(paquet)
+        rapports_soins.ajouter_en_masse(paquet)
+        modifications.journaliser(Soin, [soin.id for soin in paquet])
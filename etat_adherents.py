@@ -0,0 +1,90 @@
+# api/etat_adherents.py
+"""Table EtatAdherent : une ligne par adhérent, droit et cotisation réunis.
+
+Tenue à jour par les signaux (écritures unitaires) et explicitement par les
+chemins ensemblistes (import, renouvellement), qui ne déclenchent pas de signaux.
+"""
+from datetime import timedelta
+
+from django.db.models import Max, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Adherent, EtatAdherent
+
+CHAMPS_ADHERENT = ('nom', 'prenom', 'cin', 'statut', 'a_droit', 'organisme_employeur', 'section_cotisation')
+CHAMPS_MAJ = ('nax',) + CHAMPS_ADHERENT + ('cotisation', 'date_fin')
+
+
+def _lignes(adherents):
+    # Une requête : champs de l'adhérent + dernière cotisation (une par adhérent en pratique)
+    return (
+        adherents.order_by()
+        .values('id', 'nax', *CHAMPS_ADHERENT)
+        .annotate(
+            cotisation_etat=Coalesce(Max('cotisations__cotisation'), Value('non')),
+            date_fin_etat=Max('cotisations__date_fin'),
+        )
+    )
+
+
+def _etat(ligne):
+    return EtatAdherent(
+        adherent_id=ligne['id'], nax=ligne['nax'],
+        cotisation=ligne['cotisation_etat'], date_fin=ligne['date_fin_etat'],
+        **{champ: ligne[champ] for champ in CHAMPS_ADHERENT},
+    )
+
+
+def synchroniser(adherent_ids, batch_size=1000):
+    """Recalcule les lignes des adhérents donnés (une lecture + un upsert par paquet)."""
+    adherent_ids = list(adherent_ids)
+    total = 0
+    for depart in range(0, len(adherent_ids), batch_size):
+        paquet = adherent_ids[depart:depart + batch_size]
+        etats = [_etat(ligne) for ligne in _lignes(Adherent.objects.filter(id__in=paquet))]
+        EtatAdherent.objects.bulk_create(
+            etats, update_conflicts=True, unique_fields=['adherent'], update_fields=CHAMPS_MAJ,
+        )
+        total += len(etats)
+    return total
+
+
+def reconstruire(chunk_size=2000):
+    EtatAdherent.objects.all().delete()
+    return synchroniser(Adherent.objects.values_list('id', flat=True).iterator(chunk_size=chunk_size),
+                        batch_size=chunk_size)
+
+
+def a_jour(jour=None):
+    """Q des adhérents ayant droit avec une cotisation valide au `jour` (aujourd'hui par défaut)."""
+    jour = jour or timezone.now().date()
+    return Q(a_droit='ayant_droit', cotisation='oui', date_fin__gte=jour)
+
+
+def filtrer(queryset, params, jour=None):
+    """Filtres de /api/adherents/etat/ : a_jour, echus, expire_dans, organisme, section, statut, a_droit."""
+    jour = jour or timezone.now().date()
+    if params.get('a_jour') in ('1', 'true'):
+        queryset = queryset.filter(a_jour(jour))
+    elif params.get('a_jour') in ('0', 'false'):
+        queryset = queryset.exclude(a_jour(jour))
+    if params.get('echus') in ('1', 'true'):
+        # Cotisation arrivée à échéance, pas encore renouvelée (ni passée à 'non')
+        queryset = queryset.filter(date_fin__lt=jour)
+    if params.get('expire_dans'):
+        try:
+            jours = int(params['expire_dans'])
+        except ValueError:
+            raise ValueError("expire_dans doit être un nombre de jours")
+        queryset = queryset.filter(a_jour(jour), date_fin__lte=jour + timedelta(days=jours))
+    for param, champ in (('organisme', 'organisme_employeur'), ('section', 'section_cotisation'),
+                         ('statut', 'statut'), ('a_droit', 'a_droit')):
+        if params.get(param):
+            queryset = queryset.filter(**{champ: params[param]})
+    return queryset
+
+
+def reporter(adherents, **valeurs):
+    """Reporte un UPDATE ensembliste (renouvellement, expiration) sur les lignes concernées."""
+    return EtatAdherent.objects.filter(adherent_id__in=adherents).update(**valeurs)
@@ -0,0 +1,198 @@
+# api/export_analytique.py
+"""Export en colonnes (Parquet ou Arrow IPC) des adhérents, cotisations et soins.
+
+Les lignes sont lues par paquets (`values_list().iterator()`) et converties en
+record batches Arrow : la mémoire reste bornée à un paquet. Décimaux et dates
+gardent leur type (decimal128, date32). Nécessite le paquet pyarrow.
+L'export incrémental suit le journal des modifications : lignes créées ou
+modifiées depuis un curseur ou une date. ExportAnalytiqueMixin ajoute l'action
+`analytique` aux vues de liste.
+"""
+from datetime import datetime, time
+from itertools import islice
+
+from django.db import models
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from . import modifications
+from .models import Adherent, Cotisation, Soin
+
+TABLES = {'adherents': Adherent, 'cotisations': Cotisation, 'soins': Soin}
+FORMATS = {
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.file', 'arrow'),
+}
+TAILLE_PAQUET = 50_000
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise ValueError("L'export Parquet/Arrow nécessite le paquet pyarrow") from exc
+    return pyarrow
+
+
+def _type_arrow(pa, champ):
+    if isinstance(champ, (models.AutoField, models.BigAutoField, models.ForeignKey, models.IntegerField)):
+        return pa.int64()
+    if isinstance(champ, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(champ, models.DateField):
+        return pa.date32()
+    if isinstance(champ, models.DecimalField):
+        return pa.decimal128(champ.max_digits, champ.decimal_places)
+    if isinstance(champ, models.BooleanField):
+        return pa.bool_()
+    return pa.string()
+
+
+def schema(modele, metadonnees=None):
+    pa = _pyarrow()
+    return pa.schema(
+        [pa.field(champ.attname, _type_arrow(pa, champ), nullable=champ.null)
+         for champ in modele._meta.concrete_fields],
+        metadata=metadonnees,
+    )
+
+
+def _moment(valeur):
+    """Date-heure ISO, ou date (minuit, fuseau courant)."""
+    try:
+        moment = parse_datetime(valeur) or (parse_date(valeur) and datetime.combine(parse_date(valeur), time()))
+    except ValueError:
+        moment = None
+    if not moment:
+        raise ValueError(f"Date invalide : {valeur} (AAAA-MM-JJ ou AAAA-MM-JJTHH:MM attendu)")
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+def selection(queryset, curseur=None, depuis=None):
+    """Lignes à exporter, par id croissant.
+
+    Incrémental d'après le journal : `curseur` (id de journal, voir curseur()) ou
+    `depuis` (date ou date-heure) retiennent les lignes créées ou modifiées après.
+    Les suppressions ne figurent pas dans le fichier (voir <liste>/delta/).
+    """
+    if curseur not in (None, ''):
+        try:
+            curseur = int(curseur)
+        except ValueError:
+            raise ValueError("curseur doit être un entier")
+    else:
+        curseur = None
+    depuis = _moment(depuis) if isinstance(depuis, str) and depuis else depuis or None
+    if curseur is not None or depuis is not None:
+        queryset = queryset.filter(id__in=modifications.objets_modifies(queryset.model, curseur, depuis))
+    return queryset.order_by('id')
+
+
+def curseur():
+    """Curseur du journal lu avant l'export : l'export suivant repart de ?curseur=<cette valeur>.
+
+    Une ligne écrite pendant l'export peut y figurer et sera exportée de nouveau : jamais perdue.
+    """
+    return modifications.curseur_actuel()
+
+
+def batches(queryset, schema_arrow, chunk_size=TAILLE_PAQUET):
+    pa = _pyarrow()
+    noms = schema_arrow.names
+    lignes = queryset.values_list(*noms).iterator(chunk_size=chunk_size)
+    while True:
+        paquet = list(islice(lignes, chunk_size))
+        if not paquet:
+            return
+        colonnes = zip(*paquet)
+        yield pa.RecordBatch.from_arrays(
+            [pa.array(colonne, type=champ.type) for colonne, champ in zip(colonnes, schema_arrow)],
+            schema=schema_arrow,
+        )
+
+
+def _ouvrir(sortie, schema_arrow, format):
+    if format == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(sortie, schema_arrow, compression='zstd')
+    return _pyarrow().ipc.new_file(sortie, schema_arrow)
+
+
+class _Flux:
+    """Sortie non « seekable » pour pyarrow : les octets écrits sont repris par le générateur."""
+
+    closed = False
+
+    def __init__(self):
+        self._morceaux = []
+        self._position = 0
+
+    def write(self, donnees):
+        self._morceaux.append(bytes(donnees))
+        self._position += len(donnees)
+        return len(donnees)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def vider(self):
+        donnees = b''.join(self._morceaux)
+        self._morceaux = []
+        return donnees
+
+
+def flux(queryset, format='parquet', curseur_suivant=None, chunk_size=TAILLE_PAQUET):
+    """Générateur d'octets du fichier exporté, un record batch à la fois.
+
+    `curseur_suivant` (voir curseur()) est noté dans les métadonnées du fichier.
+    Format et pyarrow sont vérifiés à l'appel (ValueError).
+    """
+    if format not in FORMATS:
+        raise ValueError(f"sortie doit valoir {', '.join(FORMATS)}")
+    schema_arrow = schema(queryset.model, {'curseur': '' if curseur_suivant is None else str(curseur_suivant)})
+
+    def generer():
+        sortie = _Flux()
+        with _ouvrir(sortie, schema_arrow, format) as writer:
+            for batch in batches(queryset, schema_arrow, chunk_size):
+                writer.write_batch(batch)
+                yield sortie.vider()
+        yield sortie.vider()
+
+    return generer()
+
+
+class ExportAnalytiqueMixin:
+    """`<liste>/analytique/?sortie=parquet|arrow` : export en colonnes d'une liste de l'API.
+
+    Mêmes filtres que la liste, plus `?curseur=` ou `?depuis=AAAA-MM-JJ[THH:MM]` pour
+    l'export incrémental (voir selection). L'en-tête X-Curseur donne le `curseur` suivant.
+    """
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def analytique(self, request):
+        params = request.query_params
+        sortie = params.get('sortie', 'parquet')
+        try:
+            queryset = selection(
+                self.filter_queryset(self.get_queryset()), params.get('curseur'), params.get('depuis'),
+            )
+            # Lu avant l'export : les lignes écrites pendant l'export iront aussi dans le suivant
+            suivant = curseur()
+            contenu = flux(queryset, sortie, suivant)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        content_type, extension = FORMATS[sortie]
+        response = StreamingHttpResponse(contenu, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{self.basename}.{extension}"'
+        response['X-Curseur'] = str(suivant)
+        return response
@@ -0,0 +1,104 @@
+# api/export_recus.py
+"""Export groupé des reçus de soins : archive ZIP en flux ou PDF fusionné.
+
+Chaque reçu passe par le cache PDF (cache_pdf.py) : un reçu déjà rendu n'est
+pas remis en page, et l'archive est écrite au fil de l'eau depuis le disque.
+"""
+import zipfile
+from itertools import islice
+
+from django.conf import settings
+
+from . import cache_pdf, rendu_pdf
+from .models import Soin
+
+TEMPLATE = 'recu_template.html'
+TAILLE_MORCEAU = 64 * 1024
+
+
+def fusion_max():
+    # Le PDF fusionné est mis en page d'un bloc : nombre de reçus borné
+    return getattr(settings, 'EXPORT_RECUS_FUSION_MAX', 500)
+
+
+def soins_a_exporter(queryset):
+    return queryset.select_related('adherent').order_by('date_soin', 'id')
+
+
+def nom_fichier(soin):
+    # num_recu n'est pas unique : l'id évite les collisions dans l'archive
+    return f"recu_{soin.num_recu}_{soin.id}.pdf"
+
+
+def html_recu(soin):
+    return rendu_pdf.html(TEMPLATE, {'soin': soin})
+
+
+def rendre_recu(soin):
+    """Chemin du PDF du reçu dans le cache (rendu seulement s'il manque)."""
+    return cache_pdf.rendre(TEMPLATE, html_recu(soin))
+
+
+def rendre_ids(ids):
+    """Rend un paquet de reçus ; point d'entrée des processus de `export_recus --processus`."""
+    return [rendre_recu(soin) for soin in Soin.objects.select_related('adherent').filter(id__in=ids)]
+
+
+def par_paquets(iterable, taille):
+    iterateur = iter(iterable)
+    while True:
+        paquet = list(islice(iterateur, taille))
+        if not paquet:
+            return
+        yield paquet
+
+
+class _Tampon:
+    """Sortie non « seekable » pour zipfile : les octets écrits sont repris par le générateur."""
+
+    def __init__(self):
+        self._morceaux = []
+
+    def write(self, donnees):
+        self._morceaux.append(bytes(donnees))
+        return len(donnees)
+
+    def flush(self):
+        pass
+
+    def vider(self):
+        donnees = b''.join(self._morceaux)
+        self._morceaux = []
+        return donnees
+
+
+def flux_zip(queryset, chunk_size=500):
+    """Générateur d'octets d'une archive ZIP des reçus, en mémoire constante.
+
+    Les PDF sont déjà compressés : stockés tels quels (ZIP_STORED).
+    """
+    tampon = _Tampon()
+    with zipfile.ZipFile(tampon, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for soin in soins_a_exporter(queryset).iterator(chunk_size=chunk_size):
+            with open(rendre_recu(soin), 'rb') as source, archive.open(nom_fichier(soin), 'w') as entree:
+                for morceau in iter(lambda: source.read(TAILLE_MORCEAU), b''):
+                    entree.write(morceau)
+            yield tampon.vider()
+    yield tampon.vider()
+
+
+def ecrire_pdf_fusionne(queryset, destination):
+    """Un seul document WeasyPrint pour tous les reçus (moteur partagé, voir rendu_pdf.py).
+
+    Renvoie le nombre de reçus ; lève ValueError au-delà de EXPORT_RECUS_FUSION_MAX.
+    """
+    soins = list(soins_a_exporter(queryset)[:fusion_max() + 1])
+    if len(soins) > fusion_max():
+        raise ValueError(f"Plus de {fusion_max()} reçus : utiliser l'export ZIP")
+    if not soins:
+        raise ValueError("Aucun reçu à exporter")
+
+    documents = [rendu_pdf.document(TEMPLATE, html_recu(soin)) for soin in soins]
+    pages = [page for document in documents for page in document.pages]
+    documents[0].copy(pages).write_pdf(target=destination)
+    return len(soins)
@@ -0,0 +1,146 @@
+# api/import_adherents.py
+import csv
+import io
+import time
+from datetime import datetime
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from . import adhesion, etat_adherents, modifications, recherche, stats, taches_pdf
+from .models import Adherent, Cotisation
+from .serializers import AdherentImportSerializer
+
+
+def lire_csv(fichier):
+    """Lignes d'un CSV (séparateur ',' ou ';' détecté, en-têtes = noms des champs)."""
+    texte = io.TextIOWrapper(fichier, encoding='utf-8-sig', newline='')
+    debut = texte.read(4096)
+    texte.seek(0)
+    try:
+        dialecte = csv.Sniffer().sniff(debut, delimiters=',;')
+    except csv.Error:
+        dialecte = csv.excel
+    for ligne in csv.DictReader(texte, dialect=dialecte):
+        yield {cle.strip(): (valeur or '').strip() for cle, valeur in ligne.items() if cle}
+
+
+def lire_xlsx(fichier):
+    """Lignes de la première feuille d'un classeur XLSX (nécessite openpyxl)."""
+    try:
+        from openpyxl import load_workbook
+    except ImportError as exc:
+        raise ValueError("L'import XLSX nécessite le paquet openpyxl") from exc
+
+    feuille = load_workbook(fichier, read_only=True, data_only=True).active
+    lignes = feuille.iter_rows(values_only=True)
+    entetes = [str(c).strip() if c is not None else '' for c in next(lignes, [])]
+    for valeurs in lignes:
+        ligne = {}
+        for entete, valeur in zip(entetes, valeurs):
+            if not entete:
+                continue
+            if isinstance(valeur, datetime):
+                valeur = valeur.date()
+            ligne[entete] = '' if valeur is None else valeur
+        yield ligne
+
+
+def lire_fichier(fichier, nom):
+    if nom.lower().endswith(('.xlsx', '.xlsm')):
+        return lire_xlsx(fichier)
+    return lire_csv(fichier)
+
+
+def inserer_en_masse(adherents, cotisation=None):
+    """Insère des adhérents et leur cotisation (`cotisation(adherent)`, non enregistrée) par bulk_create.
+
+    bulk_create ne déclenche pas les signaux : NAX, index, état, compteurs et
+    journal sont mis à jour ici en requêtes ensemblistes. À appeler dans une
+    transaction ; renvoie les cotisations créées.
+    """
+    Adherent.objects.bulk_create(adherents)
+    ids = [adherent.id for adherent in adherents]
+    Adherent.attribuer_nax(adherents)
+    cotisations = Cotisation.objects.bulk_create([cotisation(adherent) for adherent in adherents]) if cotisation else []
+    recherche.indexer_en_masse(adherents)
+    etat_adherents.synchroniser(ids)
+    stats.ajouter_en_masse(adherents)
+    stats.ajouter_en_masse(cotisations)
+    modifications.journaliser(Adherent, ids)
+    modifications.journaliser(Cotisation, [c.id for c in cotisations])
+    return cotisations
+
+
+def _enregistrer_lot(adherents):
+    """Insère un lot validé en quelques requêtes ensemblistes, dans une transaction."""
+    aujourd_hui = timezone.now().date()
+    with transaction.atomic():
+        inserer_en_masse(adherents, lambda adherent: adhesion.cotisation_initiale(adherent, aujourd_hui))
+        taches_pdf.planifier_en_masse('carte', [adherent.id for adherent in adherents])
+
+
+def _traiter_lot(lot, rapport):
+    # Une seule instance de serializer pour le lot : ses champs ne sont construits qu'une fois
+    serializer = AdherentImportSerializer()
+    valides = []
+    cins = set()
+    for numero, ligne in lot:
+        try:
+            # Cellule vide = valeur absente (date de recrutement facultative, etc.)
+            donnees = serializer.run_validation({k: (None if v == '' else v) for k, v in ligne.items()})
+        except ValidationError as exc:
+            rapport['erreurs'].append({'ligne': numero, 'erreurs': exc.detail})
+            continue
+        cin = donnees['cin']
+        if cin in cins:
+            rapport['erreurs'].append({'ligne': numero, 'erreurs': {'cin': ['CIN en double dans le fichier.']}})
+            continue
+        cins.add(cin)
+        valides.append((numero, Adherent(**donnees)))
+
+    # Unicité du CIN vérifiée pour tout le lot en une requête
+    existants = set(Adherent.objects.filter(cin__in=cins).values_list('cin', flat=True))
+    adherents = []
+    for numero, adherent in valides:
+        if adherent.cin in existants:
+            rapport['erreurs'].append({'ligne': numero, 'erreurs': {'cin': ['Un adhérent avec ce CIN existe déjà.']}})
+        else:
+            adherents.append((numero, adherent))
+
+    if not adherents:
+        return
+    try:
+        _enregistrer_lot([adherent for _, adherent in adherents])
+    except IntegrityError as exc:
+        for numero, _ in adherents:
+            rapport['erreurs'].append({'ligne': numero, 'erreurs': {'non_field_errors': [str(exc)]}})
+    else:
+        rapport['crees'] += len(adherents)
+
+
+def importer(lignes, taille_lot=500):
+    """Importe des adhérents par lots et renvoie un rapport (créés, erreurs par ligne, débit).
+
+    Les numéros de ligne comptent l'en-tête comme ligne 1, comme dans un tableur.
+    """
+    debut = time.perf_counter()
+    rapport = {'lignes': 0, 'crees': 0, 'erreurs': []}
+    lot = []
+    for numero, ligne in enumerate(lignes, start=2):
+        rapport['lignes'] += 1
+        lot.append((numero, ligne))
+        if len(lot) >= taille_lot:
+            _traiter_lot(lot, rapport)
+            lot = []
+    if lot:
+        _traiter_lot(lot, rapport)
+
+    if rapport['crees']:
+        recherche.cache_suggestions.clear()
+    rapport['erreurs'].sort(key=lambda erreur: erreur['ligne'])
+    duree = time.perf_counter() - debut
+    rapport['duree'] = round(duree, 3)
+    rapport['lignes_par_seconde'] = round(rapport['lignes'] / duree, 1) if duree else None
+    return rapport
@@ -0,0 +1,407 @@
+# api/instrumentation.py
+"""Mesures de performance par requête (MesureMiddleware).
+
+Pour chaque route (méthode et nom de la vue) : histogramme des durées,
+requêtes SQL (nombre et durée), requêtes répétées (N+1 : même requête à
+la structure près, exécutée au moins `MESURES_SEUIL_N_PLUS_UN` fois) et
+temps des phases instrumentées (`serialisation`, `pdf`). Chaque processus
+(workers du serveur, pdf_worker) publie ses agrégats dans `MESURES_DOSSIER` ;
+/api/metrics/ les additionne au format texte Prometheus, pour le personnel
+connecté ou le collecteur muni de `MESURES_JETON`. Chaque requête ajoute aussi
+une ligne JSON au fichier `MESURES_FICHIER`.
+"""
+import atexit
+import bisect
+import contextvars
+import json
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from logging.handlers import RotatingFileHandler
+
+from django.conf import settings
+from django.db import connections
+from django.utils.crypto import constant_time_compare
+from rest_framework.serializers import ListSerializer
+
+# Bornes de l'histogramme (secondes), celles des clients Prometheus
+BORNES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SEUIL_N_PLUS_UN = 10
+HORS_REQUETE = '-'  # phases hors d'une requête : flux NDJSON, pdf_worker, commandes
+TAILLE_SQL = 300  # requête tronquée dans le fichier de mesures
+PUBLICATION = 5.0  # secondes entre deux publications des agrégats du processus
+
+_courante = contextvars.ContextVar('mesure_courante', default=None)
+
+_CHAINES = re.compile(r"'(?:[^']|'')*'")
+_NOMBRES = re.compile(r'\b\d+(?:\.\d+)?\b')
+_LISTES = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)')
+
+
+def empreinte_sql(sql):
+    """Structure de la requête : littéraux remplacés, listes IN (...) réduites."""
+    sql = _NOMBRES.sub('?', _CHAINES.sub('?', sql))
+    return ' '.join(_LISTES.sub('(...)', sql).split())
+
+
+class Mesure:
+    """Mesures de la requête en cours ; sert aussi de execute_wrapper sur les connexions."""
+
+    def __init__(self):
+        self.requetes = 0
+        self.duree_sql = 0.0
+        self.sql = Counter()
+        self.phases = defaultdict(float)
+
+    def __call__(self, execute, sql, params, many, context):
+        debut = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duree_sql += time.perf_counter() - debut
+            self.requetes += 1
+            self.sql[sql] += 1
+
+    def n_plus_un(self, seuil=SEUIL_N_PLUS_UN):
+        """[(empreinte, nombre)] des requêtes répétées au moins `seuil` fois, les plus fréquentes d'abord."""
+        empreintes = Counter()
+        for sql, nombre in self.sql.items():
+            empreintes[empreinte_sql(sql)] += nombre
+        return [(empreinte, nombre) for empreinte, nombre in empreintes.most_common() if nombre >= seuil]
+
+
+@contextmanager
+def phase(nom):
+    """Ajoute la durée du bloc à la phase `nom` de la requête en cours (ou hors requête)."""
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        duree = time.perf_counter() - debut
+        mesure = _courante.get()
+        if mesure is not None:
+            mesure.phases[nom] += duree
+        else:
+            registre.ajouter_phase(HORS_REQUETE, nom, duree)
+            publier()
+
+
+class _Route:
+    def __init__(self):
+        self.seaux = [0] * (len(BORNES) + 1)
+        self.somme = 0.0
+        self.statuts = Counter()
+        self.requetes_sql = 0
+        self.duree_sql = 0.0
+        self.n_plus_un = 0
+
+
+def _etiquette(valeur):
+    return str(valeur).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Registre:
+    """Agrégats du processus par route (verrou : serveurs multi-threads)."""
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self.vider()
+
+    def vider(self):
+        with self._verrou:
+            self.routes = defaultdict(_Route)
+            self.phases = defaultdict(lambda: [0, 0.0])  # (route, phase) -> [nombre, secondes]
+
+    def enregistrer(self, route, statut, duree, mesure, n_plus_un):
+        with self._verrou:
+            stats = self.routes[route]
+            stats.seaux[bisect.bisect_left(BORNES, duree)] += 1
+            stats.somme += duree
+            stats.statuts[statut] += 1
+            stats.requetes_sql += mesure.requetes
+            stats.duree_sql += mesure.duree_sql
+            stats.n_plus_un += bool(n_plus_un)
+            for nom, duree_phase in mesure.phases.items():
+                cumul = self.phases[route, nom]
+                cumul[0] += 1
+                cumul[1] += duree_phase
+
+    def ajouter_phase(self, route, nom, duree):
+        with self._verrou:
+            cumul = self.phases[route, nom]
+            cumul[0] += 1
+            cumul[1] += duree
+
+    def etat(self):
+        """Agrégats sérialisables en JSON (publication du processus)."""
+        with self._verrou:
+            return {
+                'routes': {
+                    route: {
+                        'seaux': list(stats.seaux), 'somme': stats.somme, 'statuts': dict(stats.statuts),
+                        'requetes_sql': stats.requetes_sql, 'duree_sql': stats.duree_sql,
+                        'n_plus_un': stats.n_plus_un,
+                    }
+                    for route, stats in self.routes.items()
+                },
+                'phases': [[route, nom, nombre, duree] for (route, nom), (nombre, duree) in self.phases.items()],
+            }
+
+    def ajouter(self, etat):
+        """Ajoute les agrégats publiés par un processus (voir etat)."""
+        with self._verrou:
+            for route, valeurs in etat['routes'].items():
+                stats = self.routes[route]
+                stats.seaux = [a + b for a, b in zip(stats.seaux, valeurs['seaux'])]
+                stats.somme += valeurs['somme']
+                stats.statuts.update({int(statut): nombre for statut, nombre in valeurs['statuts'].items()})
+                stats.requetes_sql += valeurs['requetes_sql']
+                stats.duree_sql += valeurs['duree_sql']
+                stats.n_plus_un += valeurs['n_plus_un']
+            for route, nom, nombre, duree in etat['phases']:
+                cumul = self.phases[route, nom]
+                cumul[0] += nombre
+                cumul[1] += duree
+
+    def prometheus(self):
+        """Agrégats au format d'exposition texte de Prometheus (0.0.4)."""
+        with self._verrou:
+            routes = sorted(self.routes.items())
+            phases = sorted(self.phases.items())
+        lignes = [
+            '# HELP api_requete_duree_secondes Durée des requêtes HTTP par route.',
+            '# TYPE api_requete_duree_secondes histogram',
+        ]
+        for route, stats in routes:
+            r = _etiquette(route)
+            cumul = 0
+            for borne, nombre in zip(BORNES, stats.seaux):
+                cumul += nombre
+                lignes.append(f'api_requete_duree_secondes_bucket{{route="{r}",le="{borne}"}} {cumul}')
+            total = cumul + stats.seaux[-1]
+            lignes.append(f'api_requete_duree_secondes_bucket{{route="{r}",le="+Inf"}} {total}')
+            lignes.append(f'api_requete_duree_secondes_sum{{route="{r}"}} {stats.somme:.6f}')
+            lignes.append(f'api_requete_duree_secondes_count{{route="{r}"}} {total}')
+
+        def compteur(nom, aide, valeurs):
+            lignes.extend([f'# HELP {nom} {aide}', f'# TYPE {nom} counter'])
+            lignes.extend(f'{nom}{{{etiquettes}}} {valeur}' for etiquettes, valeur in valeurs)
+
+        compteur('api_requetes_total', 'Requêtes HTTP par route et code de statut.', [
+            (f'route="{_etiquette(route)}",statut="{statut}"', nombre)
+            for route, stats in routes for statut, nombre in sorted(stats.statuts.items())
+        ])
+        compteur('api_sql_requetes_total', 'Requêtes SQL exécutées pendant les requêtes HTTP.', [
+            (f'route="{_etiquette(route)}"', stats.requetes_sql) for route, stats in routes
+        ])
+        compteur('api_sql_duree_secondes_total', 'Temps passé dans les requêtes SQL.', [
+            (f'route="{_etiquette(route)}"', f'{stats.duree_sql:.6f}') for route, stats in routes
+        ])
+        compteur('api_n_plus_un_total', 'Requêtes HTTP avec une requête SQL répétée (N+1 probable).', [
+            (f'route="{_etiquette(route)}"', stats.n_plus_un) for route, stats in routes
+        ])
+        compteur('api_phase_total', 'Requêtes (ou appels hors requête) passées par une phase.', [
+            (f'route="{_etiquette(route)}",phase="{nom}"', nombre) for (route, nom), (nombre, _) in phases
+        ])
+        compteur('api_phase_duree_secondes_total', 'Temps passé dans une phase (sérialisation, pdf).', [
+            (f'route="{_etiquette(route)}",phase="{nom}"', f'{duree:.6f}') for (route, nom), (_, duree) in phases
+        ])
+        return '\n'.join(lignes) + '\n'
+
+
+registre = Registre()
+
+# Fichier de publication du processus : pid et jeton, un pid réutilisé n'écrase pas le fichier d'un processus arrêté
+_publication = {'jeton': uuid.uuid4().hex[:8], 'date': 0.0}
+_verrou_publication = threading.Lock()
+
+
+def _dossier():
+    dossier = getattr(settings, 'MESURES_DOSSIER', None)
+    return os.path.abspath(dossier) if dossier else None
+
+
+def publier(forcer=False):
+    """Écrit les agrégats du processus dans MESURES_DOSSIER, au plus toutes les MESURES_PUBLICATION secondes."""
+    dossier = _dossier()
+    if dossier is None or not (registre.routes or registre.phases):
+        return
+    maintenant = time.monotonic()
+    intervalle = getattr(settings, 'MESURES_PUBLICATION', PUBLICATION)
+    if not forcer and maintenant - _publication['date'] < intervalle:
+        return
+    with _verrou_publication:
+        if not forcer and maintenant - _publication['date'] < intervalle:
+            return
+        _publication['date'] = maintenant
+        os.makedirs(dossier, exist_ok=True)
+        chemin = os.path.join(dossier, f"{os.getpid()}-{_publication['jeton']}.json")
+        # Remplacement atomique : la lecture par /api/metrics/ ne voit jamais un fichier à moitié écrit
+        with open(chemin + '.tmp', 'w', encoding='utf-8') as fichier:
+            json.dump(registre.etat(), fichier)
+        os.replace(chemin + '.tmp', chemin)
+
+
+def agreger():
+    """Agrégats de tous les processus publiés dans MESURES_DOSSIER (du seul processus courant sans dossier).
+
+    Les fichiers des processus arrêtés sont gardés : les compteurs restent cumulés
+    jusqu'au prochain redéploiement, qui vide le dossier.
+    """
+    dossier = _dossier()
+    if dossier is None:
+        return registre
+    publier(forcer=True)
+    total = Registre()
+    for nom in os.listdir(dossier):
+        if not nom.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(dossier, nom), encoding='utf-8') as fichier:
+                total.ajouter(json.load(fichier))
+        except (OSError, ValueError):
+            continue  # fichier retiré entre-temps
+    return total
+
+
+def _apres_fork():
+    # Worker forké : agrégats hérités du parent remis à zéro, sinon comptés deux fois
+    global _verrou_publication
+    registre.__init__()
+    _verrou_publication = threading.Lock()
+    _publication.update(jeton=uuid.uuid4().hex[:8], date=0.0)
+
+
+os.register_at_fork(after_in_child=_apres_fork)
+# Dernières mesures du processus publiées à l'arrêt
+atexit.register(publier, forcer=True)
+
+
+def acces_autorise(request):
+    """/api/metrics/ : personnel connecté, ou en-tête `Authorization: Bearer <MESURES_JETON>`."""
+    jeton = getattr(settings, 'MESURES_JETON', None)
+    entete = request.headers.get('Authorization', '')
+    if jeton and entete.startswith('Bearer ') and constant_time_compare(entete[len('Bearer '):], jeton):
+        return True
+    return request.user.is_authenticated and request.user.is_staff
+
+
+# Lignes JSON par requête : journal `api.mesures` (niveaux, filtres et handlers de la configuration logging)
+journal = logging.getLogger('api.mesures')
+_verrou_fichier = threading.Lock()
+_fichier = None
+
+
+def _configurer():
+    """Installe sur `journal` le fichier à rotation MESURES_FICHIER (retiré ou remplacé si le réglage change)."""
+    global _fichier
+    chemin = getattr(settings, 'MESURES_FICHIER', None)
+    chemin = os.path.abspath(chemin) if chemin else None
+    actuel = _fichier.baseFilename if _fichier is not None else None
+    if actuel == chemin:
+        return
+    with _verrou_fichier:
+        if _fichier is not None and _fichier.baseFilename != chemin:
+            journal.removeHandler(_fichier)
+            _fichier.close()
+            _fichier = None
+        if chemin and _fichier is None:
+            os.makedirs(os.path.dirname(chemin), exist_ok=True)
+            _fichier = RotatingFileHandler(
+                chemin, maxBytes=getattr(settings, 'MESURES_FICHIER_TAILLE_MAX', 10 * 1024 * 1024),
+                backupCount=getattr(settings, 'MESURES_FICHIER_NOMBRE', 5), encoding='utf-8', delay=True,
+            )
+            journal.addHandler(_fichier)
+            # Lignes JSON : pas dans les logs applicatifs ; niveau INFO sauf s'il est fixé par LOGGING
+            journal.propagate = False
+            if journal.level == logging.NOTSET:
+                journal.setLevel(logging.INFO)
+
+
+def ecrire(ligne):
+    _configurer()
+    if journal.isEnabledFor(logging.INFO) and journal.hasHandlers():
+        journal.info(json.dumps(ligne))
+
+
+def nom_route(request):
+    # Nom de la vue plutôt que le chemin : une série par route, pas une par id
+    match = request.resolver_match
+    return f'{request.method} {match.view_name if match else "non_resolue"}'
+
+
+class MesureMiddleware:
+    """Durée, requêtes SQL et phases de chaque requête, agrégées dans `registre` et publiées."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mesure = Mesure()
+        jeton = _courante.set(mesure)
+        debut = time.perf_counter()
+        try:
+            with ExitStack() as pile:
+                for connexion in connections.all():
+                    pile.enter_context(connexion.execute_wrapper(mesure))
+                response = self.get_response(request)
+        finally:
+            _courante.reset(jeton)
+        duree = time.perf_counter() - debut
+
+        route = nom_route(request)
+        n_plus_un = mesure.n_plus_un(getattr(settings, 'MESURES_SEUIL_N_PLUS_UN', SEUIL_N_PLUS_UN))
+        registre.enregistrer(route, response.status_code, duree, mesure, n_plus_un)
+        publier()
+        ecrire({
+            'date': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'route': route,
+            'statut': response.status_code,
+            'duree_ms': round(duree * 1000, 3),
+            'sql': mesure.requetes,
+            'sql_ms': round(mesure.duree_sql * 1000, 3),
+            'phases_ms': {nom: round(valeur * 1000, 3) for nom, valeur in mesure.phases.items()},
+            'n_plus_un': [{'sql': sql[:TAILLE_SQL], 'nombre': nombre} for sql, nombre in n_plus_un],
+        })
+        return response
+
+
+_serializers = {}
+
+
+def serializer_mesure(classe):
+    """Sous-classe de `classe` dont l'accès à `.data` (fiche ou liste) compte dans la phase `serialisation`."""
+    if classe not in _serializers:
+        liste = getattr(getattr(classe, 'Meta', None), 'list_serializer_class', ListSerializer)
+
+        class ListeMesuree(liste):
+            @property
+            def data(self):
+                with phase('serialisation'):
+                    return super().data
+
+        class Mesuree(classe):
+            class Meta(getattr(classe, 'Meta', object)):
+                list_serializer_class = ListeMesuree
+
+            @property
+            def data(self):
+                with phase('serialisation'):
+                    return super().data
+
+        Mesuree.__name__ = Mesuree.__qualname__ = classe.__name__
+        _serializers[classe] = Mesuree
+    return _serializers[classe]
+
+
+class MesureSerializerMixin:
+    """Viewsets : temps de sérialisation des réponses mesuré (voir `serializer_mesure`)."""
+
+    def get_serializer_class(self):
+        return serializer_mesure(super().get_serializer_class())
@@ -0,0 +1,106 @@
+# api/listes_legeres.py
+"""Listes légères : `?fields=` (colonnes choisies), `?compact=1` (colonnes de liste par défaut)
+et `?expand=adherent` (adhérent résumé).
+
+Les lignes sont lues avec `.values()` et construites directement, sans instance
+de modèle ni ModelSerializer par ligne. Sans ces paramètres, une liste garde son
+serializer complet (les pages React éditent à partir des lignes de la liste).
+"""
+from decimal import Decimal
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from .instrumentation import phase
+
+# Nom de la colonne dans la réponse -> chemin lu par values()
+COLONNES_ADHERENT = {nom: nom for nom in (
+    'id', 'nax', 'nom', 'prenom', 'date_naissance', 'cin', 'sexe', 'date_recrutement', 'statut', 'a_droit',
+    'numero_tel', 'rib', 'ville', 'adresse', 'salaire', 'organisme_employeur', 'section_cotisation',
+)}
+COLONNES_COTISATION = {
+    'id': 'id', 'cin': 'cin', 'cotisation': 'cotisation', 'date_debut': 'date_debut', 'date_fin': 'date_fin',
+    'adherent_id': 'adherent_id', 'nax': 'adherent__nax', 'nom': 'adherent__nom', 'prenom': 'adherent__prenom',
+    'rib': 'adherent__rib', 'date_recrutement': 'adherent__date_recrutement', 'a_droit': 'adherent__a_droit',
+}
+COLONNES_SOIN = {nom: nom for nom in (
+    'id', 'adherent_id', 'num_recu', 'statut_dossier', 'montant_dossier', 'type_beneficier', 'date_soin',
+    'date_fin_soin',
+)}
+# Adhérent résumé imbriqué par ?expand=adherent (chemins depuis la cotisation ou le soin)
+ADHERENT_RESUME = {
+    'id': 'adherent_id', 'nax': 'adherent__nax', 'nom': 'adherent__nom', 'prenom': 'adherent__prenom',
+    'cin': 'adherent__cin', 'a_droit': 'adherent__a_droit',
+}
+
+
+def _liste(params, nom):
+    return [valeur.strip() for valeur in params.get(nom, '').split(',') if valeur.strip()]
+
+
+def demande(params, colonnes, colonnes_liste, expansions):
+    """(colonnes, expansions) demandées, ou None pour la liste complète ; ValueError si un nom est inconnu."""
+    champs, expand = _liste(params, 'fields'), _liste(params, 'expand')
+    if not champs and not expand and params.get('compact') not in ('1', 'true'):
+        return None
+    inconnus = [nom for nom in champs if nom not in colonnes] + [nom for nom in expand if nom not in expansions]
+    if inconnus:
+        raise ValueError(f"Champs inconnus : {', '.join(inconnus)}")
+    return champs or list(colonnes_liste), expand
+
+
+def _valeur(valeur):
+    # Même rendu que les serializers DRF : décimaux en chaîne ("100.00"), dates via l'encodeur JSON
+    return str(valeur) if isinstance(valeur, Decimal) else valeur
+
+
+class Lignes:
+    """Construit les lignes d'une liste légère à partir des dictionnaires de values()."""
+
+    def __init__(self, colonnes, expansions, champs, expand):
+        self.champs = [(nom, colonnes[nom]) for nom in champs]
+        self.expand = [(nom, list(expansions[nom].items())) for nom in expand]
+
+    def chemins(self):
+        # id toujours lu : clé de la pagination par curseur
+        chemins = {'id'} | {chemin for _, chemin in self.champs}
+        for _, sous_champs in self.expand:
+            chemins.update(chemin for _, chemin in sous_champs)
+        return sorted(chemins)
+
+    def construire(self, ligne):
+        resultat = {nom: _valeur(ligne[chemin]) for nom, chemin in self.champs}
+        for nom, sous_champs in self.expand:
+            resultat[nom] = {sous_nom: _valeur(ligne[chemin]) for sous_nom, chemin in sous_champs}
+        return resultat
+
+
+class ListeLegereMixin:
+    """`?fields=a,b`, `?compact=1` et `?expand=adherent` sur une liste (voir ce module)."""
+    colonnes = {}
+    colonnes_liste = ()  # colonnes sans ?fields= (avec ?compact=1 ou ?expand=)
+    expansions = {}
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('stream'):
+            return super().list(request, *args, **kwargs)
+        try:
+            demandees = demande(request.query_params, self.colonnes, self.colonnes_liste, self.expansions)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        if demandees is None:
+            return super().list(request, *args, **kwargs)
+
+        lignes = Lignes(self.colonnes, self.expansions, *demandees)
+        queryset = self.filter_queryset(self.get_queryset())
+        chemins = lignes.chemins()
+        if 'pertinence' in queryset.query.annotations:
+            # ?search= : pertinence lue, clé de la pagination des résultats classés
+            chemins.append('pertinence')
+        queryset = queryset.values(*chemins)
+        page = self.paginate_queryset(queryset)
+        with phase('serialisation'):
+            resultats = [lignes.construire(ligne) for ligne in (queryset if page is None else page)]
+        if page is None:
+            return Response(resultats)
+        return self.get_paginated_response(resultats)
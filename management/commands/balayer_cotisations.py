@@ -0,0 +1,42 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api import balayage
+
+
+class Command(BaseCommand):
+    help = ("Expire les cotisations arrivées à échéance depuis le dernier passage, et compacte le journal "
+            "des modifications une fois par jour. Sans coût notable si relancé souvent (cron chaque minute, "
+            "ou --boucle).")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', type=date.fromisoformat, help="Date de référence (aujourd'hui par défaut)")
+        parser.add_argument('--complet', action='store_true',
+                            help="Ignorer la marque de reprise et parcourir toutes les échéances passées")
+        parser.add_argument('--dry-run', action='store_true', help="Afficher les effectifs sans rien modifier")
+        parser.add_argument('--boucle', type=float, metavar='SECONDES',
+                            help="Rester actif et relancer le balayage à cet intervalle")
+
+    def handle(self, *args, **options):
+        while True:
+            rapport = balayage.balayer(options['date'], options['complet'], options['dry_run'])
+            if rapport['cotisations'] or not options['boucle']:
+                prefixe = "[dry-run] " if options['dry_run'] else ""
+                self.stdout.write(self.style.SUCCESS(
+                    f"{prefixe}échéances du {rapport['depuis'] or 'début'} au {rapport['date_reference']} (exclu) : "
+                    f"{rapport['cotisations']} cotisation(s), {rapport['adherents']} adhérent(s) expiré(s)"
+                ))
+            if not options['dry_run']:
+                supprimees = balayage.compacter_journal(options['date'])
+                if supprimees:
+                    self.stdout.write(f"Journal des modifications compacté : {supprimees} ligne(s) supprimée(s)")
+            if not options['boucle']:
+                break
+            connections.close_all()
+            try:
+                time.sleep(options['boucle'])
+            except KeyboardInterrupt:
+                break
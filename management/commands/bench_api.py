@@ -0,0 +1,94 @@
+import json
+import random
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from api import benchmarks, donnees_synthetiques
+
+
+class Command(BaseCommand):
+    help = ("Suite de benchmarks de l'API (listes, filtres, écritures, reçu PDF, tableau de bord) : "
+            "centiles de latence, requêtes SQL et pic mémoire en JSON, comparés à une référence. "
+            "Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--echelle', choices=list(benchmarks.ECHELLES), default='10k',
+                            help="Taille du jeu de données (nombre de soins)")
+        parser.add_argument('--adherents', type=int, help="Remplace le nombre d'adhérents de l'échelle")
+        parser.add_argument('--soins', type=int, help="Remplace le nombre de soins de l'échelle")
+        parser.add_argument('--repetitions', type=int, default=30)
+        parser.add_argument('--scenarios', help="Scénarios à jouer, séparés par des virgules (tous par défaut)")
+        parser.add_argument('--sortie', help="Fichier JSON des résultats")
+        parser.add_argument('--reference', default=benchmarks.REFERENCE,
+                            help="Résultats JSON à comparer (référence versionnée par défaut, '' pour aucune)")
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help="Écart relatif toléré sur les durées et la mémoire (0.25 = 25 %%)")
+
+    def handle(self, *args, **options):
+        nombre_adherents, nombre_soins = benchmarks.ECHELLES[options['echelle']]
+        nombre_adherents = options['adherents'] or nombre_adherents
+        nombre_soins = options['soins'] or nombre_soins
+        noms = options['scenarios'].split(',') if options['scenarios'] else list(benchmarks.SCENARIOS)
+        inconnus = set(noms) - set(benchmarks.SCENARIOS)
+        if inconnus:
+            raise CommandError(f"Scénarios inconnus : {', '.join(sorted(inconnus))}")
+        reference = None
+        if options['reference']:
+            with open(options['reference'], encoding='utf-8') as fichier:
+                reference = json.load(fichier)
+
+        # Reçus rendus par le benchmark : cache PDF temporaire
+        media = tempfile.mkdtemp()
+        try:
+            with override_settings(MEDIA_ROOT=media), donnees_synthetiques.jetable():
+                resultats = self._jouer(nombre_adherents, nombre_soins, noms, options['repetitions'])
+        finally:
+            shutil.rmtree(media, ignore_errors=True)
+
+        if options['sortie']:
+            with open(options['sortie'], 'w', encoding='utf-8') as fichier:
+                json.dump(resultats, fichier, indent=2, ensure_ascii=False)
+            self.stdout.write(f"Résultats écrits dans {options['sortie']}")
+        if reference is not None:
+            ecarts = benchmarks.ecarts_meta(resultats, reference)
+            if ecarts:
+                self.stdout.write(self.style.WARNING(
+                    f"Référence non comparable ({', '.join(ecarts)}) : comparaison ignorée"
+                ))
+            else:
+                self._comparer(resultats, reference, options['tolerance'])
+
+    def _jouer(self, nombre_adherents, nombre_soins, noms, repetitions):
+        debut = time.perf_counter()
+        rng = random.Random(42)
+        adherents = donnees_synthetiques.creer_adherents(nombre_adherents, rng=rng)
+        donnees_synthetiques.creer_soins(adherents, nombre_soins, rng=rng)
+        self.stdout.write(f"{nombre_adherents} adhérents et {nombre_soins} soins générés "
+                          f"en {time.perf_counter() - debut:.1f} s")
+
+        ctx = benchmarks.Contexte(benchmarks.client(), rng)
+        resultats = {'meta': benchmarks.meta(nombre_adherents, nombre_soins, repetitions), 'scenarios': {}}
+        self.stdout.write(f"{'scénario':<22} {'p50':>9} {'p90':>9} {'p99':>9} {'requêtes':>9} {'mémoire':>10}")
+        for nom in noms:
+            mesures = benchmarks.mesurer(benchmarks.SCENARIOS[nom], ctx, repetitions)
+            resultats['scenarios'][nom] = mesures
+            self.stdout.write(f"{nom:<22} {mesures['p50_ms']:>7.2f}ms {mesures['p90_ms']:>7.2f}ms "
+                              f"{mesures['p99_ms']:>7.2f}ms {mesures['requetes']:>9} "
+                              f"{mesures['memoire_ko']:>8.0f}ko")
+        return resultats
+
+    def _comparer(self, resultats, reference, tolerance):
+        regressions = benchmarks.comparer(resultats, reference, tolerance)
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("Aucune régression par rapport à la référence"))
+            return
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(
+                f"{regression['scenario']} : {regression['mesure']} "
+                f"{regression['reference']} -> {regression['actuel']}"
+            ))
+        raise CommandError(f"{len(regressions)} régression(s) par rapport à la référence")
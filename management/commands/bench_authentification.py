@@ -0,0 +1,67 @@
+import statistics
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.http import HttpRequest
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from api import benchmarks, donnees_synthetiques
+
+PROFILS = {
+    # Réglages Django par défaut : session et utilisateur relus en base à chaque requête
+    'base': {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+    },
+    'settings': {},
+}
+
+
+class Command(BaseCommand):
+    help = ("Coût de l'authentification par session à chaque requête : réglages Django par défaut "
+            "contre sessions et utilisateurs en cache (settings). Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repetitions', type=int, default=500)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'profil':<10} {'auth p50':>10} {'requêtes':>9} {'dashboard p50':>14} {'requêtes':>9}")
+        with donnees_synthetiques.jetable():
+            user = User.objects.create_user('bench_auth', password='bench-auth-1')
+            for nom, reglages in PROFILS.items():
+                with override_settings(**reglages):
+                    self._mesurer(nom, user, options['repetitions'])
+
+    def _mesurer(self, nom, user, repetitions):
+        client = benchmarks.client()
+        client.force_login(user, backend=settings.AUTHENTICATION_BACKENDS[0])
+        cle = client.session.session_key
+        store = import_module(settings.SESSION_ENGINE).SessionStore
+
+        def authentifier():
+            # Ce que fait AuthenticationMiddleware au premier accès à request.user
+            request = HttpRequest()
+            request.session = store(cle)
+            return get_user(request)
+
+        def dashboard():
+            return client.get('/api/dashboard/stats/')
+
+        resultats = []
+        for fonction in (authentifier, dashboard):
+            fonction()  # échauffement : remplit les caches
+            durees = []
+            for _ in range(repetitions):
+                debut = time.perf_counter()
+                fonction()
+                durees.append((time.perf_counter() - debut) * 1000)
+            with CaptureQueriesContext(connection) as requetes:
+                fonction()
+            resultats.append((statistics.median(durees), len(requetes)))
+        (auth, requetes_auth), (page, requetes_page) = resultats
+        self.stdout.write(f"{nom:<10} {auth:>8.3f}ms {requetes_auth:>9} {page:>12.3f}ms {requetes_page:>9}")
@@ -0,0 +1,49 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from api import donnees_synthetiques
+from api.models import Soin
+
+
+class Command(BaseCommand):
+    help = ("Rechargement des listes et fiches : réponse calculée, servie par le cache, "
+            "et 304 sur ETag inchangé. Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adherents', type=int, default=20000)
+        parser.add_argument('--soins', type=int, default=100000)
+        parser.add_argument('--repetitions', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with donnees_synthetiques.jetable():
+            self._mesurer(options['adherents'], options['soins'], options['repetitions'])
+
+    def _mesurer(self, nombre_adherents, nombre_soins, repetitions):
+        adherents = donnees_synthetiques.creer_adherents(nombre_adherents)
+        donnees_synthetiques.creer_soins(adherents, nombre_soins)
+        client = Client(HTTP_HOST='localhost')
+
+        def mediane(url, **entetes):
+            durees = []
+            for _ in range(repetitions):
+                debut = time.perf_counter()
+                response = client.get(url, **entetes)
+                durees.append((time.perf_counter() - debut) * 1000)
+            return statistics.median(durees), response
+
+        for url in ('/api/adherents/?page_size=100', '/api/cotisations/?page_size=100',
+                    '/api/soins/?page_size=100', f'/api/soins/{Soin.objects.values_list("id", flat=True).first()}/'):
+            # Paramètre unique à chaque appel : la réponse est recalculée (comportement d'avant)
+            durees = []
+            for numero in range(repetitions):
+                debut = time.perf_counter()
+                client.get(url, {'_': numero})
+                durees.append((time.perf_counter() - debut) * 1000)
+            calculee = statistics.median(durees)
+            en_cache, response = mediane(url)
+            non_modifiee, reponse_304 = mediane(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.stdout.write(f"{url:<34} calculée {calculee:>7.2f} ms   cache {en_cache:>6.2f} ms   "
+                              f"{reponse_304.status_code} {non_modifiee:>6.2f} ms ({len(response.content)} o)")
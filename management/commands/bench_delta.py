@@ -0,0 +1,59 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from api import donnees_synthetiques
+from api.models import Adherent, Soin
+
+
+class Command(BaseCommand):
+    help = ("Rafraîchissement périodique des adhérents et soins : liste complète (NDJSON) contre "
+            "delta depuis un curseur, après quelques écritures. Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adherents', type=int, default=20000)
+        parser.add_argument('--soins', type=int, default=200000)
+        parser.add_argument('--ecritures', type=int, default=100, help="Écritures entre deux rafraîchissements")
+
+    def handle(self, *args, **options):
+        with donnees_synthetiques.jetable():
+            self._mesurer(options['adherents'], options['soins'], options['ecritures'])
+
+    def _mesurer(self, nombre_adherents, nombre_soins, ecritures):
+        debut = time.perf_counter()
+        adherents = donnees_synthetiques.creer_adherents(nombre_adherents)
+        donnees_synthetiques.creer_soins(adherents, nombre_soins)
+        self.stdout.write(f"{nombre_adherents} adhérents et {nombre_soins} soins générés "
+                          f"en {time.perf_counter() - debut:.1f} s")
+
+        client = Client(HTTP_HOST='localhost')
+        curseurs = {liste: client.get(f'/api/{liste}/delta/').json()['curseur'] for liste in ('adherents', 'soins')}
+
+        # Écritures entre deux rafraîchissements : modifications et suppressions unitaires
+        for adherent in Adherent.objects.order_by('?')[:ecritures // 2]:
+            adherent.ville = 'Agadir' if adherent.ville != 'Agadir' else 'Safi'
+            adherent.save()
+        soins = list(Soin.objects.order_by('?')[:ecritures // 2])
+        for soin in soins[:len(soins) // 2]:
+            soin.montant_dossier += Decimal('1.00')
+            soin.save()
+        for soin in soins[len(soins) // 2:]:
+            soin.delete()
+
+        for liste in ('adherents', 'soins'):
+            debut = time.perf_counter()
+            taille = sum(len(morceau) for morceau in client.get(f'/api/{liste}/?stream=1').streaming_content)
+            complet = (time.perf_counter() - debut) * 1000
+
+            debut = time.perf_counter()
+            taille_delta, curseur, suite = 0, curseurs[liste], True
+            while suite:
+                response = client.get(f'/api/{liste}/delta/?curseur={curseur}')
+                taille_delta += len(response.content)
+                curseur, suite = response.json()['curseur'], response.json()['suite']
+            delta = (time.perf_counter() - debut) * 1000
+
+            self.stdout.write(f"{liste:<10} liste complète {complet:>8.0f} ms {taille / 1e3:>9.0f} ko   "
+                              f"delta {delta:>6.1f} ms {taille_delta / 1e3:>6.1f} ko")
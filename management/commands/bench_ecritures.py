@@ -0,0 +1,88 @@
+import multiprocessing
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+
+from api import benchmarks, donnees_synthetiques
+from api.models import Adherent, Soin
+
+PREFIXE = 'BW'
+# Réglages SQLite par défaut (journal rollback, synchronous=FULL), pour comparer au profil de settings
+PRAGMAS_DEFAUT = {'journal_mode': 'delete', 'synchronous': 'full'}
+
+
+def _ecrire(ecrivain, nombre, adherent_ids):
+    """Saisie de `nombre` soins par l'API dans un processus ; renvoie (durées en ms, erreurs)."""
+    client = benchmarks.client()
+    jour = date.today().isoformat()
+    durees, erreurs = [], 0
+    for i in range(nombre):
+        debut = time.perf_counter()
+        try:
+            response = client.post('/api/soins/', {
+                'adherent_id': adherent_ids[(ecrivain * nombre + i) % len(adherent_ids)],
+                'num_recu': f'{PREFIXE}-{ecrivain}-{i}', 'statut_dossier': 'recu', 'montant_dossier': '250.00',
+                'type_beneficier': 'Adherent', 'date_soin': jour, 'date_fin_soin': jour,
+            }, content_type='application/json')
+            ok = response.status_code == 201
+        except Exception:  # « database is locked » remonte du client de test
+            ok = False
+        if ok:
+            durees.append((time.perf_counter() - debut) * 1000)
+        else:
+            erreurs += 1
+    connections.close_all()
+    return durees, erreurs
+
+
+class Command(BaseCommand):
+    help = ("Écrivains concurrents : saisie de soins par l'API depuis plusieurs processus, débit et "
+            "erreurs pour chaque nombre d'écrivains. Les soins et adhérents créés sont supprimés à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ecrivains', default='1,2,4,8', help="Nombres de processus écrivains à mesurer")
+        parser.add_argument('--soins', type=int, default=200, help="Soins saisis par écrivain")
+        parser.add_argument('--adherents', type=int, default=500)
+        parser.add_argument('--profil', choices=['settings', 'defaut'], default='settings',
+                            help="SQLite : réglages de settings.SQLITE_PRAGMAS ou réglages par défaut")
+
+    def handle(self, *args, **options):
+        paliers = [int(valeur) for valeur in options['ecrivains'].split(',')]
+        if connection.vendor == 'sqlite' and connection.settings_dict['NAME'] in ('', ':memory:'):
+            raise CommandError("Base SQLite en mémoire : les processus écrivains ne la partagent pas")
+        if connection.vendor == 'sqlite' and options['profil'] == 'defaut':
+            settings.SQLITE_PRAGMAS = PRAGMAS_DEFAUT
+            connection.settings_dict['OPTIONS'] = {}
+            connection.settings_dict['CONN_MAX_AGE'] = 0
+        connection.close()
+
+        adherent_ids = [adherent.id for adherent in donnees_synthetiques.creer_adherents(
+            options['adherents'], prefixe_cin=PREFIXE)]
+        try:
+            self.stdout.write(f"{'écrivains':>9} {'soins/s':>9} {'p50':>9} {'p99':>9} {'erreurs':>8}")
+            for nombre in paliers:
+                self._palier(nombre, options['soins'], adherent_ids)
+        finally:
+            Soin.objects.filter(num_recu__startswith=f'{PREFIXE}-').delete()
+            Adherent.objects.filter(id__in=adherent_ids).delete()
+
+    def _palier(self, ecrivains, nombre, adherent_ids):
+        Soin.objects.filter(num_recu__startswith=f'{PREFIXE}-').delete()
+        # Processus forkés sans connexion ouverte : chacun ouvre la sienne
+        connections.close_all()
+        contexte = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=ecrivains, mp_context=contexte) as pool:
+            debut = time.perf_counter()
+            resultats = list(pool.map(_ecrire, range(ecrivains), [nombre] * ecrivains,
+                                      [adherent_ids] * ecrivains))
+            duree = time.perf_counter() - debut
+        durees = [valeur for valeurs, _ in resultats for valeur in valeurs]
+        erreurs = sum(erreurs for _, erreurs in resultats)
+        p50 = statistics.median(durees) if durees else 0
+        p99 = benchmarks.centile(durees, 99) if durees else 0
+        self.stdout.write(f"{ecrivains:>9} {len(durees) / duree:>9.0f} {p50:>7.1f}ms {p99:>7.1f}ms {erreurs:>8}")
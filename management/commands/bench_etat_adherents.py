@@ -0,0 +1,61 @@
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api import donnees_synthetiques, etat_adherents
+from api.models import Cotisation, EtatAdherent
+
+
+class Command(BaseCommand):
+    help = ("Compare les contrôles « actif à jour » sur EtatAdherent au parcours de toutes les cotisations "
+            "(comportement de l'écran Cotisations). Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adherents', type=int, default=100000)
+        parser.add_argument('--repetitions', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with donnees_synthetiques.jetable():
+            self._mesurer(options['adherents'], options['repetitions'])
+
+    def _mesurer(self, nombre, repetitions):
+        debut = time.perf_counter()
+        adherents = donnees_synthetiques.creer_adherents(nombre)
+        self.stdout.write(f"{nombre} adhérents générés en {time.perf_counter() - debut:.1f} s")
+        jour = timezone.now().date()
+        cible = adherents[len(adherents) // 2].id
+
+        def parcours():
+            # Avant : toutes les cotisations chargées puis date_fin comparée côté client
+            return sum(
+                1 for c in Cotisation.objects.select_related('adherent')
+                if c.adherent.statut == 'actif' and c.cotisation == 'oui' and c.date_fin and c.date_fin >= jour
+            )
+
+        scenarios = [
+            ('parcours des cotisations', parcours, 1),
+            ('actifs à jour (count)', lambda: EtatAdherent.objects.filter(
+                etat_adherents.a_jour(jour), statut='actif').count(), repetitions),
+            ('expire dans 7 j, anp', lambda: len(etat_adherents.filtrer(
+                EtatAdherent.objects.all(), {'expire_dans': '7', 'organisme': 'anp'}, jour)[:50]), repetitions),
+            ('échus', lambda: len(EtatAdherent.objects.filter(date_fin__lt=jour)[:50]), repetitions),
+            ('éligibilité (1 adhérent)', lambda: EtatAdherent.objects.get(pk=cible).est_a_jour(jour), repetitions),
+        ]
+        for libelle, fonction, nb in scenarios:
+            durees = []
+            for _ in range(nb):
+                with CaptureQueriesContext(connection) as requetes:
+                    debut = time.perf_counter()
+                    resultat = fonction()
+                    durees.append((time.perf_counter() - debut) * 1000)
+            self.stdout.write(f"{libelle:<28} {statistics.median(durees):>9.2f} ms "
+                              f"{len(requetes):>2} requête(s) -> {resultat}")
+
+        debut = time.perf_counter()
+        total = etat_adherents.reconstruire()
+        self.stdout.write(f"reconstruction : {total} lignes en {time.perf_counter() - debut:.1f} s")
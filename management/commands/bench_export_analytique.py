@@ -0,0 +1,60 @@
+import time
+import tracemalloc
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+from api import donnees_synthetiques
+
+
+class Command(BaseCommand):
+    help = ("Export de tous les soins : pages JSON, flux NDJSON (?stream=1) et export "
+            "Parquet/Arrow (/analytique/). Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--soins', type=int, default=200000)
+        parser.add_argument('--adherents', type=int, default=5000)
+        parser.add_argument('--memoire', action='store_true',
+                            help="Mesure aussi le pic mémoire (tracemalloc, ralentit les mesures)")
+
+    def handle(self, *args, **options):
+        with donnees_synthetiques.jetable():
+            self._mesurer(options['soins'], options['adherents'], options['memoire'])
+
+    def _mesurer(self, nombre, nombre_adherents, memoire):
+        debut = time.perf_counter()
+        adherents = donnees_synthetiques.creer_adherents(nombre_adherents, avec_cotisations=False)
+        donnees_synthetiques.creer_soins(adherents, nombre)
+        self.stdout.write(f"{nombre} soins générés en {time.perf_counter() - debut:.1f} s")
+
+        client = Client(HTTP_HOST='localhost')
+        client.force_login(User.objects.create_user('bench_export_analytique'))
+
+        def pages_json():
+            # Parcours des pages de l'API (page_size maximal), comme le faisait l'équipe actuariat
+            taille, url = 0, '/api/soins/?page_size=500'
+            while url:
+                response = client.get(url)
+                taille += len(response.content)
+                url = response.json()['next']
+            return taille
+
+        def flux(url):
+            def lire():
+                return sum(len(morceau) for morceau in client.get(url).streaming_content)
+            return lire
+
+        for libelle, fonction in (('pages JSON', pages_json),
+                                  ('NDJSON ?stream=1', flux('/api/soins/?stream=1')),
+                                  ('Parquet', flux('/api/soins/analytique/?sortie=parquet')),
+                                  ('Arrow IPC', flux('/api/soins/analytique/?sortie=arrow'))):
+            if memoire:
+                tracemalloc.start()
+            debut = time.perf_counter()
+            taille = fonction()
+            ligne = f"{libelle:<18} {(time.perf_counter() - debut) * 1000:>10.0f} ms  {taille / 1e6:>8.1f} Mo"
+            if memoire:
+                ligne += f"  pic mémoire {tracemalloc.get_traced_memory()[1] / 1e6:>7.1f} Mo"
+                tracemalloc.stop()
+            self.stdout.write(ligne)
@@ -0,0 +1,65 @@
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.test import override_settings
+from weasyprint import HTML
+
+from api import donnees_synthetiques, export_recus
+from api.models import Soin
+
+
+class Command(BaseCommand):
+    help = ("Mesure l'export groupé des reçus (ZIP à froid et à chaud, PDF fusionné) "
+            "face au rendu un par un de la vue recu_pdf. Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--soins', type=int, nargs='+', default=[1000, 10000])
+        parser.add_argument('--echantillon', type=int, default=100,
+                            help="Reçus rendus un par un pour estimer l'approche actuelle")
+
+    def handle(self, *args, **options):
+        for nombre in options['soins']:
+            media = tempfile.mkdtemp()
+            try:
+                # Cache PDF vide pour chaque taille
+                with override_settings(MEDIA_ROOT=media), donnees_synthetiques.jetable():
+                    self._mesurer(nombre, options['echantillon'])
+            finally:
+                shutil.rmtree(media, ignore_errors=True)
+
+    def _mesurer(self, nombre, echantillon):
+        adherents = donnees_synthetiques.creer_adherents(max(nombre // 10, 1), avec_cotisations=False)
+        donnees_synthetiques.creer_soins(adherents, nombre)
+        queryset = Soin.objects.all()
+        self.stdout.write(f"--- {nombre} reçus")
+
+        # Référence : un appel par reçu, rendu WeasyPrint complet à chaque fois
+        soins = list(export_recus.soins_a_exporter(queryset)[:echantillon])
+        debut = time.perf_counter()
+        for soin in soins:
+            HTML(string=render_to_string(export_recus.TEMPLATE, {'soin': soin})).write_pdf()
+        self._afficher('un par un', len(soins), time.perf_counter() - debut)
+
+        for etat in ('froid', 'chaud'):
+            with tempfile.TemporaryFile() as sortie:
+                debut = time.perf_counter()
+                for morceau in export_recus.flux_zip(queryset):
+                    sortie.write(morceau)
+                duree = time.perf_counter() - debut
+                taille = sortie.tell()
+            self._afficher(f'zip ({etat})', nombre, duree, f"{taille / 1024 / 1024:.1f} Mo")
+
+        limite = min(nombre, export_recus.fusion_max())
+        with tempfile.TemporaryFile() as sortie:
+            debut = time.perf_counter()
+            ids = list(queryset.order_by('id').values_list('id', flat=True)[:limite])
+            export_recus.ecrire_pdf_fusionne(Soin.objects.filter(id__in=ids), sortie)
+            self._afficher('pdf fusionné', limite, time.perf_counter() - debut)
+
+    def _afficher(self, libelle, nombre, duree, detail=''):
+        self.stdout.write(
+            f"{libelle:>14} {nombre:>6} reçus {duree:>8.2f} s {nombre / duree if duree else 0:>8.1f} reçus/s {detail}"
+        )
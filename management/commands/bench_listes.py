@@ -0,0 +1,55 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.utils.encoders import JSONEncoder
+
+from api import donnees_synthetiques, listes_legeres
+from api.models import Adherent, Soin
+from api.serializers import AdherentSerializer, SoinSerializer
+from api.views import AdherentViewSet, SoinViewSet
+
+
+class Command(BaseCommand):
+    help = ("Listes par paquets de 10 000 lignes : ModelSerializer complet contre lignes construites "
+            "depuis values() (?fields=, ?compact=1, ?expand=). Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lignes', type=int, default=10000)
+        parser.add_argument('--repetitions', type=int, default=5)
+
+    def handle(self, *args, **options):
+        with donnees_synthetiques.jetable():
+            self._mesurer(options['lignes'], options['repetitions'])
+
+    def _mesurer(self, nombre, repetitions):
+        adherents = donnees_synthetiques.creer_adherents(nombre)
+        donnees_synthetiques.creer_soins(adherents, nombre)
+
+        def serializer(classe, queryset):
+            return lambda: classe(list(queryset[:nombre]), many=True).data
+
+        def legere(vue, champs, expand=()):
+            lignes = listes_legeres.Lignes(vue.colonnes, vue.expansions, champs, expand)
+            queryset = vue.queryset.model.objects.order_by('id').values(*lignes.chemins())
+            return lambda: [lignes.construire(ligne) for ligne in queryset[:nombre]]
+
+        scenarios = (
+            ('adhérents, AdherentSerializer', serializer(AdherentSerializer, Adherent.objects.order_by('id'))),
+            ('adhérents, toutes colonnes', legere(AdherentViewSet, list(AdherentViewSet.colonnes))),
+            ('adhérents, ?compact=1', legere(AdherentViewSet, AdherentViewSet.colonnes_liste)),
+            ('soins, SoinSerializer', serializer(SoinSerializer, Soin.objects.select_related('adherent')
+                                                 .order_by('id'))),
+            ('soins, ?expand=adherent', legere(SoinViewSet, SoinViewSet.colonnes_liste, ['adherent'])),
+            ('soins, ?compact=1', legere(SoinViewSet, SoinViewSet.colonnes_liste)),
+        )
+        self.stdout.write(f"{nombre} lignes par liste (lecture + sérialisation, médiane de {repetitions})")
+        for libelle, fonction in scenarios:
+            durees = []
+            for _ in range(repetitions):
+                debut = time.perf_counter()
+                donnees = fonction()
+                durees.append((time.perf_counter() - debut) * 1000)
+            taille = len(json.dumps(donnees, cls=JSONEncoder).encode('utf-8'))
+            self.stdout.write(f"{libelle:<34} {statistics.median(durees):>8.1f} ms  {taille / 1e3:>8.0f} ko")
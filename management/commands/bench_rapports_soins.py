@@ -0,0 +1,70 @@
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from api import donnees_synthetiques, rapports_soins
+from api.models import Soin
+
+
+class Command(BaseCommand):
+    help = ("Cumul annuel des soins : synthèse mensuelle, agrégation SQL sur Soin, "
+            "et téléchargement de tous les soins. Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--soins', type=int, default=1000000)
+        parser.add_argument('--adherents', type=int, default=20000)
+        parser.add_argument('--repetitions', type=int, default=10)
+
+    def handle(self, *args, **options):
+        with donnees_synthetiques.jetable():
+            self._mesurer(options['soins'], options['adherents'], options['repetitions'])
+
+    def _mesurer(self, nombre, nombre_adherents, repetitions):
+        debut = time.perf_counter()
+        adherents = donnees_synthetiques.creer_adherents(nombre_adherents, avec_cotisations=False)
+        donnees_synthetiques.creer_soins(adherents, nombre)
+        self.stdout.write(f"{nombre} soins générés en {time.perf_counter() - debut:.1f} s")
+
+        aujourd_hui = timezone.now().date()
+        annee = aujourd_hui.replace(month=1, day=1)
+        grouper = ['organisme_employeur', 'statut_dossier']
+
+        def synthese():
+            return rapports_soins.rapport(annee, aujourd_hui, 'mois', grouper)
+
+        def agregation_sql():
+            return list(
+                Soin.objects.filter(date_soin__gte=annee)
+                .annotate(mois=TruncMonth('date_soin'), organisme_employeur=F('adherent__organisme_employeur'))
+                .values('mois', 'organisme_employeur', 'statut_dossier')
+                .annotate(nombre=Count('id'), montant=Sum('montant_dossier'), moyenne=Avg('montant_dossier'))
+                .order_by('mois', 'organisme_employeur', 'statut_dossier')
+            )
+
+        def telechargement():
+            # Avant : tous les soins de l'année récupérés puis additionnés côté client
+            totaux = {}
+            for soin in Soin.objects.filter(date_soin__gte=annee).select_related('adherent'):
+                cle = (soin.date_soin.replace(day=1), soin.adherent.organisme_employeur, soin.statut_dossier)
+                nombre, montant = totaux.get(cle, (0, Decimal(0)))
+                totaux[cle] = (nombre + 1, montant + soin.montant_dossier)
+            return totaux
+
+        for libelle, fonction, nb in (('synthèse mensuelle', synthese, repetitions),
+                                      ('agrégation sur Soin', agregation_sql, 3),
+                                      ('téléchargement', telechargement, 1)):
+            durees = []
+            for _ in range(nb):
+                debut = time.perf_counter()
+                lignes = fonction()
+                durees.append((time.perf_counter() - debut) * 1000)
+            self.stdout.write(f"{libelle:<22} {statistics.median(durees):>10.1f} ms  {len(lignes)} lignes")
+
+        debut = time.perf_counter()
+        total = rapports_soins.reconstruire()
+        self.stdout.write(f"reconstruction : {total} lignes en {time.perf_counter() - debut:.1f} s")
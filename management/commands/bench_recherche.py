@@ -0,0 +1,49 @@
+import random
+import time
+from statistics import median
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from api import donnees_synthetiques, recherche
+from api.models import Adherent
+
+
+class Command(BaseCommand):
+    help = ("Mesure le temps de ?search= (index de mots) et de icontains (balayage) "
+            "pour des tables de tailles croissantes. Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tailles', default='1000,10000,100000',
+                            help="Nombres d'adhérents séparés par des virgules")
+        parser.add_argument('--repetitions', type=int, default=20)
+
+    def handle(self, *args, **options):
+        tailles = sorted(int(t) for t in options['tailles'].split(','))
+        with donnees_synthetiques.jetable():
+            self._mesurer(tailles, options['repetitions'])
+
+    def _mesurer(self, tailles, repetitions):
+        rng = random.Random(42)
+        crees = 0
+        self.stdout.write(f"{'adhérents':>10} {'search (ms)':>12} {'icontains (ms)':>15}")
+        for taille in tailles:
+            donnees_synthetiques.creer_adherents(taille - crees, debut=crees, rng=rng, avec_cotisations=False)
+            crees = taille
+
+            cibles = [f'BK{rng.randrange(taille):07d}' for _ in range(repetitions)]
+            indexe = self._chrono(lambda c: list(
+                Adherent.objects.filter(id__in=recherche.classement(c).values('adherent_id'))), cibles)
+            balayage = self._chrono(lambda c: list(
+                Adherent.objects.filter(Q(nom__icontains=c) | Q(prenom__icontains=c) | Q(cin__icontains=c))),
+                cibles)
+            self.stdout.write(f"{taille:>10} {indexe:>12.2f} {balayage:>15.2f}")
+
+    @staticmethod
+    def _chrono(fonction, cibles):
+        durees = []
+        for cible in cibles:
+            debut = time.perf_counter()
+            fonction(cible)
+            durees.append((time.perf_counter() - debut) * 1000)
+        return median(durees)
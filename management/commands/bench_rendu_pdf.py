@@ -0,0 +1,56 @@
+import io
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from weasyprint import CSS, HTML
+
+from api import donnees_synthetiques, rendu_pdf
+from api.models import Soin
+
+
+class Command(BaseCommand):
+    help = ("Temps de rendu par document : template, feuille de style et polices rechargés à chaque "
+            "appel (avant) ou moteur partagé rendu_pdf (après). Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--documents', type=int, default=50, help="Documents rendus par mesure")
+
+    def handle(self, *args, **options):
+        with donnees_synthetiques.jetable():
+            adherents = donnees_synthetiques.creer_adherents(options['documents'], avec_cotisations=False)
+            donnees_synthetiques.creer_soins(adherents, options['documents'])
+            soins = list(Soin.objects.select_related('adherent'))
+            contextes = {
+                'carte_mutuelle.html': [
+                    {'nom': a.nom, 'prenom': a.prenom, 'cin': a.cin, 'nax': a.nax,
+                     'date_recu': a.date_recrutement.strftime('%d/%m/%Y')} for a in adherents
+                ],
+                'recu_template.html': [{'soin': soin} for soin in soins],
+            }
+            for template_name, liste in contextes.items():
+                avant = self._mesurer(liste, lambda contexte: self._avant(template_name, contexte))
+                rendu_pdf.prechauffer()
+                apres = self._mesurer(liste, lambda contexte: self._apres(template_name, contexte))
+                self.stdout.write(
+                    f"{template_name:<22} avant {avant:>8.2f} ms/doc   après {apres:>8.2f} ms/doc   "
+                    f"x{avant / apres if apres else 0:.1f}"
+                )
+
+    def _avant(self, template_name, contexte):
+        # Comportement précédent : lookup du template, CSS analysée et polices chargées à chaque appel
+        html_string = render_to_string(template_name, contexte)
+        feuille = CSS(string=rendu_pdf.source_feuille(template_name))
+        HTML(string=html_string).write_pdf(target=io.BytesIO(), stylesheets=[feuille])
+
+    def _apres(self, template_name, contexte):
+        rendu_pdf.ecrire_pdf(template_name, rendu_pdf.html(template_name, contexte), io.BytesIO())
+
+    def _mesurer(self, contextes, rendre):
+        durees = []
+        for contexte in contextes:
+            debut = time.perf_counter()
+            rendre(contexte)
+            durees.append((time.perf_counter() - debut) * 1000)
+        return statistics.median(durees)
@@ -0,0 +1,56 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api import donnees_synthetiques, renouvellement
+from api.models import Cotisation
+
+
+class Command(BaseCommand):
+    help = ("Compare le renouvellement ensembliste d'une section à la boucle save() par cotisation. "
+            "Les données sont annulées à la fin.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adherents', type=int, default=100000)
+        parser.add_argument('--echantillon', type=int, default=500,
+                            help="Cotisations enregistrées une à une pour estimer la boucle")
+
+    def handle(self, *args, **options):
+        with donnees_synthetiques.jetable():
+            self._mesurer(options['adherents'], options['echantillon'])
+
+    def _mesurer(self, nombre, echantillon):
+        debut = time.perf_counter()
+        donnees_synthetiques.creer_adherents(nombre)
+        self.stdout.write(f"{nombre} adhérents générés en {time.perf_counter() - debut:.1f} s")
+
+        for section in ('marsa_maroc', None):
+            for operation, fonction in (('expirer', renouvellement.expirer),
+                                        ('renouveler', renouvellement.renouveler)):
+                with CaptureQueriesContext(connection) as requetes:
+                    debut = time.perf_counter()
+                    rapport = fonction(section)
+                    duree = time.perf_counter() - debut
+                self.stdout.write(
+                    f"{operation:>10} section={section or 'toutes':<12} {rapport['cotisations']:>7} cotisations "
+                    f"{duree * 1000:>9.1f} ms {len(requetes):>3} requêtes"
+                )
+
+        # Référence : une cotisation à la fois, comme une modification depuis l'API
+        cotisations = list(Cotisation.objects.filter(cotisation='oui').select_related('adherent')[:echantillon])
+        date_debut = timezone.now().date() + timedelta(days=1)
+        with CaptureQueriesContext(connection) as requetes:
+            debut = time.perf_counter()
+            for cotisation in cotisations:
+                cotisation.date_debut = date_debut
+                cotisation.save()
+            duree = time.perf_counter() - debut
+        total = Cotisation.objects.filter(cotisation='oui').count()
+        self.stdout.write(
+            f"{'save()':>10} {len(cotisations)} cotisations {duree * 1000:.1f} ms, {len(requetes)} requêtes "
+            f"-> estimé {duree / max(len(cotisations), 1) * total:.1f} s pour {total} cotisations"
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api import modifications
+
+
+class Command(BaseCommand):
+    help = "Supprime du journal les modifications remplacées par une écriture plus récente du même objet"
+
+    def handle(self, *args, **options):
+        supprimees = modifications.compacter()
+        self.stdout.write(self.style.SUCCESS(f"{supprimees} ligne(s) de journal supprimée(s)"))
@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api import export_analytique
+
+
+class Command(BaseCommand):
+    help = "Exporte adhérents, cotisations ou soins en Parquet ou Arrow IPC (export incrémental d'après le journal des modifications)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=list(export_analytique.TABLES))
+        parser.add_argument('fichier', help="Fichier de sortie (.parquet ou .arrow)")
+        parser.add_argument('--sortie', choices=list(export_analytique.FORMATS),
+                            help="Format (déduit de l'extension par défaut)")
+        parser.add_argument('--curseur', type=int,
+                            help="Lignes créées ou modifiées après ce curseur du journal (export précédent)")
+        parser.add_argument('--depuis', help="Lignes créées ou modifiées depuis AAAA-MM-JJ[THH:MM]")
+        parser.add_argument('--lot', type=int, default=export_analytique.TAILLE_PAQUET,
+                            help="Lignes par record batch")
+
+    def handle(self, *args, **options):
+        sortie = options['sortie'] or ('arrow' if options['fichier'].lower().endswith('.arrow') else 'parquet')
+        modele = export_analytique.TABLES[options['table']]
+        debut = time.perf_counter()
+        try:
+            queryset = export_analytique.selection(modele.objects.all(), options['curseur'], options['depuis'])
+            suivant = export_analytique.curseur()
+            contenu = export_analytique.flux(queryset, sortie, suivant, options['lot'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        total = queryset.count()
+        with open(options['fichier'], 'wb') as fichier:
+            for morceau in contenu:
+                fichier.write(morceau)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} ligne(s) exportée(s) dans {options['fichier']} en {time.perf_counter() - debut:.1f} s"
+        ))
+        self.stdout.write(f"Export suivant : --curseur {suivant}")
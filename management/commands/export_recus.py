@@ -0,0 +1,71 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from api import export_recus, rendu_pdf
+from api.models import Soin
+
+
+def _rendre(ids):
+    chemins = export_recus.rendre_ids(ids)
+    connections.close_all()
+    return len(chemins)
+
+
+class Command(BaseCommand):
+    help = "Exporte les reçus de soins filtrés dans une archive ZIP ou un PDF fusionné"
+
+    def add_arguments(self, parser):
+        parser.add_argument('fichier', help="Fichier de sortie (.zip ou .pdf)")
+        parser.add_argument('--mois', help="Mois du soin, AAAA-MM")
+        parser.add_argument('--statut', choices=['recu', 'rejet'], help="statut_dossier")
+        parser.add_argument('--cin', help="CIN de l'adhérent")
+        parser.add_argument('--processus', type=int, default=0,
+                            help="Processus de rendu en parallèle avant l'écriture du ZIP (0 = aucun)")
+        parser.add_argument('--lot', type=int, default=50, help="Reçus rendus par tâche de processus")
+
+    def handle(self, *args, **options):
+        queryset = self._filtrer(options)
+        total = queryset.count()
+        debut = time.perf_counter()
+
+        if options['fichier'].lower().endswith('.pdf'):
+            try:
+                with open(options['fichier'], 'wb') as sortie:
+                    export_recus.ecrire_pdf_fusionne(queryset, sortie)
+            except ValueError as exc:
+                raise CommandError(str(exc))
+        else:
+            if options['processus'] > 0:
+                self._prerendre(queryset, options['processus'], options['lot'])
+            with open(options['fichier'], 'wb') as sortie:
+                for morceau in export_recus.flux_zip(queryset):
+                    sortie.write(morceau)
+
+        duree = time.perf_counter() - debut
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} reçu(s) exporté(s) dans {options['fichier']} en {duree:.1f} s "
+            f"({total / duree if duree else 0:.1f} reçus/s)"
+        ))
+
+    def _filtrer(self, options):
+        queryset = Soin.objects.all()
+        if options['mois']:
+            try:
+                annee, mois = (int(partie) for partie in options['mois'].split('-'))
+            except ValueError:
+                raise CommandError("--mois attend AAAA-MM")
+            queryset = queryset.filter(date_soin__year=annee, date_soin__month=mois)
+        if options['statut']:
+            queryset = queryset.filter(statut_dossier=options['statut'])
+        if options['cin']:
+            queryset = queryset.filter(adherent__cin=options['cin'])
+        return queryset
+
+    def _prerendre(self, queryset, processus, lot):
+        # Remplit le cache PDF en parallèle ; l'écriture du ZIP ne fait ensuite que lire le disque
+        ids = list(queryset.order_by('id').values_list('id', flat=True))
+        with rendu_pdf.pool_processus(processus) as pool:
+            rendus = sum(pool.map(_rendre, export_recus.par_paquets(ids, lot)))
+        self.stdout.write(f"{rendus} reçu(s) rendu(s) par {processus} processus")
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api import import_adherents
+
+
+class Command(BaseCommand):
+    help = "Importe des adhérents depuis un fichier CSV ou XLSX (une ligne d'en-tête avec les noms des champs)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('fichier')
+        parser.add_argument('--lot', type=int, default=500, help="Lignes validées et insérées par transaction")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['fichier'], 'rb') as fichier:
+                rapport = import_adherents.importer(
+                    import_adherents.lire_fichier(fichier, options['fichier']), taille_lot=options['lot']
+                )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for erreur in rapport['erreurs']:
+            self.stderr.write(f"Ligne {erreur['ligne']} : {erreur['erreurs']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{rapport['crees']}/{rapport['lignes']} adhérent(s) importé(s) en {rapport['duree']} s "
+            f"({rapport['lignes_par_seconde']} lignes/s), {len(rapport['erreurs'])} erreur(s)"
+        ))
@@ -0,0 +1,98 @@
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api import rendu_pdf, taches_pdf
+
+
+def _rendre(type_document, objet_id):
+    # Connexion gardée d'une tâche à l'autre (processus préchauffé) ; refermée si périmée ou en erreur
+    close_old_connections()
+    return taches_pdf.generer_document(type_document, objet_id)
+
+
+class Command(BaseCommand):
+    help = "Traite la file des rendus PDF (cartes et reçus) avec un pool de processus"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processus', type=int, default=2,
+                            help="Nombre de processus de rendu (0 = rendu dans ce processus)")
+        parser.add_argument('--lot', type=int, default=20, help="Tâches réclamées par itération")
+        parser.add_argument('--pause', type=float, default=2.0, help="Attente (s) quand la file est vide")
+        parser.add_argument('--une-fois', action='store_true', help="Vider la file puis s'arrêter")
+        parser.add_argument('--reprise', type=float, default=60.0,
+                            help="Intervalle (s) de reprise des tâches abandonnées par un worker arrêté")
+
+    def handle(self, *args, **options):
+        self.processus, self.pool = options['processus'], None
+        if self.processus > 0:
+            # Processus préchauffés : feuilles de style et polices chargées avant la première tâche
+            self.pool = rendu_pdf.pool_processus(self.processus)
+        try:
+            prochaine_reprise = 0
+            while True:
+                # Pas seulement au démarrage : un autre worker peut s'arrêter pendant que celui-ci tourne
+                if time.monotonic() >= prochaine_reprise:
+                    self._reprendre()
+                    prochaine_reprise = time.monotonic() + options['reprise']
+                traitees = self._traiter_lot(options['lot'])
+                if not traitees:
+                    if options['une_fois']:
+                        break
+                    time.sleep(options['pause'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown(wait=True)
+
+    def _reprendre(self):
+        reprises = taches_pdf.reprendre_abandonnees()
+        if reprises:
+            self.stdout.write(f"{reprises} tâche(s) abandonnée(s) remise(s) en file")
+
+    def _traiter_lot(self, limite):
+        taches = [t for t in taches_pdf.taches_disponibles(limite) if taches_pdf.reclamer(t)]
+        if self.pool is None:
+            for tache in taches:
+                self._journaliser(taches_pdf.executer(tache))
+            return len(taches)
+
+        futures, casse = [], None
+        try:
+            for tache in taches:
+                futures.append((tache, self.pool.submit(_rendre, tache.type_document, tache.objet_id)))
+        except BrokenProcessPool as exc:
+            casse = exc
+        for tache, future in futures:
+            try:
+                chemin = future.result()
+            except BrokenProcessPool as exc:
+                casse = exc
+                taches_pdf.echouer(tache, exc)
+            except Exception as exc:
+                taches_pdf.echouer(tache, exc)
+            else:
+                taches_pdf.terminer(tache, chemin=chemin)
+            self._journaliser(tache)
+        if casse is not None:
+            # Tâches réclamées mais non soumises : échec compté, nouvelle tentative plus tard
+            for tache in taches[len(futures):]:
+                taches_pdf.echouer(tache, casse)
+                self._journaliser(tache)
+            self._recreer_pool()
+        return len(taches)
+
+    def _recreer_pool(self):
+        # Un processus de rendu arrêté (mémoire, plantage) rend le pool inutilisable
+        self.stdout.write(self.style.WARNING("Processus de rendu arrêté : pool recréé"))
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = rendu_pdf.pool_processus(self.processus)
+
+    def _journaliser(self, tache):
+        if tache.statut == 'termine':
+            self.stdout.write(self.style.SUCCESS(f"{tache} -> {tache.fichier}"))
+        else:
+            self.stdout.write(self.style.WARNING(f"{tache} : {tache.erreur}"))
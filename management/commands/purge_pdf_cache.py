@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from api import cache_pdf
+
+
+class Command(BaseCommand):
+    help = "Supprime du cache les PDF trop anciens ou dépassant la taille maximale"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--taille-max', type=int, help="Taille maximale du cache en octets")
+        parser.add_argument('--age-max', type=int, help="Âge maximal d'un PDF en secondes")
+
+    def handle(self, *args, **options):
+        supprimes = cache_pdf.purger(taille_max=options['taille_max'], age_max=options['age_max'])
+        self.stdout.write(self.style.SUCCESS(f"{supprimes} PDF supprimé(s) du cache"))
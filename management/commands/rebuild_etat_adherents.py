@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api import etat_adherents
+
+
+class Command(BaseCommand):
+    help = "Reconstruit la table EtatAdherent (situation des adhérents) à partir des adhérents et cotisations"
+
+    def handle(self, *args, **options):
+        total = etat_adherents.reconstruire()
+        self.stdout.write(self.style.SUCCESS(f"{total} adhérents synchronisés"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api import rapports_soins
+
+
+class Command(BaseCommand):
+    help = "Reconstruit la synthèse mensuelle des soins (SyntheseSoins) à partir de la table des soins"
+
+    def handle(self, *args, **options):
+        total = rapports_soins.reconstruire()
+        self.stdout.write(self.style.SUCCESS(f"{total} lignes de synthèse"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api import recherche
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index de recherche des adhérents (nom, prénom, CIN, NAX)"
+
+    def handle(self, *args, **options):
+        total = recherche.reconstruire_index()
+        self.stdout.write(self.style.SUCCESS(f"{total} mots indexés"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api import stats
+
+
+class Command(BaseCommand):
+    help = "Recalcule les compteurs du tableau de bord à partir des tables"
+
+    def handle(self, *args, **options):
+        nombre = stats.reconstruire()
+        self.stdout.write(self.style.SUCCESS(f"{nombre} compteurs recalculés"))
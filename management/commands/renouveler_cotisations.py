@@ -0,0 +1,30 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from api import renouvellement
+from api.models import Adherent
+
+
+class Command(BaseCommand):
+    help = "Renouvelle (ou expire avec --expirer) les cotisations de toute une section en une fois"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--section', choices=[c for c, _ in Adherent.ORGANISME_CHOICES],
+                            help="section_cotisation concernée (toutes par défaut)")
+        parser.add_argument('--date', type=date.fromisoformat,
+                            help="Début de la nouvelle période, ou date de référence avec --expirer (AAAA-MM-JJ)")
+        parser.add_argument('--expirer', action='store_true', help="Expirer les cotisations échues au lieu de renouveler")
+        parser.add_argument('--dry-run', action='store_true', help="Afficher les effectifs concernés sans rien modifier")
+
+    def handle(self, *args, **options):
+        if options['expirer']:
+            rapport = renouvellement.expirer(options['section'], options['date'], options['dry_run'])
+        else:
+            rapport = renouvellement.renouveler(options['section'], options['date'], options['dry_run'])
+
+        prefixe = "[dry-run] " if options['dry_run'] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefixe}{rapport['operation']} section={rapport['section'] or 'toutes'} : "
+            f"{rapport['cotisations']} cotisation(s), {rapport['adherents']} adhérent(s) modifié(s)"
+        ))
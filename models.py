@@ -1,95 +1,290 @@
-from django.db import models
-from datetime import timedelta
-from dateutil.relativedelta import relativedelta  # pour gérer les mois
-# Create your models here.
-
-class Adherent(models.Model):
-    STATUT_CHOICES = [
-        ('actif', 'Actif'),
-        ('retraite', 'Retraité'),
-    ]
-    TYPE_ADHERENT_CHOICES = [
-        ('ayant_droit', 'Ayant droit'),
-        ('sans_droit', 'Sans droit'),
-    ]
-    SEXE_CHOICES = [
-        ('homme', 'Homme'),
-        ('femme', 'Femme'),
-    ]
-
-    ORGANISME_CHOICES = [
-        ('anp', 'ANP'),
-        ('marsa_maroc', 'Marsa Maroc'),
-        ('modep', 'Modep'),
-    ]
-    nax = models.CharField(max_length=6, unique=True, blank=True, null=True)
-    nom = models.CharField(max_length=100)
-    prenom = models.CharField(max_length=100)
-
-    date_naissance = models.DateField()
-    cin = models.CharField(max_length=10, unique=True)
-    sexe = models.CharField(max_length=10, choices=SEXE_CHOICES)
-    date_recrutement = models.DateField(null=True, blank=True)
-    statut = models.CharField(max_length=20,choices=STATUT_CHOICES)
-    a_droit = models.CharField(max_length=20, choices=TYPE_ADHERENT_CHOICES)
-    numero_tel = models.CharField(max_length=15)
-    rib = models.CharField(max_length=24)
-    ville = models.CharField(max_length=100)
-    adresse = models.TextField()
-    salaire = models.DecimalField(max_digits=10, decimal_places=2)
-    organisme_employeur = models.CharField(max_length=20, choices=ORGANISME_CHOICES)
-    section_cotisation = models.CharField(max_length=20, choices=ORGANISME_CHOICES)
-    
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)  # Sauvegarde d'abord pour avoir un id attribué
-        if not self.nax:
-            self.nax = str(self.id).zfill(6)
-            super().save(update_fields=['nax']) 
-
-    def __str__(self):
-        return f" {self.id:06d} {self.prenom} {self.nom} ({self.cin})"
-
-
-
-class Cotisation(models.Model):
-    COTISATION_CHOICES = [
-        ('oui', 'Oui'),
-        ('non', 'Non'),
-    ]
-
-    adherent = models.ForeignKey('Adherent', on_delete=models.CASCADE, related_name="cotisations")
-    cotisation = models.CharField(max_length=20, choices=COTISATION_CHOICES)
-    cin = models.CharField(max_length=10,unique=True)
-    date_debut = models.DateField(null=True, blank=True)
-    date_fin = models.DateField(null=True, blank=True)
-
-    def save(self, *args, **kwargs):
-        if self.date_debut:
-            # date_fin = date_debut + 1 mois
-            self.date_fin = self.date_debut + relativedelta(months=+1)
-        else:
-            self.date_fin = None
-        super().save(*args, **kwargs)
-
-    def __str__(self):
-        return f"{self.adherent.nom} - {self.adherent.prenom} - {self.cotisation}"
-
-
-
-
-class Soin(models.Model):
-    STATUTD_CHOICES=[
-        ('recu','RECU'),
-        ('rejet','REJET'),
-    ]
-    adherent = models.ForeignKey(Adherent, on_delete=models.CASCADE, related_name="soins")
-    num_recu = models.CharField(max_length=50)
-    statut_dossier = models.CharField(max_length=20, choices=STATUTD_CHOICES)
-    montant_dossier = models.DecimalField(max_digits=10, decimal_places=2)
-    type_beneficier=models.CharField(max_length=100,default='Adherent')
-    date_soin = models.DateField()
-    date_fin_soin = models.DateField()
-    
-
-    def __str__(self):
-        return f"{self.adherent.nom} {self.adherent.prenom} - {self.date_soin}"
+from django.db import models
+from django.db.models import Value
+from django.db.models.functions import Cast, LPad
+from django.utils import timezone
+from datetime import timedelta
+from dateutil.relativedelta import relativedelta  # pour gérer les mois
+# Create your models here.
+
+class Adherent(models.Model):
+    STATUT_CHOICES = [
+        ('actif', 'Actif'),
+        ('retraite', 'Retraité'),
+    ]
+    TYPE_ADHERENT_CHOICES = [
+        ('ayant_droit', 'Ayant droit'),
+        ('sans_droit', 'Sans droit'),
+    ]
+    SEXE_CHOICES = [
+        ('homme', 'Homme'),
+        ('femme', 'Femme'),
+    ]
+
+    ORGANISME_CHOICES = [
+        ('anp', 'ANP'),
+        ('marsa_maroc', 'Marsa Maroc'),
+        ('modep', 'Modep'),
+    ]
+    nax = models.CharField(max_length=6, unique=True, blank=True, null=True)
+    nom = models.CharField(max_length=100)
+    prenom = models.CharField(max_length=100)
+
+    date_naissance = models.DateField()
+    cin = models.CharField(max_length=10, unique=True)
+    sexe = models.CharField(max_length=10, choices=SEXE_CHOICES)
+    date_recrutement = models.DateField(null=True, blank=True)
+    statut = models.CharField(max_length=20,choices=STATUT_CHOICES)
+    a_droit = models.CharField(max_length=20, choices=TYPE_ADHERENT_CHOICES)
+    numero_tel = models.CharField(max_length=15)
+    rib = models.CharField(max_length=24)
+    ville = models.CharField(max_length=100)
+    adresse = models.TextField()
+    salaire = models.DecimalField(max_digits=10, decimal_places=2)
+    organisme_employeur = models.CharField(max_length=20, choices=ORGANISME_CHOICES)
+    section_cotisation = models.CharField(max_length=20, choices=ORGANISME_CHOICES)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['nom', 'prenom']),
+        ]
+    
+    @staticmethod
+    def attribuer_nax(adherents):
+        """Pose le NAX (id sur 6 chiffres) des adhérents enregistrés qui n'en ont pas."""
+        adherents = [adherent for adherent in adherents if not adherent.nax]
+        if not adherents:
+            return
+        # UPDATE ciblé : la ligne n'est pas réécrite et les signaux ne repassent pas
+        Adherent.objects.filter(id__in=[adherent.id for adherent in adherents]).update(
+            nax=LPad(Cast('id', models.CharField()), 6, Value('0'))
+        )
+        for adherent in adherents:
+            adherent.nax = f"{adherent.id:06d}"
+
+    def __str__(self):
+        return f" {self.id:06d} {self.prenom} {self.nom} ({self.cin})"
+
+
+
+class SuppressionSuivieQuerySet(models.QuerySet):
+    def delete(self):
+        # Import différé : suppressions.py importe les modèles
+        from . import suppressions
+        return suppressions.supprimer(self, super().delete)
+
+
+class SuppressionSuivie(models.Model):
+    """Soins et cotisations : suppressions reportées sans signal, cascade comprise (voir suppressions.py)."""
+    objects = SuppressionSuivieQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def delete(self, using=None, keep_parents=False):
+        from . import suppressions
+        supprimer = super().delete
+        lignes = type(self).objects.using(using).filter(pk=self.pk)
+        return suppressions.supprimer(lignes, lambda: supprimer(using, keep_parents))
+
+
+class Cotisation(SuppressionSuivie):
+    COTISATION_CHOICES = [
+        ('oui', 'Oui'),
+        ('non', 'Non'),
+    ]
+
+    adherent = models.ForeignKey('Adherent', on_delete=models.CASCADE, related_name="cotisations")
+    cotisation = models.CharField(max_length=20, choices=COTISATION_CHOICES)
+    cin = models.CharField(max_length=10,unique=True)
+    date_debut = models.DateField(null=True, blank=True)
+    date_fin = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Balayage des échéances (balayage.py) : intervalle de date_fin parmi les 'oui'
+            models.Index(fields=['cotisation', 'date_fin']),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.date_debut:
+            # date_fin = date_debut + 1 mois
+            self.date_fin = self.date_debut + relativedelta(months=+1)
+        else:
+            self.date_fin = None
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.adherent.nom} - {self.adherent.prenom} - {self.cotisation}"
+
+
+
+
+class Soin(SuppressionSuivie):
+    STATUTD_CHOICES=[
+        ('recu','RECU'),
+        ('rejet','REJET'),
+    ]
+    adherent = models.ForeignKey(Adherent, on_delete=models.CASCADE, related_name="soins")
+    num_recu = models.CharField(max_length=50)
+    statut_dossier = models.CharField(max_length=20, choices=STATUTD_CHOICES)
+    montant_dossier = models.DecimalField(max_digits=10, decimal_places=2)
+    type_beneficier=models.CharField(max_length=100,default='Adherent')
+    date_soin = models.DateField()
+    date_fin_soin = models.DateField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['adherent', 'date_soin']),
+            models.Index(fields=['statut_dossier']),
+        ]
+    
+
+    def __str__(self):
+        return f"{self.adherent.nom} {self.adherent.prenom} - {self.date_soin}"
+
+
+class MotRecherche(models.Model):
+    """Index inversé des adhérents : un mot normalisé (minuscules, sans accents) par ligne."""
+    adherent = models.ForeignKey(Adherent, on_delete=models.CASCADE, related_name='mots_recherche')
+    mot = models.CharField(max_length=100)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['mot', 'adherent']),
+        ]
+
+    def __str__(self):
+        return f"{self.mot} -> {self.adherent_id}"
+
+
+class Statistique(models.Model):
+    """Compteur agrégé du tableau de bord, tenu à jour par les signaux."""
+    categorie = models.CharField(max_length=50)
+    cle = models.CharField(max_length=50)
+    nombre = models.IntegerField(default=0)
+    montant = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ('categorie', 'cle')
+
+    def __str__(self):
+        return f"{self.categorie} / {self.cle} : {self.nombre}"
+
+
+class TachePdf(models.Model):
+    """Rendu PDF (carte ou reçu) en attente de traitement par `manage.py pdf_worker`."""
+    TYPE_CHOICES = [
+        ('carte', 'Carte mutuelle'),
+        ('recu', 'Reçu'),
+    ]
+    STATUT_CHOICES = [
+        ('en_attente', 'En attente'),
+        ('en_cours', 'En cours'),
+        ('termine', 'Terminé'),
+        ('echec', 'Échec'),
+    ]
+    type_document = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    objet_id = models.BigIntegerField()
+    statut = models.CharField(max_length=20, choices=STATUT_CHOICES, default='en_attente')
+    tentatives = models.PositiveIntegerField(default=0)
+    max_tentatives = models.PositiveIntegerField(default=3)
+    fichier = models.CharField(max_length=255, blank=True)
+    erreur = models.TextField(blank=True)
+    disponible_le = models.DateTimeField(default=timezone.now)
+    cree_le = models.DateTimeField(auto_now_add=True)
+    maj_le = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['statut', 'disponible_le']),
+            models.Index(fields=['type_document', 'objet_id']),
+        ]
+
+    def __str__(self):
+        return f"{self.type_document} #{self.objet_id} ({self.statut})"
+
+
+class EtatAdherent(models.Model):
+    """Situation dénormalisée d'un adhérent (droit + cotisation), tenue à jour par les signaux.
+
+    Répond aux contrôles d'éligibilité (« actif à jour ») sans jointure ni
+    parcours des cotisations. Voir etat_adherents.py.
+    """
+    adherent = models.OneToOneField(Adherent, on_delete=models.CASCADE, primary_key=True, related_name='etat')
+    nax = models.CharField(max_length=6, blank=True, null=True)
+    nom = models.CharField(max_length=100)
+    prenom = models.CharField(max_length=100)
+    cin = models.CharField(max_length=10)
+    statut = models.CharField(max_length=20, choices=Adherent.STATUT_CHOICES)
+    a_droit = models.CharField(max_length=20, choices=Adherent.TYPE_ADHERENT_CHOICES)
+    organisme_employeur = models.CharField(max_length=20, choices=Adherent.ORGANISME_CHOICES)
+    section_cotisation = models.CharField(max_length=20, choices=Adherent.ORGANISME_CHOICES)
+    cotisation = models.CharField(max_length=20, choices=Cotisation.COTISATION_CHOICES, default='non')
+    date_fin = models.DateField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['date_fin']),
+            models.Index(fields=['organisme_employeur', 'date_fin']),
+            models.Index(fields=['statut', 'date_fin']),
+        ]
+
+    def est_a_jour(self, jour):
+        return (self.a_droit == 'ayant_droit' and self.cotisation == 'oui'
+                and self.date_fin is not None and self.date_fin >= jour)
+
+    def __str__(self):
+        return f"{self.nax} {self.prenom} {self.nom} : {self.cotisation} -> {self.date_fin}"
+
+
+class MarqueReprise(models.Model):
+    """Point de reprise (« high-water mark ») d'un traitement incrémental, ex. le balayage des échéances."""
+    nom = models.CharField(max_length=50, unique=True)
+    valeur = models.DateField(null=True, blank=True)
+    curseur = models.BigIntegerField(null=True, blank=True, help_text="Id du journal des modifications atteint")
+    maj_le = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.nom} : {self.valeur}"
+
+
+class SyntheseSoins(models.Model):
+    """Soins agrégés par mois, statut, bénéficiaire, organisme et section (voir rapports_soins.py)."""
+    mois = models.DateField(help_text="Premier jour du mois")
+    statut_dossier = models.CharField(max_length=20, choices=Soin.STATUTD_CHOICES)
+    type_beneficier = models.CharField(max_length=100)
+    organisme_employeur = models.CharField(max_length=20, choices=Adherent.ORGANISME_CHOICES)
+    section_cotisation = models.CharField(max_length=20, choices=Adherent.ORGANISME_CHOICES)
+    nombre = models.IntegerField(default=0)
+    montant = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        unique_together = ('mois', 'statut_dossier', 'type_beneficier', 'organisme_employeur', 'section_cotisation')
+
+    def __str__(self):
+        return f"{self.mois:%Y-%m} {self.statut_dossier} {self.organisme_employeur} : {self.nombre} / {self.montant}"
+
+
+class Modification(models.Model):
+    """Journal des écritures sur les adhérents, cotisations et soins (voir modifications.py).
+
+    L'id croissant sert de curseur aux clients qui se synchronisent par delta.
+    """
+    OPERATION_CHOICES = [
+        ('maj', 'Création ou modification'),
+        ('suppression', 'Suppression'),
+    ]
+
+    table = models.CharField(max_length=20)
+    objet_id = models.BigIntegerField()
+    operation = models.CharField(max_length=20, choices=OPERATION_CHOICES, default='maj')
+    date = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['table', 'id']),
+            models.Index(fields=['table', 'objet_id']),
+        ]
+
+    def __str__(self):
+        return f"#{self.id} {self.table} {self.objet_id} : {self.operation}"
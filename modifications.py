@@ -0,0 +1,146 @@
+# api/modifications.py
+"""Journal des modifications et synchronisation incrémentale (delta).
+
+Chaque écriture sur Adherent, Cotisation ou Soin ajoute une ligne au journal
+(signals.py pour les écritures unitaires, appels explicites pour les chemins
+ensemblistes). Un client garde l'id de la dernière ligne lue comme curseur et
+ne redemande que ce qui a changé depuis ; DeltaMixin ajoute l'action `delta`
+aux vues de liste.
+
+Sous Postgres, l'id vient d'une séquence attribuée avant le commit : une longue
+transaction (renouvellement, saisie par lot) peut valider des ids inférieurs à
+un curseur déjà remis. Le curseur renvoyé reste donc avant les lignes des
+`MODIFICATIONS_MARGE` dernières secondes, relues à l'appel suivant (un objet
+peut revenir deux fois, jamais manquer). La marge doit dépasser la durée d'une
+transaction qui journalise ; 0 sous SQLite, qui sérialise les écritures.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Exists, Max, OuterRef
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .models import Adherent, Cotisation, Modification, Soin
+
+TABLES = {Adherent: 'adherents', Cotisation: 'cotisations', Soin: 'soins'}
+LIMITE = 1000
+LIMITE_MAX = 5000
+
+
+def journaliser(modele, ids, operation='maj'):
+    """Une ligne de journal par objet (une seule requête d'insertion)."""
+    lignes = [Modification(table=TABLES[modele], objet_id=objet_id, operation=operation) for objet_id in ids]
+    Modification.objects.bulk_create(lignes, batch_size=1000)
+    return len(lignes)
+
+
+def journaliser_queryset(queryset, operation='maj'):
+    """Avant un UPDATE ou DELETE ensembliste : les lignes concernées sont lues tant qu'elles sont dans le filtre."""
+    return journaliser(queryset.model, queryset.values_list('id', flat=True), operation)
+
+
+def _horizon():
+    """Date avant laquelle toutes les lignes du journal sont validées (None sans marge)."""
+    marge = getattr(settings, 'MODIFICATIONS_MARGE', 0)
+    return timezone.now() - timedelta(seconds=marge) if marge else None
+
+
+def objets_modifies(modele, curseur=None, depuis=None):
+    """Sous-requête des ids de `modele` écrits après `curseur` (id du journal) ou depuis `depuis` (date-heure)."""
+    journal = Modification.objects.filter(table=TABLES[modele])
+    if curseur is not None:
+        journal = journal.filter(id__gt=curseur)
+    if depuis is not None:
+        journal = journal.filter(date__gte=depuis)
+    return journal.values('objet_id')
+
+
+def curseur_actuel():
+    horizon = _horizon()
+    if horizon is None:
+        return Modification.objects.aggregate(dernier=Max('id'))['dernier'] or 0
+    # Index primaire parcouru à rebours : seules les lignes de la marge sont lues
+    return (Modification.objects.filter(date__lte=horizon).order_by('-id')
+            .values_list('id', flat=True).first() or 0)
+
+
+def delta(queryset, curseur, limite=LIMITE):
+    """Objets de `queryset` modifiés ou supprimés après `curseur`.
+
+    Renvoie (curseur suivant, objets modifiés, ids supprimés, suite) ; `suite`
+    indique que la limite est atteinte et qu'il faut rappeler avec le nouveau curseur.
+    Un objet écrit plusieurs fois n'apparaît qu'une fois ; un objet absent de la
+    base est signalé comme supprimé, quelle que soit la dernière opération lue.
+    Les lignes de la marge sont renvoyées mais le curseur reste avant elles.
+    """
+    lignes = list(
+        Modification.objects.filter(table=TABLES[queryset.model], id__gt=curseur)
+        .order_by('id').values_list('id', 'objet_id', 'date')[:limite + 1]
+    )
+    suite = len(lignes) > limite
+    lignes = lignes[:limite]
+    if not lignes:
+        return curseur, [], [], False
+
+    suivant = lignes[-1][0]
+    horizon = _horizon()
+    if horizon is not None:
+        recentes = [position for position, (_, _, date) in enumerate(lignes) if date > horizon]
+        if recentes:
+            suivant = lignes[recentes[0] - 1][0] if recentes[0] else curseur
+            suite = False
+
+    ids = {objet_id for _, objet_id, _ in lignes}
+    modifies = list(queryset.filter(id__in=ids).order_by('id'))
+    supprimes = sorted(ids - {objet.id for objet in modifies})
+    return suivant, modifies, supprimes, suite
+
+
+def compacter():
+    """Supprime les lignes remplacées par une écriture plus récente du même objet.
+
+    Sans effet sur les deltas, marge comprise : la ligne gardée est validée et
+    postérieure à celle supprimée, tout curseur antérieur la verra encore.
+    """
+    plus_recente = Modification.objects.filter(
+        table=OuterRef('table'), objet_id=OuterRef('objet_id'), id__gt=OuterRef('id'),
+    )
+    supprimees, _ = Modification.objects.filter(Exists(plus_recente)).delete()
+    return supprimees
+
+
+class DeltaMixin:
+    """`<liste>/delta/?curseur=N` : objets modifiés et ids supprimés depuis le curseur.
+
+    Sans curseur, renvoie seulement le curseur actuel : à lire avant un chargement
+    complet de la liste. Les filtres de la liste ne s'appliquent pas au delta : il
+    part de la table entière (`relations_delta` : relations lues par le serializer).
+    """
+    relations_delta = ()
+
+    def get_delta_queryset(self):
+        # Pas get_queryset() : un objet hors des filtres de la liste serait signalé comme supprimé
+        return self.queryset.model.objects.select_related(*self.relations_delta)
+
+    @action(detail=False, methods=['get'])
+    def delta(self, request):
+        params = request.query_params
+        if not params.get('curseur'):
+            return Response({'curseur': curseur_actuel()})
+        try:
+            curseur = int(params['curseur'])
+            limite = max(1, min(int(params.get('limite', LIMITE)), LIMITE_MAX))
+        except ValueError:
+            return Response({'detail': "curseur et limite doivent être des entiers"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        curseur, modifies, supprimes, suite = delta(self.get_delta_queryset(), curseur, limite)
+        return Response({
+            'curseur': curseur,
+            'suite': suite,
+            'modifies': self.get_serializer(modifies, many=True).data,
+            'supprimes': supprimes,
+        })
@@ -0,0 +1,94 @@
+# api/pagination.py
+import json
+from itertools import islice
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+def _cle_classement(ligne):
+    # Instance ou dictionnaire de values() (listes légères)
+    if isinstance(ligne, dict):
+        return ligne['pertinence'], ligne['id']
+    return ligne.pertinence, ligne.id
+
+
+class IdCursorPagination(CursorPagination):
+    """Pagination par clé (id) : la page N coûte autant que la page 1.
+
+    Résultats classés par pertinence (?search=) : clé (pertinence, id), pages
+    suivantes seulement (lien `next`, pas de `previous`).
+    """
+    ordering = 'id'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    recherche = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not request.query_params.get('search'):
+            return super().paginate_queryset(queryset, request, view)
+        self.recherche = True
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        curseur = self.decode_cursor(request)
+        if curseur is not None:
+            try:
+                pertinence, id_ = (int(valeur) for valeur in curseur.position.split(':'))
+            except (AttributeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+            queryset = queryset.filter(Q(pertinence__lt=pertinence) | Q(pertinence=pertinence, id__lt=id_))
+        # Une ligne de plus : indique s'il existe une page suivante
+        lignes = list(queryset[:self.page_size + 1])
+        self.has_next, self.has_previous = len(lignes) > self.page_size, False
+        self.page = lignes[:self.page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.recherche:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        pertinence, id_ = _cle_classement(self.page[-1])
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=f'{pertinence}:{id_}'))
+
+    def get_previous_link(self):
+        if self.recherche:
+            return None
+        return super().get_previous_link()
+
+
+class EtatCursorPagination(IdCursorPagination):
+    """Même pagination pour EtatAdherent, dont la clé primaire est l'adhérent."""
+    ordering = 'adherent_id'
+
+
+class StreamingListMixin:
+    """`?stream=1` sur une liste : export complet en NDJSON, une ligne par objet.
+
+    Les lignes sont lues par paquets avec `.iterator()` et sérialisées au fil de
+    l'eau, la mémoire du worker reste donc constante quelle que soit la table.
+    """
+    stream_chunk_size = 2000
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('stream') not in ('1', 'true', 'ndjson'):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).order_by('id')
+        response = StreamingHttpResponse(self._ndjson(queryset), content_type='application/x-ndjson')
+        response['Content-Disposition'] = f'attachment; filename="{self.basename}.ndjson"'
+        return response
+
+    def _ndjson(self, queryset):
+        lignes = queryset.iterator(chunk_size=self.stream_chunk_size)
+        while True:
+            paquet = list(islice(lignes, self.stream_chunk_size))
+            if not paquet:
+                break
+            data = self.get_serializer(paquet, many=True).data
+            yield ''.join(json.dumps(item, cls=DjangoJSONEncoder) + '\n' for item in data)
@@ -0,0 +1,246 @@
+# api/rapports_soins.py
+"""Rapports financiers des soins, servis depuis la table SyntheseSoins.
+
+Une ligne par (mois, statut, bénéficiaire, organisme, section) : un rapport
+sur l'année lit quelques centaines de lignes, quel que soit le nombre de
+soins. La table suit les écritures de Soin (signals.py) et peut être
+reconstruite en une requête d'agrégation.
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import ExtractQuarter, ExtractYear, TruncMonth
+
+from .models import Adherent, Soin, SyntheseSoins
+
+DIMENSIONS = ('statut_dossier', 'type_beneficier', 'organisme_employeur', 'section_cotisation')
+PERIODES = ('mois', 'trimestre', 'annee', 'total')
+CENTIMES = Decimal('0.01')
+
+
+def premier_du_mois(jour):
+    if isinstance(jour, str):
+        jour = date.fromisoformat(jour)
+    return jour.replace(day=1)
+
+
+def _montant(valeur):
+    return Decimal(str(valeur or 0))
+
+
+def _rattachement(instance, adherent_id):
+    """(organisme, section) de l'adhérent du soin, sans requête si la relation est déjà chargée."""
+    if Soin.adherent.is_cached(instance) and instance.adherent.pk == adherent_id:
+        adherent = instance.adherent
+        if 'organisme_employeur' in adherent.__dict__ and 'section_cotisation' in adherent.__dict__:
+            return adherent.organisme_employeur, adherent.section_cotisation
+    return Adherent.objects.filter(pk=adherent_id).values_list(
+        'organisme_employeur', 'section_cotisation').first() or ('', '')
+
+
+def _cle(valeurs, rattachement):
+    return (premier_du_mois(valeurs['date_soin']), valeurs['statut_dossier'] or '',
+            valeurs['type_beneficier'] or '') + tuple(rattachement)
+
+
+def _incrementer(cle, nombre, montant):
+    filtre = dict(zip(('mois',) + DIMENSIONS, cle))
+    maj = SyntheseSoins.objects.filter(**filtre).update(nombre=F('nombre') + nombre, montant=F('montant') + montant)
+    if maj:
+        return
+    try:
+        with transaction.atomic():
+            SyntheseSoins.objects.create(nombre=nombre, montant=montant, **filtre)
+    except IntegrityError:
+        # Ligne créée entre-temps par une autre requête
+        SyntheseSoins.objects.filter(**filtre).update(nombre=F('nombre') + nombre, montant=F('montant') + montant)
+
+
+def _appliquer_deltas(deltas):
+    for cle, (nombre, montant) in deltas.items():
+        if nombre or montant:
+            _incrementer(cle, nombre, montant)
+
+
+def appliquer(instance, anciennes, nouvelles):
+    """Reporte l'écriture d'un soin (valeurs suivies par stats.py ; None = absent)."""
+    deltas = {}
+    rattachements = {}
+    for signe, valeurs in ((-1, anciennes), (1, nouvelles)):
+        if valeurs is None:
+            continue
+        adherent_id = valeurs['adherent_id']
+        if adherent_id not in rattachements:
+            rattachements[adherent_id] = _rattachement(instance, adherent_id)
+        cle = _cle(valeurs, rattachements[adherent_id])
+        nombre, montant = deltas.get(cle, (0, Decimal(0)))
+        deltas[cle] = (nombre + signe, montant + signe * _montant(valeurs['montant_dossier']))
+    _appliquer_deltas(deltas)
+
+
+def deplacer_adherent(adherent_id, ancien_rattachement, nouveau_rattachement):
+    """Un adhérent change d'organisme ou de section : ses soins changent de ligne."""
+    if tuple(ancien_rattachement) == tuple(nouveau_rattachement):
+        return
+    deltas = {}
+    groupes = (
+        Soin.objects.filter(adherent_id=adherent_id)
+        .annotate(mois=TruncMonth('date_soin'))
+        .values('mois', 'statut_dossier', 'type_beneficier')
+        .annotate(nombre=Count('id'), montant=Sum('montant_dossier'))
+        .order_by()
+    )
+    for groupe in groupes:
+        base = (groupe['mois'], groupe['statut_dossier'], groupe['type_beneficier'])
+        for signe, rattachement in ((-1, ancien_rattachement), (1, nouveau_rattachement)):
+            cle = base + tuple(rattachement)
+            nombre, montant = deltas.get(cle, (0, Decimal(0)))
+            deltas[cle] = (nombre + signe * groupe['nombre'], montant + signe * _montant(groupe['montant']))
+    _appliquer_deltas(deltas)
+
+
+def _rattachements(adherent_ids):
+    return {
+        pk: (organisme, section)
+        for pk, organisme, section in Adherent.objects.filter(pk__in=adherent_ids)
+        .values_list('pk', 'organisme_employeur', 'section_cotisation')
+    }
+
+
+def ajouter_en_masse(soins):
+    """Compte des soins créés par bulk_create (pas de signaux)."""
+    rattachements = _rattachements({soin.adherent_id for soin in soins})
+    deltas = {}
+    for soin in soins:
+        cle = (premier_du_mois(soin.date_soin), soin.statut_dossier, soin.type_beneficier) \
+            + rattachements.get(soin.adherent_id, ('', ''))
+        nombre, montant = deltas.get(cle, (0, Decimal(0)))
+        deltas[cle] = (nombre + 1, montant + _montant(soin.montant_dossier))
+    _appliquer_deltas(deltas)
+
+
+def modifier_en_masse(changements):
+    """Reporte des soins modifiés par bulk_update : [(anciennes, nouvelles)] valeurs suivies par stats.py."""
+    rattachements = _rattachements({valeurs['adherent_id'] for paire in changements for valeurs in paire})
+    deltas = {}
+    for anciennes, nouvelles in changements:
+        for signe, valeurs in ((-1, anciennes), (1, nouvelles)):
+            cle = _cle(valeurs, rattachements.get(valeurs['adherent_id'], ('', '')))
+            nombre, montant = deltas.get(cle, (0, Decimal(0)))
+            deltas[cle] = (nombre + signe, montant + signe * _montant(valeurs['montant_dossier']))
+    _appliquer_deltas(deltas)
+
+
+def _groupes(soins):
+    return (
+        soins.annotate(
+            mois=TruncMonth('date_soin'),
+            organisme_employeur=F('adherent__organisme_employeur'),
+            section_cotisation=F('adherent__section_cotisation'),
+        )
+        .values('mois', *DIMENSIONS)
+        .annotate(nombre=Count('id'), montant=Sum('montant_dossier'))
+        .order_by()
+    )
+
+
+def retirer_en_masse(soins):
+    """Décompte les soins de `soins` avant leur DELETE (une requête d'agrégation)."""
+    _appliquer_deltas({
+        tuple(g[champ] for champ in ('mois',) + DIMENSIONS): (-g['nombre'], -_montant(g['montant']))
+        for g in _groupes(soins)
+    })
+
+
+def reconstruire():
+    """Recalcule toute la table en une requête d'agrégation sur les soins."""
+    lignes = [
+        SyntheseSoins(nombre=g['nombre'], montant=g['montant'] or 0,
+                      **{champ: g[champ] for champ in ('mois',) + DIMENSIONS})
+        for g in _groupes(Soin.objects.all())
+    ]
+    with transaction.atomic():
+        SyntheseSoins.objects.all().delete()
+        SyntheseSoins.objects.bulk_create(lignes, batch_size=1000)
+    return len(lignes)
+
+
+def rapport(debut, fin, periode='mois', grouper=(), filtres=None):
+    """Nombre, somme et moyenne de montant_dossier de `debut` à `fin` (mois inclus).
+
+    `periode` : mois, trimestre, annee ou total ; `grouper` : sous-ensemble de DIMENSIONS ;
+    `filtres` : {dimension: valeur}.
+    """
+    if periode not in PERIODES:
+        raise ValueError(f"periode doit valoir {', '.join(PERIODES)}")
+    inconnues = (set(grouper) | set(filtres or {})) - set(DIMENSIONS)
+    if inconnues:
+        raise ValueError(f"Dimensions inconnues : {', '.join(sorted(inconnues))}")
+
+    queryset = SyntheseSoins.objects.filter(mois__gte=premier_du_mois(debut), mois__lte=premier_du_mois(fin))
+    if filtres:
+        queryset = queryset.filter(**filtres)
+
+    champs = list(grouper)
+    if periode == 'mois':
+        champs.insert(0, 'mois')
+    elif periode in ('trimestre', 'annee'):
+        queryset = queryset.annotate(annee=ExtractYear('mois'))
+        champs.insert(0, 'annee')
+        if periode == 'trimestre':
+            queryset = queryset.annotate(trimestre=ExtractQuarter('mois'))
+            champs.insert(1, 'trimestre')
+
+    totaux = {'nb': Sum('nombre'), 'somme': Sum('montant')}
+    if champs:
+        groupes = queryset.values(*champs).annotate(**totaux).order_by(*champs)
+    else:
+        groupes = [queryset.aggregate(**totaux)]
+
+    lignes = []
+    for groupe in groupes:
+        if not groupe['nb']:
+            continue
+        ligne = {champ: groupe[champ] for champ in champs}
+        if 'mois' in ligne:
+            ligne['mois'] = f"{ligne['mois']:%Y-%m}"
+        ligne['nombre'] = groupe['nb']
+        ligne['montant'] = _montant(groupe['somme']).quantize(CENTIMES)
+        ligne['moyenne'] = (ligne['montant'] / ligne['nombre']).quantize(CENTIMES)
+        lignes.append(ligne)
+    return lignes
+
+
+ALIAS = {
+    'statut': 'statut_dossier', 'type': 'type_beneficier',
+    'organisme': 'organisme_employeur', 'section': 'section_cotisation',
+}
+
+
+def _mois_param(valeur):
+    try:
+        annee, mois = (int(partie) for partie in valeur.split('-')[:2])
+        return date(annee, mois, 1)
+    except ValueError:
+        raise ValueError(f"Mois invalide : {valeur} (AAAA-MM attendu)")
+
+
+def depuis_requete(params, aujourd_hui):
+    """Arguments de rapport() à partir de ?debut=AAAA-MM&fin=&periode=&grouper=a,b&<dimension>=valeur.
+
+    Par défaut : depuis janvier de l'année en cours (cumul annuel), par mois.
+    """
+    grouper = [ALIAS.get(nom, nom) for nom in params.get('grouper', '').split(',') if nom]
+    filtres = {}
+    for nom in set(ALIAS) | set(DIMENSIONS):
+        if params.get(nom):
+            filtres[ALIAS.get(nom, nom)] = params[nom]
+    return {
+        'debut': _mois_param(params['debut']) if params.get('debut') else aujourd_hui.replace(month=1, day=1),
+        'fin': _mois_param(params['fin']) if params.get('fin') else aujourd_hui.replace(day=1),
+        'periode': params.get('periode', 'mois'),
+        'grouper': grouper,
+        'filtres': filtres,
+    }
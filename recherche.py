@@ -0,0 +1,179 @@
+# api/recherche.py
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value, When
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Adherent, MotRecherche
+
+# Au-delà de ce caractère, plus aucun mot ne commence par le préfixe
+FIN_PREFIXE = '\uffff'
+LONGUEUR_MAX = 100
+
+
+def normaliser(texte):
+    """Minuscules, sans accents : 'Hélène' -> 'helene'."""
+    decompose = unicodedata.normalize('NFKD', str(texte or ''))
+    return ''.join(c for c in decompose if not unicodedata.combining(c)).lower()
+
+
+def decouper(texte):
+    return [mot[:LONGUEUR_MAX] for mot in re.split(r'[^0-9a-z]+', normaliser(texte)) if mot]
+
+
+CHAMPS_INDEXES = ('nom', 'prenom', 'cin', 'nax')
+
+
+def mots_adherent(nom, prenom, cin, nax):
+    return set(decouper(nom)) | set(decouper(prenom)) | set(decouper(cin)) | set(decouper(nax))
+
+
+def indexer(adherent):
+    """Réécrit les mots d'un adhérent (appelé par le signal post_save)."""
+    mots = mots_adherent(adherent.nom, adherent.prenom, adherent.cin, adherent.nax)
+    with transaction.atomic():
+        MotRecherche.objects.filter(adherent=adherent).delete()
+        MotRecherche.objects.bulk_create([MotRecherche(adherent=adherent, mot=mot) for mot in mots])
+
+
+def indexer_en_masse(adherents, batch_size=1000):
+    """Indexe des adhérents créés par bulk_create (pas de signaux)."""
+    lignes = [
+        MotRecherche(adherent_id=a.id, mot=mot)
+        for a in adherents
+        for mot in mots_adherent(a.nom, a.prenom, a.cin, a.nax)
+    ]
+    MotRecherche.objects.bulk_create(lignes, batch_size=batch_size)
+    return len(lignes)
+
+
+def reconstruire_index(chunk_size=2000):
+    MotRecherche.objects.all().delete()
+    total = 0
+    lot = []
+    for adherent in Adherent.objects.only('id', 'nom', 'prenom', 'cin', 'nax').iterator(chunk_size=chunk_size):
+        lot.append(adherent)
+        if len(lot) >= chunk_size:
+            total += indexer_en_masse(lot)
+            lot = []
+    return total + indexer_en_masse(lot)
+
+
+def classement(requete):
+    """Adhérents correspondant à tous les mots de la requête, avec un score de pertinence.
+
+    Chaque mot est cherché comme préfixe par un intervalle [mot, mot + U+FFFF[
+    sur l'index (mot, adherent) : le coût dépend du nombre de résultats, pas de
+    la taille de la table. Score = nombre de mots trouvés à l'identique.
+    """
+    termes = sorted(set(decouper(requete)))
+    if not termes:
+        return None
+
+    prefixes = [Q(mot__gte=t, mot__lt=t + FIN_PREFIXE) for t in termes]
+    filtre = prefixes[0]
+    for q in prefixes[1:]:
+        filtre |= q
+
+    annotations = {
+        f't{i}': Max(Case(When(q, then=Value(1)), default=Value(0), output_field=IntegerField()))
+        for i, q in enumerate(prefixes)
+    }
+    return (
+        MotRecherche.objects.filter(filtre)
+        .values('adherent_id')
+        .annotate(**annotations)
+        .filter(**{f't{i}': 1 for i in range(len(termes))})
+        .annotate(score=Sum(Case(When(mot__in=termes, then=Value(1)), default=Value(0),
+                                 output_field=IntegerField())))
+    )
+
+
+class RechercheAdherentFilter(BaseFilterBackend):
+    """`?search=` : recherche classée sur nom, prénom, CIN et NAX de l'adhérent.
+
+    La vue indique le chemin vers l'adhérent avec `search_adherent_field`
+    ('' pour Adherent, 'adherent' pour Soin/Cotisation).
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        requete = request.query_params.get(self.search_param, '').strip()
+        if not requete:
+            return queryset
+        scores = classement(requete)
+        if scores is None:
+            return queryset.none()
+
+        champ = getattr(view, 'search_adherent_field', '')
+        cle = f'{champ}__id' if champ else 'id'
+        return queryset.filter(**{f'{cle}__in': scores.values('adherent_id')}).annotate(
+            pertinence=Subquery(scores.filter(adherent_id=OuterRef(cle)).values('score')[:1])
+        ).order_by('-pertinence', '-id')
+
+
+class CacheLRU:
+    """Petit cache LRU en mémoire du processus, avec durée de vie des entrées.
+
+    Les écritures sur Adherent le vident (signal post_save) ; la durée de vie
+    borne le retard des autres processus, qui ne reçoivent pas ce signal.
+    """
+
+    def __init__(self, taille=1024, duree=30):
+        self.taille = taille
+        self.duree = duree
+        self._entrees = OrderedDict()
+        self._verrou = threading.Lock()
+
+    def get(self, cle):
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is None:
+                return None
+            expire, valeur = entree
+            if expire < time.monotonic():
+                del self._entrees[cle]
+                return None
+            self._entrees.move_to_end(cle)
+            return valeur
+
+    def set(self, cle, valeur):
+        with self._verrou:
+            self._entrees[cle] = (time.monotonic() + self.duree, valeur)
+            self._entrees.move_to_end(cle)
+            while len(self._entrees) > self.taille:
+                self._entrees.popitem(last=False)
+
+    def clear(self):
+        with self._verrou:
+            self._entrees.clear()
+
+
+CHAMPS_SUGGESTION = ('id', 'nax', 'nom', 'prenom', 'a_droit')
+cache_suggestions = CacheLRU()
+
+
+def suggestions(requete, limite=10):
+    """Saisie semi-automatique : adhérents dont NAX, CIN, nom ou prénom commence par la requête."""
+    cle = (' '.join(sorted(set(decouper(requete)))), limite)
+    resultat = cache_suggestions.get(cle)
+    if resultat is not None:
+        return resultat
+
+    scores = classement(requete)
+    if scores is None:
+        resultat = []
+    else:
+        resultat = list(
+            Adherent.objects.filter(id__in=scores.values('adherent_id'))
+            .annotate(pertinence=Subquery(scores.filter(adherent_id=OuterRef('id')).values('score')[:1]))
+            .order_by('-pertinence', 'nom', 'prenom')
+            .values(*CHAMPS_SUGGESTION)[:limite]
+        )
+    cache_suggestions.set(cle, resultat)
+    return resultat
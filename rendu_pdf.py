@@ -0,0 +1,119 @@
+# api/rendu_pdf.py
+"""Moteur de rendu WeasyPrint partagé (cartes, reçus, exports).
+
+WeasyPrint (et Pango, cairo, fontconfig) n'est importé qu'au premier rendu :
+les processus qui ne produisent pas de PDF (workers API, commandes) ne paient
+ni son import ni sa mémoire. Par processus, chaque feuille de style est
+analysée une seule fois, les polices sont chargées dans une FontConfiguration
+persistante et les templates sont compilés au premier usage. Les processus
+de rendu (`pool_processus`) sont préchauffés au démarrage.
+"""
+import os
+import threading
+
+from django.db import connections
+from django.template.loader import get_template
+
+from .instrumentation import phase
+
+# Feuille de style de chaque template, dans le même dossier que celui-ci
+FEUILLES = {
+    'carte_mutuelle.html': 'carte_mutuelle.css',
+    'recu_template.html': 'recu.css',
+}
+
+_verrou = threading.Lock()
+_templates = {}
+_sources = {}
+_feuilles = {}
+_polices = None
+
+
+def weasyprint():
+    """Module weasyprint, importé au premier appel."""
+    import weasyprint
+    return weasyprint
+
+
+def polices():
+    global _polices
+    with _verrou:
+        if _polices is None:
+            from weasyprint.text.fonts import FontConfiguration
+            _polices = FontConfiguration()
+        return _polices
+
+
+def template(template_name):
+    """Template compilé une fois par processus."""
+    if template_name not in _templates:
+        _templates[template_name] = get_template(template_name)
+    return _templates[template_name]
+
+
+def source_feuille(template_name):
+    if template_name not in _sources:
+        nom = FEUILLES.get(template_name)
+        if nom is None:
+            _sources[template_name] = ''
+        else:
+            dossier = os.path.dirname(template(template_name).origin.name)
+            with open(os.path.join(dossier, nom), encoding='utf-8') as fichier:
+                _sources[template_name] = fichier.read()
+    return _sources[template_name]
+
+
+def feuilles(template_name):
+    """Feuilles de style déjà analysées (les @import et polices ne sont chargés qu'une fois)."""
+    feuille = _feuilles.get(template_name)
+    if feuille is None:
+        source = source_feuille(template_name)
+        feuille = _feuilles[template_name] = (
+            [weasyprint().CSS(string=source, font_config=polices())] if source else []
+        )
+    return feuille
+
+
+def source(template_name):
+    """Source du template et de sa feuille de style (sert à l'empreinte du cache PDF)."""
+    return template(template_name).template.source + '\0' + source_feuille(template_name)
+
+
+def html(template_name, context):
+    return template(template_name).render(context)
+
+
+def document(template_name, html_string):
+    """Document mis en page (pages), pour assembler plusieurs rendus en un PDF."""
+    with phase('pdf'):
+        return weasyprint().HTML(string=html_string).render(
+            stylesheets=feuilles(template_name), font_config=polices()
+        )
+
+
+def ecrire_pdf(template_name, html_string, target):
+    with phase('pdf'):
+        weasyprint().HTML(string=html_string).write_pdf(
+            target=target, stylesheets=feuilles(template_name), font_config=polices()
+        )
+
+
+def prechauffer():
+    """Analyse les feuilles de style et charge les polices avant le premier vrai rendu."""
+    for template_name in FEUILLES:
+        document(template_name, '<p>-</p>')
+
+
+def _initialiser_processus():
+    import django
+    django.setup()
+    # Chaque processus ouvre sa propre connexion à la base
+    connections.close_all()
+    prechauffer()
+
+
+def pool_processus(processus):
+    """Pool de processus de rendu préchauffés (pdf_worker, export_recus)."""
+    from concurrent.futures import ProcessPoolExecutor
+    connections.close_all()
+    return ProcessPoolExecutor(max_workers=processus, initializer=_initialiser_processus)
@@ -0,0 +1,88 @@
+# api/renouvellement.py
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import etat_adherents, modifications, recherche, stats
+from .models import Adherent, Cotisation
+
+
+def _cotisations(section):
+    queryset = Cotisation.objects.all()
+    if section:
+        queryset = queryset.filter(adherent__section_cotisation=section)
+    return queryset
+
+
+def renouveler(section=None, date_debut=None, dry_run=False):
+    """Renouvelle pour un mois toutes les cotisations actives d'une section.
+
+    Deux UPDATE ensemblistes dans une transaction, sans signaux par ligne :
+    les dates des cotisations 'oui', puis le droit des adhérents concernés.
+    """
+    date_debut = date_debut or timezone.now().date()
+    date_fin = date_debut + relativedelta(months=+1)
+    cotisations = _cotisations(section).filter(cotisation='oui')
+    adherents = Adherent.objects.filter(id__in=cotisations.values('adherent_id')).exclude(a_droit='ayant_droit')
+
+    rapport = {
+        'operation': 'renouveler', 'section': section, 'dry_run': dry_run,
+        'date_debut': date_debut, 'date_fin': date_fin,
+    }
+    if dry_run:
+        rapport.update(cotisations=cotisations.count(), adherents=adherents.count())
+        return rapport
+
+    with transaction.atomic():
+        modifications.journaliser_queryset(adherents)
+        modifications.journaliser_queryset(cotisations)
+        rapport['adherents'] = adherents.update(a_droit='ayant_droit')
+        rapport['cotisations'] = cotisations.update(date_debut=date_debut, date_fin=date_fin)
+        etat_adherents.reporter(cotisations.values('adherent_id'),
+                                a_droit='ayant_droit', cotisation='oui', date_fin=date_fin)
+        stats.deplacer('adherents_droit', 'sans_droit', 'ayant_droit', rapport['adherents'])
+    if rapport['adherents']:
+        recherche.cache_suggestions.clear()
+    return rapport
+
+
+def expirer(section=None, date_reference=None, dry_run=False, depuis=None, curseur=0):
+    """Passe à 'non' les cotisations d'une section échues avant `date_reference`.
+
+    Les adhérents concernés perdent leur droit dans la même transaction
+    (mêmes règles que le signal de Cotisation : dates remises à vide).
+    `depuis` limite aux échéances à partir de cette date (balayage incrémental),
+    plus les cotisations journalisées après `curseur`, quelle que soit leur date_fin.
+    """
+    date_reference = date_reference or timezone.now().date()
+    cotisations = _cotisations(section).filter(cotisation='oui', date_fin__lt=date_reference)
+    if depuis is not None:
+        cotisations = cotisations.filter(
+            Q(date_fin__gte=depuis) | Q(id__in=modifications.objets_modifies(Cotisation, curseur))
+        )
+    # Évalué avant la mise à jour des cotisations, qui sortent ensuite du filtre
+    adherents = Adherent.objects.filter(id__in=cotisations.values('adherent_id'), a_droit='ayant_droit')
+
+    rapport = {
+        'operation': 'expirer', 'section': section, 'dry_run': dry_run,
+        'date_reference': date_reference, 'depuis': depuis,
+    }
+    if dry_run:
+        rapport.update(cotisations=cotisations.count(), adherents=adherents.count())
+        return rapport
+
+    with transaction.atomic():
+        # Journal d'abord : les lignes sortent des filtres une fois mises à jour
+        modifications.journaliser_queryset(adherents)
+        modifications.journaliser_queryset(cotisations)
+        rapport['adherents'] = adherents.update(a_droit='sans_droit')
+        # Avant l'UPDATE des cotisations, qui les fait sortir du filtre
+        etat_adherents.reporter(cotisations.values('adherent_id'),
+                                a_droit='sans_droit', cotisation='non', date_fin=None)
+        rapport['cotisations'] = cotisations.update(cotisation='non', date_debut=None, date_fin=None)
+        stats.deplacer('adherents_droit', 'ayant_droit', 'sans_droit', rapport['adherents'])
+        stats.deplacer('cotisations_statut', 'oui', 'non', rapport['cotisations'])
+    if rapport['adherents']:
+        recherche.cache_suggestions.clear()
+    return rapport
@@ -0,0 +1,120 @@
+# api/saisie_soins.py
+"""Saisie de soins par lot : plusieurs dossiers créés ou modifiés en une requête.
+
+Toutes les lignes sont validées avant d'écrire (adhérents et soins référencés
+lus en une requête). Les lignes valides sont écrites en une transaction par
+bulk_create / bulk_update ; compteurs, synthèse des soins, journal et file des
+reçus suivent en requêtes ensemblistes, les reçus étant rendus par le worker.
+Chaque ligne a son résultat : id et tâche du reçu, ou erreurs.
+"""
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from . import modifications, rapports_soins, stats, taches_pdf
+from .models import Adherent, Soin
+from .serializers import SoinSerializer
+
+LIMITE = 1000
+
+
+def _lignes(donnees):
+    if not isinstance(donnees, list):
+        raise ValueError("Le corps doit être une liste de soins")
+    if len(donnees) > LIMITE:
+        raise ValueError(f"Au plus {LIMITE} soins par lot")
+    return donnees
+
+
+def _valider(lignes, partiel=False):
+    """Lignes validées [(index, données)] et erreurs {index: détail}."""
+    # Une seule instance de serializer pour le lot : ses champs ne sont construits qu'une fois
+    serializer = SoinSerializer(partial=partiel)
+    valides, erreurs = [], {}
+    for index, ligne in enumerate(lignes):
+        try:
+            valides.append((index, serializer.run_validation(ligne)))
+        except ValidationError as exc:
+            erreurs[index] = exc.detail
+    return valides, erreurs
+
+
+def _adherents_absents(valides):
+    ids = {donnees['adherent_id'] for _, donnees in valides if 'adherent_id' in donnees}
+    return ids - set(Adherent.objects.filter(id__in=ids).values_list('id', flat=True))
+
+
+def _rapport(cle, soins, taches, erreurs):
+    resultats = [{'index': index, 'id': soin.id, 'tache_pdf': taches[soin.id].id} for index, soin in soins]
+    resultats += [{'index': index, 'erreurs': detail} for index, detail in erreurs.items()]
+    resultats.sort(key=lambda resultat: resultat['index'])
+    return {cle: len(soins), 'erreurs': len(erreurs), 'resultats': resultats}
+
+
+def creer(lignes):
+    """Crée les soins valides d'un lot et renvoie le rapport par ligne."""
+    valides, erreurs = _valider(_lignes(lignes))
+    absents = _adherents_absents(valides)
+    soins = []
+    for index, donnees in valides:
+        if donnees['adherent_id'] in absents:
+            erreurs[index] = {'adherent_id': ['Adhérent introuvable.']}
+        else:
+            soins.append((index, Soin(**donnees)))
+
+    taches = {}
+    if soins:
+        with transaction.atomic():
+            crees = Soin.objects.bulk_create([soin for _, soin in soins])
+            # bulk_create ne déclenche pas les signaux : compteurs, synthèse et journal mis à jour ici
+            stats.ajouter_en_masse(crees)
+            rapports_soins.ajouter_en_masse(crees)
+            ids = [soin.id for soin in crees]
+            modifications.journaliser(Soin, ids)
+            taches = taches_pdf.planifier_en_masse('recu', ids)
+    return _rapport('crees', soins, taches, erreurs)
+
+
+def modifier(lignes):
+    """Modifie les soins d'un lot (`id` et champs à changer) et renvoie le rapport par ligne."""
+    lignes = _lignes(lignes)
+    valides, erreurs = _valider(lignes, partiel=True)
+    ids = {
+        index: ligne['id'] for index, ligne in enumerate(lignes)
+        if isinstance(ligne, dict) and isinstance(ligne.get('id'), int)
+    }
+    existants = Soin.objects.in_bulk(set(ids.values()))
+    absents = _adherents_absents(valides)
+
+    soins, changements, champs, vus = [], [], set(), set()
+    for index, donnees in valides:
+        soin = existants.get(ids.get(index))
+        if soin is None:
+            erreurs[index] = {'id': ['Soin introuvable.']}
+        elif soin.id in vus:
+            erreurs[index] = {'id': ['Soin en double dans le lot.']}
+        elif donnees.get('adherent_id') in absents:
+            erreurs[index] = {'adherent_id': ['Adhérent introuvable.']}
+        else:
+            vus.add(soin.id)
+            anciennes = stats.valeurs(soin)
+            for champ, valeur in donnees.items():
+                setattr(soin, champ, valeur)
+            changements.append((anciennes, stats.valeurs(soin)))
+            champs.update(donnees)
+            soins.append((index, soin))
+
+    taches = {}
+    if soins:
+        with transaction.atomic():
+            if champs:
+                Soin.objects.bulk_update([soin for _, soin in soins], sorted(champs), batch_size=500)
+            # bulk_update ne déclenche pas les signaux : écarts reportés en une passe pour tout le lot
+            stats.appliquer(
+                [c for anciennes, _ in changements for c in stats.contributions(Soin, anciennes)],
+                [c for _, nouvelles in changements for c in stats.contributions(Soin, nouvelles)],
+            )
+            rapports_soins.modifier_en_masse(changements)
+            ids_modifies = [soin.id for _, soin in soins]
+            modifications.journaliser(Soin, ids_modifies)
+            taches = taches_pdf.planifier_en_masse('recu', ids_modifies)
+    return _rapport('modifies', soins, taches, erreurs)
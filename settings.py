@@ -1,146 +1,244 @@
-"""
-Django settings for backend project.
-
-Generated by 'django-admin startproject' using Django 4.2.20.
-
-For more information on this file, see
-https://docs.djangoproject.com/en/4.2/topics/settings/
-
-For the full list of settings and their values, see
-https://docs.djangoproject.com/en/4.2/ref/settings/
-"""
-
-from pathlib import Path
-
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
-
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-2ob@##t2v1l8)b&74g831p^zxba(x_1czhcpfzvezp_s5sdfqf'
-
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
-
-ALLOWED_HOSTS = []
-
-
-# Application definition
-
-INSTALLED_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
-    'rest_framework',
-    'api',
-    'django_filters',
-    'rest_framework_simplejwt.token_blacklist',
-]
-
-MIDDLEWARE = [
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'corsheaders.middleware.CorsMiddleware',
-]
-
-ROOT_URLCONF = 'backend.urls'
-
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = 'backend.wsgi.application'
-
-
-# Database
-# https://docs.djangoproject.com/en/4.2/ref/settings/#databases
-
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
-
-
-# Password validation
-# https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
-
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
-    },
-]
-
-
-# Internationalization
-# https://docs.djangoproject.com/en/4.2/topics/i18n/
-
-LANGUAGE_CODE = 'en-us'
-
-TIME_ZONE = 'UTC'
-
-USE_I18N = True
-
-USE_TZ = True
-
-
-# Static files (CSS, JavaScript, Images)
-# https://docs.djangoproject.com/en/4.2/howto/static-files/
-
-STATIC_URL = 'static/'
-
-# Default primary key field type
-# https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
-
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
-
-
-INSTALLED_APPS += ['corsheaders']
-
-MIDDLEWARE = ['corsheaders.middleware.CorsMiddleware'] + MIDDLEWARE
-
-CORS_ALLOW_ALL_ORIGINS = True  # Pour le développement
-
-REST_FRAMEWORK = {
-    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
-    
-}
-
-
-import os
-
-MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+"""
+Django settings for backend project.
+
+Generated by 'django-admin startproject' using Django 4.2.20.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/4.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/4.2/ref/settings/
+"""
+
+import os
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'django-insecure-2ob@##t2v1l8)b&74g831p^zxba(x_1czhcpfzvezp_s5sdfqf'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = True
+
+ALLOWED_HOSTS = []
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'rest_framework',
+    'api',
+    'authentication',
+    'django_filters',
+    'rest_framework_simplejwt.token_blacklist',
+]
+
+MIDDLEWARE = [
+    # En premier : la durée mesurée couvre tous les autres middlewares
+    'api.instrumentation.MesureMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+]
+
+ROOT_URLCONF = 'backend.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'backend.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/4.2/ref/settings/#databases
+
+# Connexions persistantes (CONN_MAX_AGE) vérifiées avant réutilisation ; SQLite attend un verrou
+# jusqu'à `timeout` secondes au lieu d'échouer sur « database is locked ».
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {'timeout': 20},
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# Appliqués à chaque nouvelle connexion SQLite (signals.py). WAL : les lectures ne bloquent plus
+# l'écriture et inversement ; synchronous=NORMAL est sûr en WAL (une transaction validée juste
+# avant une coupure de courant peut être perdue, jamais la base corrompue).
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -20000,  # Ko par connexion
+    'temp_store': 'memory',
+}
+
+# Postgres si POSTGRES_DB est défini (pilote psycopg requis) : plusieurs écrivains simultanés
+if os.environ.get('POSTGRES_DB'):
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': os.environ['POSTGRES_DB'],
+        'USER': os.environ.get('POSTGRES_USER', 'postgres'),
+        'PASSWORD': os.environ.get('POSTGRES_PASSWORD', ''),
+        'HOST': os.environ.get('POSTGRES_HOST', 'localhost'),
+        'PORT': os.environ.get('POSTGRES_PORT', '5432'),
+        'OPTIONS': {'connect_timeout': 5},
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 600)),
+        'CONN_HEALTH_CHECKS': True,
+    }
+
+# Curseur des deltas (modifications.py) tenu avant les écritures des N dernières secondes : sous
+# Postgres, un id du journal peut être validé après un id supérieur. Plus long qu'une transaction.
+MODIFICATIONS_MARGE = 120 if DATABASES['default']['ENGINE'].endswith('postgresql') else 0
+# Le journal grandit à chaque écriture (renouvellements et expirations compris) : balayer_cotisations,
+# à planifier (cron chaque minute ou --boucle), le compacte une fois par jour (compacter_modifications).
+
+
+# Password validation
+# https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/4.2/topics/i18n/
+
+LANGUAGE_CODE = 'en-us'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/4.2/howto/static-files/
+
+STATIC_URL = 'static/'
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+INSTALLED_APPS += ['corsheaders']
+
+MIDDLEWARE = ['corsheaders.middleware.CorsMiddleware'] + MIDDLEWARE
+
+CORS_ALLOW_ALL_ORIGINS = True  # Pour le développement
+
+REST_FRAMEWORK = {
+    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    # Pagination par curseur sur id (?page_size= jusqu'à 500, ?stream=1 pour l'export NDJSON)
+    'DEFAULT_PAGINATION_CLASS': 'api.pagination.IdCursorPagination',
+}
+
+
+import os
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Rendu des PDF (cartes, reçus) par `manage.py pdf_worker`.
+# Mettre à False pour rendre les PDF directement dans la requête (développement).
+PDF_RENDU_ASYNCHRONE = True
+
+# Cache des PDF rendus (MEDIA_ROOT/pdf_cache), purgé au-delà de ces limites
+PDF_CACHE_TAILLE_MAX = 500 * 1024 * 1024  # octets
+PDF_CACHE_AGE_MAX = 90 * 24 * 3600  # secondes
+
+# Export groupé des reçus (/api/soins/export/?sortie=pdf) : nombre max de reçus fusionnés
+EXPORT_RECUS_FUSION_MAX = 500
+
+# Réponses GET des listes et fiches (voir cache_reponses.py). Clés versionnées par le journal
+# des modifications : un cache par processus (LocMemCache) reste exact. FileBasedCache ou Redis
+# pour partager les entrées entre workers.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'reponses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'reponses',
+        'TIMEOUT': 600,
+        'OPTIONS': {'MAX_ENTRIES': 2000},
+    },
+    'sessions': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'sessions',
+    },
+}
+
+# Authentification par session sans lecture de django_session ni de auth_user à chaque requête :
+# sessions cached_db (cache local, écriture en base) et utilisateurs gardés en mémoire du processus.
+# AUTH_CACHE_TTL : délai maximal (secondes) pour qu'une déconnexion ou un changement de mot de
+# passe fait dans un autre worker y soit vu (immédiat dans le worker qui le traite).
+SESSION_ENGINE = 'authentication.sessions'
+SESSION_CACHE_ALIAS = 'sessions'
+# ModelBackend reste listé : les sessions ouvertes avant CacheModelBackend le désignent encore
+AUTHENTICATION_BACKENDS = [
+    'authentication.backends.CacheModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+AUTH_CACHE_TTL = 30
+
+# Mesures par requête (voir instrumentation.py) : une ligne JSON par requête dans ce fichier,
+# rotation au-delà de MESURES_FICHIER_TAILLE_MAX octets. None pour ne pas écrire de fichier.
+MESURES_FICHIER = os.path.join(BASE_DIR, 'mesures', 'requetes.jsonl')
+MESURES_FICHIER_TAILLE_MAX = 10 * 1024 * 1024
+MESURES_FICHIER_NOMBRE = 5
+# Même requête SQL (à la structure près) exécutée au moins autant de fois : N+1 probable
+MESURES_SEUIL_N_PLUS_UN = 10
+# Agrégats publiés par chaque processus (un fichier chacun, au plus toutes les MESURES_PUBLICATION
+# secondes) et additionnés par /api/metrics/. À vider au redéploiement. None : processus qui répond seul.
+MESURES_DOSSIER = os.path.join(BASE_DIR, 'mesures', 'processus')
+MESURES_PUBLICATION = 5
+# /api/metrics/ : personnel connecté, ou collecteur Prometheus avec l'en-tête Authorization: Bearer <jeton>
+MESURES_JETON = os.environ.get('MESURES_JETON')
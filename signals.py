@@ -1,76 +1,149 @@
-from django.db.models.signals import pre_save
-from django.dispatch import receiver
-from datetime import timedelta, date
-from .models import Adherent, Cotisation, Soin
-
-# ✅ Création de cotisation à l’ajout d’un adhérent
-from django.db.models.signals import post_save
-
-@receiver(post_save, sender=Adherent)
-def create_cotisation_for_adherent(sender, instance, created, **kwargs):
-    if created and instance.a_droit == 'ayant_droit':
-        date_debut = instance.date_recrutement or date.today()
-        date_fin = date_debut + timedelta(days=30)
-        Cotisation.objects.create(
-            adherent=instance,
-            cin=instance.cin,
-            cotisation='oui',
-            date_debut=date_debut,
-            date_fin=date_fin
-        )
-
-# ✅ Mise à jour de la cotisation si le droit change
-@receiver(pre_save, sender=Adherent)
-def update_cotisation_on_droit_change(sender, instance, **kwargs):
-    if getattr(instance, '_disable_signal', False):
-        return
-
-    if not instance.pk:
-        return
-
-    try:
-        old_instance = Adherent.objects.get(pk=instance.pk)
-    except Adherent.DoesNotExist:
-        return
-
-    if old_instance.a_droit != instance.a_droit:
-        try:
-            cotisation = Cotisation.objects.get(adherent=instance)
-            if instance.a_droit == 'ayant_droit':
-                cotisation.cotisation = 'oui'
-                cotisation.date_debut = date.today()
-                cotisation.date_fin = date.today() + timedelta(days=30)
-            else:
-                cotisation.cotisation = 'non'
-                cotisation.date_debut = None
-                cotisation.date_fin = None
-            cotisation._disable_signal = True
-            cotisation.save()
-        except Cotisation.DoesNotExist:
-            pass
-
-# ✅ Mise à jour du droit si la cotisation change
-@receiver(pre_save, sender=Cotisation)
-def update_droit_on_cotisation_change(sender, instance, **kwargs):
-    if getattr(instance, '_disable_signal', False):
-        return
-
-    if not instance.pk:
-        return
-
-    try:
-        old_instance = Cotisation.objects.get(pk=instance.pk)
-    except Cotisation.DoesNotExist:
-        return
-
-    if old_instance.cotisation != instance.cotisation:
-        adherent = instance.adherent
-        adherent._disable_signal = True
-        if instance.cotisation == 'oui':
-            adherent.a_droit = 'ayant_droit'
-        else:
-            adherent.a_droit = 'sans_droit'
-        adherent.save()
-
-
-
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from .models import Adherent, Cotisation, Soin
+from . import adhesion, etat_adherents, modifications, rapports_soins, recherche, stats, suppressions
+
+
+# ✅ NAX de l'adhérent : premier receveur post_save, les suivants lisent instance.nax
+@receiver(post_save, sender=Adherent)
+def attribuer_nax(sender, instance, created, **kwargs):
+    Adherent.attribuer_nax([instance])
+
+
+# ✅ Droit de l'adhérent <-> cotisation (voir adhesion.py)
+@receiver(post_init, sender=Adherent)
+@receiver(post_init, sender=Cotisation)
+def snapshot_adhesion(sender, instance, **kwargs):
+    # Valeur lue en base : pas de get() avant l'enregistrement pour détecter un changement
+    instance._adhesion_valeur = adhesion.valeur_suivie(instance)
+
+
+@receiver(post_save, sender=Adherent)
+def sync_cotisation_on_adherent_save(sender, instance, created, **kwargs):
+    adhesion.adherent_enregistre(instance, created)
+
+
+@receiver(post_save, sender=Cotisation)
+def sync_droit_on_cotisation_save(sender, instance, created, **kwargs):
+    adhesion.cotisation_enregistree(instance, created)
+
+
+# ✅ Compteurs du tableau de bord (voir stats.py)
+@receiver(post_init, sender=Adherent)
+@receiver(post_init, sender=Cotisation)
+@receiver(post_init, sender=Soin)
+def snapshot_stats(sender, instance, **kwargs):
+    # Valeurs telles que lues en base, pour calculer l'écart à l'enregistrement
+    instance._stats_valeurs = stats.valeurs(instance)
+
+
+@receiver(pre_save, sender=Adherent)
+@receiver(pre_save, sender=Cotisation)
+@receiver(pre_save, sender=Soin)
+@receiver(pre_delete, sender=Adherent)
+def complete_stats_snapshot(sender, instance, **kwargs):
+    # Instance chargée avec only()/defer() : une seule requête pour les champs manquants
+    if not instance._state.adding:
+        instance._stats_valeurs.update(stats.valeurs_manquantes(instance, instance._stats_valeurs))
+
+
+@receiver(post_save, sender=Adherent)
+@receiver(post_save, sender=Cotisation)
+@receiver(post_save, sender=Soin)
+def refresh_stats_on_save(sender, instance, created, **kwargs):
+    anciennes = instance._stats_valeurs
+    nouvelles = {**anciennes, **stats.valeurs(instance)}
+    stats.appliquer(
+        [] if created else stats.contributions(sender, anciennes),
+        stats.contributions(sender, nouvelles),
+    )
+    # Même écart pour la synthèse mensuelle des soins
+    if sender is Soin:
+        rapports_soins.appliquer(instance, None if created else anciennes, nouvelles)
+    elif sender is Adherent and not created:
+        rapports_soins.deplacer_adherent(
+            instance.pk,
+            (anciennes['organisme_employeur'], anciennes['section_cotisation']),
+            (nouvelles['organisme_employeur'], nouvelles['section_cotisation']),
+        )
+    instance._stats_valeurs = nouvelles
+
+
+# Pas de signal de suppression sur Soin et Cotisation : la cascade reste un DELETE direct (voir suppressions.py)
+@receiver(pre_delete, sender=Adherent)
+def report_cascade_on_delete(sender, instance, **kwargs):
+    suppressions.reporter(Soin.objects.filter(adherent_id=instance.pk))
+    suppressions.reporter(Cotisation.objects.filter(adherent_id=instance.pk))
+
+
+@receiver(post_delete, sender=Adherent)
+def refresh_stats_on_delete(sender, instance, **kwargs):
+    stats.appliquer(stats.contributions(sender, instance._stats_valeurs), [])
+
+
+# ✅ Index de recherche des adhérents (voir recherche.py)
+@receiver(post_init, sender=Adherent)
+def snapshot_recherche(sender, instance, **kwargs):
+    instance._recherche_valeurs = tuple(instance.__dict__.get(champ) for champ in recherche.CHAMPS_INDEXES)
+
+
+@receiver(post_save, sender=Adherent)
+def reindex_adherent(sender, instance, created, **kwargs):
+    # Champs non chargés (only()/defer()) : non enregistrés, donc inchangés
+    valeurs = tuple(instance.__dict__.get(champ) for champ in recherche.CHAMPS_INDEXES)
+    if created or valeurs != instance._recherche_valeurs:
+        recherche.indexer(instance)
+        instance._recherche_valeurs = valeurs
+    recherche.cache_suggestions.clear()
+
+
+@receiver(post_delete, sender=Adherent)
+def clear_suggestions_on_delete(sender, instance, **kwargs):
+    recherche.cache_suggestions.clear()
+
+
+# ✅ Situation des adhérents (voir etat_adherents.py)
+@receiver(post_init, sender=Adherent)
+def snapshot_etat(sender, instance, **kwargs):
+    instance._etat_valeurs = tuple(instance.__dict__.get(champ) for champ in etat_adherents.CHAMPS_ADHERENT)
+
+
+@receiver(post_save, sender=Adherent)
+def sync_etat_on_adherent_save(sender, instance, created, **kwargs):
+    # Après adhesion.py : la cotisation créée ou resynchronisée est déjà en base
+    valeurs = tuple(instance.__dict__.get(champ) for champ in etat_adherents.CHAMPS_ADHERENT)
+    if created or valeurs != instance._etat_valeurs:
+        etat_adherents.synchroniser([instance.pk])
+        instance._etat_valeurs = valeurs
+
+
+@receiver(post_save, sender=Cotisation)
+def sync_etat_on_cotisation_save(sender, instance, **kwargs):
+    # Cotisation écrite par adhesion.py pour un adhérent en cours d'enregistrement : synchronisée par lui
+    if not getattr(instance, '_disable_signal', False):
+        etat_adherents.synchroniser([instance.adherent_id])
+
+
+# ✅ Journal des modifications pour la synchronisation par delta (voir modifications.py)
+@receiver(post_save, sender=Adherent)
+@receiver(post_save, sender=Cotisation)
+@receiver(post_save, sender=Soin)
+def journal_on_save(sender, instance, **kwargs):
+    modifications.journaliser(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Adherent)
+def journal_on_delete(sender, instance, **kwargs):
+    modifications.journaliser(sender, [instance.pk], 'suppression')
+
+
+# ✅ Réglages de chaque nouvelle connexion SQLite (settings.SQLITE_PRAGMAS)
+@receiver(connection_created)
+def appliquer_pragmas_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    # Sur la connexion sqlite3 elle-même : hors du journal des requêtes et des mesures
+    for nom, valeur in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+        connection.connection.execute(f'PRAGMA {nom} = {valeur}')
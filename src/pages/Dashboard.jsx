@@ -19,7 +19,7 @@ import {
 } from 'lucide-react';
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, LineChart, Line, PieChart, Pie, Cell, Area, AreaChart } from 'recharts';
 import Card from '../components/UI/Card';
-import { adherentsAPI, cotisationsAPI, soinsAPI } from '../services/api';
+import { dashboardAPI } from '../services/api';
 
 const COLORS = ['#6366f1', '#10b981', '#f59e0b', '#ef4444', '#8b5cf6', '#06b6d4'];
 
@@ -43,25 +43,15 @@ export default function Dashboard() {
 
   const fetchDashboardData = async () => {
     try {
-      const [adherentsRes, cotisationsRes, soinsRes] = await Promise.all([
-        adherentsAPI.getAll(),
-        cotisationsAPI.getAll(),
-        soinsAPI.getAll()
-      ]);
-
-      const adherents = adherentsRes.data;
-      const cotisations = cotisationsRes.data;
-      const soins = soinsRes.data;
-
-      const soinsRecu = soins.filter(s => s.statut_dossier === 'recu').length;
-      const soinsRejet = soins.filter(s => s.statut_dossier === 'rejet').length;
+      // Compteurs calculés côté serveur (voir /api/dashboard/stats/)
+      const { data } = await dashboardAPI.getStats();
 
       setStats({
-        totalAdherents: adherents.length,
-        totalCotisations: cotisations.length,
-        totalSoins: soins.length,
-        soinsRecu,
-        soinsRejet,
+        totalAdherents: data.total_adherents,
+        totalCotisations: data.total_cotisations,
+        totalSoins: data.total_soins,
+        soinsRecu: data.soins_recu,
+        soinsRejet: data.soins_rejet,
         loading: false
       });
 
@@ -77,11 +67,11 @@ export default function Dashboard() {
         monthlyData[month] = { soins: 0, montant: 0 };
       });
 
-      soins.forEach(soin => {
-        const month = new Date(soin.date_soin).toLocaleDateString('fr-FR', { month: 'short', year: '2-digit' });
+      data.soins_par_mois.forEach(({ mois, soins, montant }) => {
+        const month = new Date(`${mois}-01`).toLocaleDateString('fr-FR', { month: 'short', year: '2-digit' });
         if (monthlyData[month]) {
-          monthlyData[month].soins += 1;
-          monthlyData[month].montant += parseFloat(soin.montant_dossier || 0);
+          monthlyData[month].soins += soins;
+          monthlyData[month].montant += parseFloat(montant || 0);
         }
       });
 
@@ -46,4 +46,9 @@ api.interceptors.response.use(
   }
 );
 
+// Dashboard API
+export const dashboardAPI = {
+  getStats: () => api.get('/dashboard/stats/'),
+};
+
 export default api;
\ No newline at end of file
@@ -0,0 +1,218 @@
+# api/stats.py
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+from .models import Adherent, Cotisation, Soin, Statistique
+
+
+def _mois(valeur):
+    # Accepte une date ou une chaîne ISO ('2025-03-14' -> '2025-03')
+    return str(valeur)[:7] if valeur else 'inconnu'
+
+
+def _montant(valeur):
+    return Decimal(str(valeur or 0))
+
+
+# Champs dont dépendent les compteurs, par modèle
+CHAMPS = {
+    Adherent: ('organisme_employeur', 'section_cotisation', 'statut', 'a_droit'),
+    Cotisation: ('cotisation',),
+    # type_beneficier et adherent_id servent à SyntheseSoins (rapports_soins.py)
+    Soin: ('montant_dossier', 'statut_dossier', 'date_soin', 'type_beneficier', 'adherent_id'),
+}
+
+
+def valeurs(instance):
+    """Valeurs des champs suivis déjà chargées sur l'instance (sans requête pour les champs différés)."""
+    return {champ: instance.__dict__[champ] for champ in CHAMPS[type(instance)] if champ in instance.__dict__}
+
+
+def valeurs_manquantes(instance, connues):
+    """Lit en base les champs suivis absents de `connues` (instance chargée avec only()/defer())."""
+    manquants = [champ for champ in CHAMPS[type(instance)] if champ not in connues]
+    if not manquants or instance.pk is None:
+        return {}
+    return type(instance).objects.filter(pk=instance.pk).values(*manquants).first() or {}
+
+
+def contributions(modele, valeurs):
+    """Renvoie les compteurs (categorie, cle, montant) alimentés par une ligne."""
+    if modele is Adherent:
+        return [
+            ('adherents', 'total', Decimal(0)),
+            ('adherents_organisme', valeurs['organisme_employeur'] or '', Decimal(0)),
+            ('adherents_section', valeurs['section_cotisation'] or '', Decimal(0)),
+            ('adherents_statut', valeurs['statut'] or '', Decimal(0)),
+            ('adherents_droit', valeurs['a_droit'] or '', Decimal(0)),
+        ]
+    if modele is Cotisation:
+        return [
+            ('cotisations', 'total', Decimal(0)),
+            ('cotisations_statut', valeurs['cotisation'] or '', Decimal(0)),
+        ]
+    if modele is Soin:
+        montant = _montant(valeurs['montant_dossier'])
+        return [
+            ('soins', 'total', montant),
+            ('soins_statut', valeurs['statut_dossier'] or '', montant),
+            ('soins_mois', _mois(valeurs['date_soin']), montant),
+        ]
+    return []
+
+
+def _incrementer(categorie, cle, nombre, montant):
+    maj = Statistique.objects.filter(categorie=categorie, cle=cle).update(
+        nombre=F('nombre') + nombre,
+        montant=F('montant') + montant,
+    )
+    if maj:
+        return
+    try:
+        with transaction.atomic():
+            Statistique.objects.create(categorie=categorie, cle=cle, nombre=nombre, montant=montant)
+    except IntegrityError:
+        # Ligne créée entre-temps par une autre requête
+        Statistique.objects.filter(categorie=categorie, cle=cle).update(
+            nombre=F('nombre') + nombre,
+            montant=F('montant') + montant,
+        )
+
+
+def _appliquer_deltas(deltas):
+    for (categorie, cle), (nombre, montant) in deltas.items():
+        if nombre or montant:
+            _incrementer(categorie, cle, nombre, montant)
+
+
+def appliquer(anciennes, nouvelles):
+    """Applique la différence entre deux listes de contributions."""
+    if anciennes == nouvelles:
+        return
+    deltas = {}
+    for categorie, cle, montant in anciennes:
+        nombre, total = deltas.get((categorie, cle), (0, Decimal(0)))
+        deltas[(categorie, cle)] = (nombre - 1, total - montant)
+    for categorie, cle, montant in nouvelles:
+        nombre, total = deltas.get((categorie, cle), (0, Decimal(0)))
+        deltas[(categorie, cle)] = (nombre + 1, total + montant)
+    _appliquer_deltas(deltas)
+
+
+def deplacer(categorie, ancienne_cle, nouvelle_cle, nombre):
+    """Reporte `nombre` lignes d'une clé à l'autre après un UPDATE ensembliste."""
+    if nombre and ancienne_cle != nouvelle_cle:
+        _incrementer(categorie, ancienne_cle, -nombre, Decimal(0))
+        _incrementer(categorie, nouvelle_cle, nombre, Decimal(0))
+
+
+def ajouter_en_masse(instances):
+    """Compte des lignes créées par bulk_create, qui ne déclenche pas les signaux."""
+    appliquer([], [c for instance in instances for c in contributions(type(instance), valeurs(instance))])
+
+
+def retirer_en_masse(queryset):
+    """Décompte les soins ou cotisations de `queryset` avant leur DELETE (une requête d'agrégation)."""
+    modele = queryset.model
+    if modele is Soin:
+        groupes = (
+            (
+                {'statut_dossier': g['statut_dossier'], 'date_soin': g['mois'], 'montant_dossier': g['montant']},
+                g['nombre'],
+            )
+            for g in queryset.values('statut_dossier', mois=TruncMonth('date_soin'))
+            .annotate(nombre=Count('id'), montant=Sum('montant_dossier')).order_by()
+        )
+    else:
+        groupes = (
+            ({'cotisation': g['cotisation']}, g['nombre'])
+            for g in queryset.values('cotisation').annotate(nombre=Count('id')).order_by()
+        )
+    deltas = {}
+    for valeurs_groupe, nombre_groupe in groupes:
+        # Montant d'une contribution = somme du groupe
+        for categorie, cle, montant in contributions(modele, valeurs_groupe):
+            nombre, total = deltas.get((categorie, cle), (0, Decimal(0)))
+            deltas[(categorie, cle)] = (nombre - nombre_groupe, total - montant)
+    _appliquer_deltas(deltas)
+
+
+def reconstruire():
+    """Recalcule tous les compteurs à partir des tables (après un import en masse par ex.)."""
+    lignes = []
+
+    def ajouter(categorie, rows, champ):
+        for row in rows:
+            lignes.append(Statistique(
+                categorie=categorie,
+                cle=row[champ] if row[champ] is not None else '',
+                nombre=row['nombre'],
+                montant=row.get('montant') or 0,
+            ))
+
+    lignes.append(Statistique(categorie='adherents', cle='total', nombre=Adherent.objects.count()))
+    for categorie, champ in [
+        ('adherents_organisme', 'organisme_employeur'),
+        ('adherents_section', 'section_cotisation'),
+        ('adherents_statut', 'statut'),
+        ('adherents_droit', 'a_droit'),
+    ]:
+        ajouter(categorie, Adherent.objects.values(champ).annotate(nombre=Count('id')).order_by(), champ)
+
+    lignes.append(Statistique(categorie='cotisations', cle='total', nombre=Cotisation.objects.count()))
+    ajouter('cotisations_statut',
+            Cotisation.objects.values('cotisation').annotate(nombre=Count('id')).order_by(), 'cotisation')
+
+    total_soins = Soin.objects.aggregate(nombre=Count('id'), montant=Sum('montant_dossier'))
+    lignes.append(Statistique(categorie='soins', cle='total',
+                              nombre=total_soins['nombre'], montant=total_soins['montant'] or 0))
+    ajouter('soins_statut',
+            Soin.objects.values('statut_dossier')
+            .annotate(nombre=Count('id'), montant=Sum('montant_dossier')).order_by(),
+            'statut_dossier')
+    for row in (Soin.objects.annotate(mois=TruncMonth('date_soin')).values('mois')
+                .annotate(nombre=Count('id'), montant=Sum('montant_dossier')).order_by()):
+        lignes.append(Statistique(categorie='soins_mois', cle=_mois(row['mois']),
+                                  nombre=row['nombre'], montant=row['montant'] or 0))
+
+    with transaction.atomic():
+        Statistique.objects.all().delete()
+        Statistique.objects.bulk_create(lignes)
+    return len(lignes)
+
+
+def tableau_de_bord():
+    """Lit les compteurs (une seule requête sur une petite table) et les met en forme."""
+    compteurs = {}
+    for stat in Statistique.objects.all():
+        compteurs.setdefault(stat.categorie, {})[stat.cle] = stat
+
+    def nombre(categorie, cle='total'):
+        stat = compteurs.get(categorie, {}).get(cle)
+        return stat.nombre if stat else 0
+
+    def repartition(categorie):
+        return {cle: stat.nombre for cle, stat in compteurs.get(categorie, {}).items() if stat.nombre}
+
+    soins_mois = compteurs.get('soins_mois', {})
+    total_soins = compteurs.get('soins', {}).get('total')
+    return {
+        'total_adherents': nombre('adherents'),
+        'total_cotisations': nombre('cotisations'),
+        'total_soins': nombre('soins'),
+        'soins_recu': nombre('soins_statut', 'recu'),
+        'soins_rejet': nombre('soins_statut', 'rejet'),
+        'montant_total_soins': str(total_soins.montant) if total_soins else '0.00',
+        'adherents_par_organisme': repartition('adherents_organisme'),
+        'adherents_par_section': repartition('adherents_section'),
+        'adherents_par_statut': repartition('adherents_statut'),
+        'adherents_par_droit': repartition('adherents_droit'),
+        'cotisations_par_statut': repartition('cotisations_statut'),
+        'soins_par_mois': [
+            {'mois': cle, 'soins': stat.nombre, 'montant': str(stat.montant)}
+            for cle, stat in sorted(soins_mois.items()) if stat.nombre
+        ],
+    }
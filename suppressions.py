@@ -0,0 +1,36 @@
+# api/suppressions.py
+"""Suppression des soins et cotisations, reportée en requêtes ensemblistes.
+
+Soin et Cotisation n'ont pas de signal de suppression : Django supprime alors
+ceux d'un adhérent en cascade par un seul DELETE, sans les charger. Compteurs,
+synthèse des soins, journal et état des adhérents sont reportés ici, une requête
+d'agrégation par structure, que la suppression vienne d'un queryset ou d'une
+instance (SuppressionSuivieQuerySet, models.py) ou de la cascade d'un adhérent
+(signals.py).
+"""
+from django.db import transaction
+
+from . import etat_adherents, modifications, rapports_soins, stats
+from .models import Cotisation, Soin
+
+
+def reporter(queryset):
+    """Avant le DELETE des soins ou cotisations de `queryset` ; renvoie les adhérents concernés."""
+    lignes = list(queryset.values_list('id', 'adherent_id'))
+    if not lignes:
+        return set()
+    stats.retirer_en_masse(queryset)
+    if queryset.model is Soin:
+        rapports_soins.retirer_en_masse(queryset)
+    modifications.journaliser(queryset.model, [pk for pk, _ in lignes], 'suppression')
+    return {adherent_id for _, adherent_id in lignes}
+
+
+def supprimer(queryset, suppression):
+    """Exécute `suppression()` (le DELETE de Django) entre le décompte et la mise à jour de l'état."""
+    with transaction.atomic(using=queryset.db):
+        adherent_ids = reporter(queryset)
+        resultat = suppression()
+        if queryset.model is Cotisation and adherent_ids:
+            etat_adherents.synchroniser(adherent_ids)
+    return resultat
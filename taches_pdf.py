@@ -0,0 +1,127 @@
+# api/taches_pdf.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.utils import timezone
+
+from .models import Adherent, Soin, TachePdf
+from .utils import generer_carte_mutuelle_pdf, generer_recu_pdf
+
+# Délai avant nouvelle tentative : 10 s, 20 s, 40 s...
+DELAI_BASE_SECONDES = 10
+# Au-delà, une tâche 'en_cours' est considérée comme abandonnée (worker tué)
+DELAI_ABANDON = timedelta(minutes=10)
+
+
+def generer_document(type_document, objet_id):
+    """Rend le PDF demandé et renvoie son chemin. Exécuté dans le worker."""
+    if type_document == 'carte':
+        return generer_carte_mutuelle_pdf(Adherent.objects.get(pk=objet_id))
+    if type_document == 'recu':
+        return generer_recu_pdf(Soin.objects.select_related('adherent').get(pk=objet_id))
+    raise ValueError(f"Type de document inconnu : {type_document}")
+
+
+def planifier(type_document, objet_id):
+    """Ajoute un rendu à la file, sauf si une tâche identique attend déjà."""
+    tache = TachePdf.objects.filter(
+        type_document=type_document, objet_id=objet_id, statut='en_attente'
+    ).first()
+    if tache is None:
+        tache = TachePdf.objects.create(type_document=type_document, objet_id=objet_id)
+
+    if not getattr(settings, 'PDF_RENDU_ASYNCHRONE', True):
+        # Mode développement : rendu immédiat dans la requête
+        reclamer(tache)
+        executer(tache)
+    return tache
+
+
+def planifier_en_masse(type_document, objet_ids, batch_size=1000):
+    """Met en file un rendu par objet (imports, saisie par lot), sauf si une tâche identique attend déjà.
+
+    Toujours traité par le worker. Renvoie {objet_id: tâche}.
+    """
+    taches = {
+        tache.objet_id: tache
+        for tache in TachePdf.objects.filter(type_document=type_document, objet_id__in=objet_ids, statut='en_attente')
+    }
+    nouvelles = TachePdf.objects.bulk_create(
+        [TachePdf(type_document=type_document, objet_id=objet_id) for objet_id in objet_ids
+         if objet_id not in taches],
+        batch_size=batch_size,
+    )
+    taches.update((tache.objet_id, tache) for tache in nouvelles)
+    return taches
+
+
+def derniere_tache(type_document, objet_id):
+    return TachePdf.objects.filter(type_document=type_document, objet_id=objet_id).order_by('-id').first()
+
+
+def reprendre_abandonnees():
+    """Remet en file les tâches restées 'en_cours' après l'arrêt brutal d'un worker."""
+    return TachePdf.objects.filter(
+        statut='en_cours', maj_le__lt=timezone.now() - DELAI_ABANDON
+    ).update(statut='en_attente', maj_le=timezone.now())
+
+
+def reclamer(tache):
+    """Passe une tâche en 'en_cours'. Renvoie False si un autre worker l'a prise."""
+    prise = TachePdf.objects.filter(pk=tache.pk, statut='en_attente').update(
+        statut='en_cours', tentatives=tache.tentatives + 1, maj_le=timezone.now()
+    )
+    if prise:
+        tache.statut = 'en_cours'
+        tache.tentatives += 1
+    return bool(prise)
+
+
+def taches_disponibles(limite):
+    return list(
+        TachePdf.objects.filter(statut='en_attente', disponible_le__lte=timezone.now())
+        .order_by('disponible_le', 'id')[:limite]
+    )
+
+
+def terminer(tache, chemin=None, erreur=None, definitif=False):
+    """Enregistre le résultat d'un rendu ; replanifie en cas d'échec si possible (sauf échec `definitif`)."""
+    if erreur is None:
+        tache.statut = 'termine'
+        tache.fichier = str(chemin)
+        tache.erreur = ''
+    elif tache.tentatives < tache.max_tentatives and not definitif:
+        tache.statut = 'en_attente'
+        tache.erreur = erreur
+        tache.disponible_le = timezone.now() + timedelta(
+            seconds=DELAI_BASE_SECONDES * 2 ** (tache.tentatives - 1)
+        )
+    else:
+        tache.statut = 'echec'
+        tache.erreur = erreur
+    tache.save(update_fields=['statut', 'fichier', 'erreur', 'disponible_le', 'maj_le'])
+
+
+def echouer(tache, exc):
+    """Enregistre l'échec d'un rendu ; objet supprimé depuis la mise en file : échec sans nouvelle tentative."""
+    terminer(tache, erreur=f"{type(exc).__name__}: {exc}", definitif=isinstance(exc, ObjectDoesNotExist))
+
+
+def executer(tache):
+    """Rend une tâche déjà réclamée dans le processus courant."""
+    try:
+        chemin = generer_document(tache.type_document, tache.objet_id)
+    except Exception as exc:
+        echouer(tache, exc)
+    else:
+        terminer(tache, chemin=chemin)
+    return tache
+
+
+def url_document(tache):
+    if tache.statut != 'termine':
+        return None
+    if tache.type_document == 'carte':
+        return settings.MEDIA_URL + f'cartes/carte_{tache.objet_id}.pdf'
+    return f'/recu/{tache.objet_id}/'
@@ -1,3 +1,1171 @@
-from django.test import TestCase
-
-# Create your tests here.
+import importlib.util
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from dateutil.relativedelta import relativedelta
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Adherent, Cotisation, EtatAdherent, Modification, Soin, SyntheseSoins, TachePdf
+from . import (
+    balayage, benchmarks, cache_pdf, donnees_synthetiques, etat_adherents, export_recus, instrumentation,
+    modifications, rapports_soins, recherche, rendu_pdf, renouvellement, stats, taches_pdf,
+)
+
+
+def creer_adherent(**kwargs):
+    numero = Adherent.objects.count() + 1
+    valeurs = {
+        'nom': f'Nom{numero}',
+        'prenom': f'Prenom{numero}',
+        'date_naissance': date(1980, 1, 1),
+        'cin': f'CIN{numero:05d}',
+        'sexe': 'homme',
+        'date_recrutement': date(2020, 1, 1),
+        'statut': 'actif',
+        'a_droit': 'ayant_droit',
+        'numero_tel': '0600000000',
+        'rib': '0' * 24,
+        'ville': 'Casablanca',
+        'adresse': 'Port de Casablanca',
+        'salaire': Decimal('5000.00'),
+        'organisme_employeur': 'anp',
+        'section_cotisation': 'anp',
+    }
+    valeurs.update(kwargs)
+    return Adherent.objects.create(**valeurs)
+
+
+def creer_soin(adherent, **kwargs):
+    valeurs = {
+        'num_recu': f'R{Soin.objects.count() + 1}',
+        'statut_dossier': 'recu',
+        'montant_dossier': Decimal('100.00'),
+        'date_soin': date(2025, 3, 10),
+        'date_fin_soin': date(2025, 3, 12),
+    }
+    valeurs.update(kwargs)
+    return Soin.objects.create(adherent=adherent, **valeurs)
+
+
+class ReconstructionMixin:
+    """Compteurs et synthèse tenus au fil des écritures : identiques à une reconstruction complète."""
+
+    def verifier_compteurs(self):
+        incremental = stats.tableau_de_bord()
+        stats.reconstruire()
+        self.assertEqual(incremental, stats.tableau_de_bord())
+        return incremental
+
+    def verifier_synthese(self):
+        colonnes = ('mois', 'statut_dossier', 'type_beneficier', 'organisme_employeur', 'section_cotisation',
+                    'nombre', 'montant')
+        ordre = ('mois', 'statut_dossier', 'organisme_employeur')
+        incremental = list(SyntheseSoins.objects.filter(nombre__gt=0).order_by(*ordre).values_list(*colonnes))
+        rapports_soins.reconstruire()
+        self.assertEqual(incremental, list(SyntheseSoins.objects.order_by(*ordre).values_list(*colonnes)))
+
+
+def rendu_simule(contenu=b'%PDF'):
+    """WeasyPrint remplacé : write_pdf écrit `contenu` dans la cible."""
+    return mock.patch.object(rendu_pdf.weasyprint().HTML, 'write_pdf',
+                             side_effect=lambda target, **kwargs: target.write(contenu))
+
+
+class MediaTemporaireMixin:
+    """MEDIA_ROOT (cache des PDF) dans un dossier temporaire, supprimé après chaque test."""
+
+    def setUp(self):
+        super().setUp()
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        reglages = override_settings(MEDIA_ROOT=self.media)
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+
+
+class DashboardStatsTests(TestCase):
+    def test_compteurs_suivent_les_ecritures(self):
+        a1 = creer_adherent()
+        a2 = creer_adherent(organisme_employeur='marsa_maroc', a_droit='sans_droit')
+        creer_soin(a1)
+        soin = creer_soin(a2, statut_dossier='rejet', date_soin=date(2025, 4, 1))
+        soin.statut_dossier = 'recu'
+        soin.save()
+        creer_soin(a1).delete()
+
+        incremental = stats.tableau_de_bord()
+        stats.reconstruire()
+        self.assertEqual(incremental, stats.tableau_de_bord())
+        self.assertEqual(incremental['total_adherents'], 2)
+        self.assertEqual(incremental['total_soins'], 2)
+        self.assertEqual(incremental['soins_recu'], 2)
+        self.assertEqual(incremental['adherents_par_organisme'], {'anp': 1, 'marsa_maroc': 1})
+
+    def test_suppression_adherent_en_cascade(self):
+        def supprimer(nombre_soins):
+            adherent = creer_adherent()
+            for _ in range(nombre_soins):
+                creer_soin(adherent)
+            with CaptureQueriesContext(connection) as requetes:
+                adherent.delete()
+            return len(requetes)
+
+        # Soins et cotisation supprimés sans être chargés : le coût ne dépend pas du nombre de soins
+        # (adhérent, compteurs, synthèse, journal, cascade : une requête par structure)
+        peu, beaucoup = supprimer(2), supprimer(60)
+        self.assertEqual(peu, beaucoup)
+        self.assertLessEqual(beaucoup, 30)
+        self.assertFalse(Soin.objects.exists())
+        self.assertEqual(Modification.objects.filter(table='soins', operation='suppression').count(), 62)
+
+        incremental = stats.tableau_de_bord()
+        stats.reconstruire()
+        self.assertEqual(incremental, stats.tableau_de_bord())
+        self.assertEqual(incremental['total_soins'], 0)
+        self.assertEqual(incremental['total_cotisations'], 0)
+        self.assertFalse(SyntheseSoins.objects.exclude(nombre=0).exists())
+
+    def test_suppression_ensembliste(self):
+        adherent = creer_adherent()
+        for mois in (3, 4, 4):
+            creer_soin(adherent, date_soin=date(2025, mois, 10))
+        creer_soin(adherent, statut_dossier='rejet').delete()
+        Soin.objects.filter(date_soin__month=4).delete()
+        Cotisation.objects.filter(adherent=adherent).delete()
+
+        incremental = stats.tableau_de_bord()
+        stats.reconstruire()
+        self.assertEqual(incremental, stats.tableau_de_bord())
+        self.assertEqual(incremental['soins_par_mois'], [{'mois': '2025-03', 'soins': 1, 'montant': '100.00'}])
+        self.assertEqual(EtatAdherent.objects.get(adherent=adherent).cotisation, 'non')
+
+    def test_endpoint_une_seule_requete(self):
+        creer_soin(creer_adherent())
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('dashboard-stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['soins_par_mois'],
+                         [{'mois': '2025-03', 'soins': 1, 'montant': '100.00'}])
+
+
+class TachePdfTests(TestCase):
+    def test_creation_soin_planifie_le_recu(self):
+        adherent = creer_adherent()
+        with mock.patch('api.taches_pdf.generer_document') as generer:
+            response = self.client.post('/api/soins/', {
+                'adherent_id': adherent.id, 'num_recu': 'R1', 'statut_dossier': 'recu',
+                'montant_dossier': '120.00', 'type_beneficier': 'Adherent',
+                'date_soin': '2025-03-01', 'date_fin_soin': '2025-03-02',
+            })
+            generer.assert_not_called()
+        self.assertEqual(response.status_code, 201)
+        tache = TachePdf.objects.get(pk=response.json()['tache_pdf'])
+        self.assertEqual((tache.type_document, tache.statut), ('recu', 'en_attente'))
+
+        with mock.patch('api.taches_pdf.generer_document', return_value='recu_pdfs/recu_R1.pdf'):
+            call_command('pdf_worker', processus=0, une_fois=True, stdout=mock.MagicMock())
+        tache.refresh_from_db()
+        self.assertEqual(tache.statut, 'termine')
+        response = self.client.get(f'/api/soins/{tache.objet_id}/pdf/')
+        self.assertEqual(response.json()['url'], f'/recu/{tache.objet_id}/')
+
+    def test_echec_replanifie_puis_abandonne(self):
+        tache = TachePdf.objects.create(type_document='carte', objet_id=1, max_tentatives=2)
+        with mock.patch('api.taches_pdf.generer_document', side_effect=OSError('police absente')):
+            self.assertTrue(taches_pdf.reclamer(tache))
+            taches_pdf.executer(tache)
+            self.assertEqual((tache.statut, tache.tentatives), ('en_attente', 1))
+            self.assertGreater(tache.disponible_le, tache.cree_le)
+
+            tache.refresh_from_db()
+            self.assertTrue(taches_pdf.reclamer(tache))
+            taches_pdf.executer(tache)
+        self.assertEqual(tache.statut, 'echec')
+        self.assertIn('police absente', tache.erreur)
+
+    def test_objet_supprime_sans_nouvelle_tentative(self):
+        tache = TachePdf.objects.create(type_document='recu', objet_id=999)
+        self.assertTrue(taches_pdf.reclamer(tache))
+        taches_pdf.executer(tache)
+        self.assertEqual((tache.statut, tache.tentatives), ('echec', 1))
+        self.assertIn('DoesNotExist', tache.erreur)
+
+    def test_reprise_des_abandonnees_pendant_le_service(self):
+        abandonnee = TachePdf.objects.create(type_document='carte', objet_id=1, statut='en_cours')
+        TachePdf.objects.filter(pk=abandonnee.pk).update(maj_le=timezone.now() - taches_pdf.DELAI_ABANDON * 2)
+        # File vide au premier tour ; intervalle nul : nouvelle reprise au tour suivant
+        with mock.patch('api.taches_pdf.reprendre_abandonnees', wraps=taches_pdf.reprendre_abandonnees) as reprise, \
+                mock.patch('api.management.commands.pdf_worker.Command._traiter_lot', side_effect=[0, KeyboardInterrupt]), \
+                mock.patch('api.management.commands.pdf_worker.time.sleep'):
+            call_command('pdf_worker', processus=0, reprise=0, stdout=mock.MagicMock())
+        self.assertEqual(reprise.call_count, 2)
+        abandonnee.refresh_from_db()
+        self.assertEqual(abandonnee.statut, 'en_attente')
+
+    def test_pool_casse_recree(self):
+        taches = [taches_pdf.planifier('carte', objet_id) for objet_id in (1, 2)]
+        rendu = Future()
+        rendu.set_exception(BrokenProcessPool('processus arrêté'))
+        casse, neuf = mock.MagicMock(), mock.MagicMock()
+        casse.submit.side_effect = [rendu, BrokenProcessPool('processus arrêté')]
+        with mock.patch('api.rendu_pdf.pool_processus', side_effect=[casse, neuf]) as pool_processus:
+            call_command('pdf_worker', processus=1, une_fois=True, stdout=mock.MagicMock())
+        self.assertEqual(pool_processus.call_count, 2)
+        casse.shutdown.assert_called_once()
+        neuf.shutdown.assert_called_once_with(wait=True)
+        for tache in taches:
+            tache.refresh_from_db()
+            # Remises en file avec une tentative comptée, pas laissées 'en_cours'
+            self.assertEqual((tache.statut, tache.tentatives), ('en_attente', 1))
+            self.assertIn('BrokenProcessPool', tache.erreur)
+
+    def test_planifier_ne_duplique_pas(self):
+        premiere = taches_pdf.planifier('recu', 42)
+        self.assertEqual(taches_pdf.planifier('recu', 42).pk, premiere.pk)
+
+
+class CachePdfTests(MediaTemporaireMixin, TestCase):
+    def test_recu_servi_depuis_le_cache_avec_etag(self):
+        soin = creer_soin(creer_adherent())
+        with rendu_simule() as write_pdf:
+            premier = self.client.get(f'/recu/{soin.id}/')
+            second = self.client.get(f'/recu/{soin.id}/')
+            etag = premier['ETag']
+            inchange = self.client.get(f'/recu/{soin.id}/', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(write_pdf.call_count, 1)
+
+            soin.montant_dossier = Decimal('250.00')
+            soin.save()
+            modifie = self.client.get(f'/recu/{soin.id}/', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(write_pdf.call_count, 2)
+
+        self.assertEqual(premier.status_code, 200)
+        self.assertEqual(b''.join(second.streaming_content), b'%PDF')
+        self.assertEqual(second['ETag'], etag)
+        self.assertEqual(inchange.status_code, 304)
+        self.assertEqual(modifie.status_code, 200)
+        self.assertNotEqual(modifie['ETag'], etag)
+        self.assertFalse(premier.has_header('Last-Modified'))
+
+    def test_acces_distinct_du_contenu(self):
+        soin = creer_soin(creer_adherent())
+        with rendu_simule():
+            etag = self.client.get(f'/recu/{soin.id}/')['ETag']
+        chemin = cache_pdf.chemin_cache(etag.strip('"'))
+        os.utime(chemin, (1000, 1000))
+
+        # Revalidation : dernier accès mis à jour, date du contenu inchangée
+        self.assertEqual(self.client.get(f'/recu/{soin.id}/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertGreater(os.stat(chemin).st_atime, 1000)
+        self.assertEqual(os.stat(chemin).st_mtime, 1000)
+
+    def test_pdf_ecrit_jamais_purge(self):
+        with rendu_simule(b'%PDF' * 100), \
+                override_settings(PDF_CACHE_TAILLE_MAX=10), mock.patch.object(cache_pdf, '_derniere_purge', 0):
+            chemin = cache_pdf.rendre('recu_template.html', '<p>recu</p>')
+        self.assertTrue(os.path.exists(chemin))
+
+    def test_purge_supprime_les_plus_anciens(self):
+        chemins = []
+        for i in range(3):
+            chemin = cache_pdf.chemin_cache(f'{i:02d}' + 'a' * 62)
+            os.makedirs(os.path.dirname(chemin), exist_ok=True)
+            with open(chemin, 'wb') as fichier:
+                fichier.write(b'x' * 100)
+            os.utime(chemin, (1000 + i, 1000 + i))
+            chemins.append(chemin)
+
+        self.assertEqual(cache_pdf.purger(taille_max=250, age_max=10 ** 12), 1)
+        self.assertEqual([os.path.exists(c) for c in chemins], [False, True, True])
+
+
+class RenduPdfTests(MediaTemporaireMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        rendu_pdf._feuilles.clear()
+        self.addCleanup(rendu_pdf._feuilles.clear)
+
+    def test_feuille_analysee_une_fois(self):
+        adherent = creer_adherent()
+        with mock.patch.object(rendu_pdf.weasyprint(), 'CSS') as css, rendu_simule() as write_pdf:
+            for _ in range(3):
+                self.client.get(f'/recu/{creer_soin(adherent).id}/')
+        self.assertEqual(css.call_count, 1)
+        self.assertIn('.recu-container', css.call_args.kwargs['string'])
+        self.assertEqual(write_pdf.call_count, 3)
+        self.assertEqual({appel.kwargs['font_config'] for appel in write_pdf.call_args_list},
+                         {rendu_pdf.polices()})
+        self.assertEqual(write_pdf.call_args.kwargs['stylesheets'], [css.return_value])
+
+
+class ExportRecusTests(MediaTemporaireMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        adherent = creer_adherent()
+        self.mars = [creer_soin(adherent), creer_soin(adherent, date_soin=date(2025, 3, 20))]
+        creer_soin(adherent, statut_dossier='rejet')
+        creer_soin(adherent, date_soin=date(2025, 4, 2))
+
+    def test_zip_filtre_par_mois_et_statut(self):
+        with rendu_simule():
+            response = self.client.get('/api/soins/export/?date_soin__year=2025&date_soin__month=3'
+                                       '&statut_dossier=recu')
+            contenu = b''.join(response.streaming_content)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        archive = zipfile.ZipFile(io.BytesIO(contenu))
+        self.assertEqual(archive.namelist(), [export_recus.nom_fichier(soin) for soin in self.mars])
+        self.assertEqual(archive.read(archive.namelist()[0]), b'%PDF')
+
+    def test_pdf_fusionne_un_seul_document(self):
+        with mock.patch.object(rendu_pdf.weasyprint(), 'HTML') as html:
+            html.return_value.render.return_value.pages = ['page']
+            response = self.client.get('/api/soins/export/?sortie=pdf&date_soin__month=3')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        polices = {appel.kwargs['font_config'] for appel in html.return_value.render.call_args_list}
+        self.assertEqual((html.return_value.render.call_count, len(polices)), (3, 1))
+        html.return_value.render.return_value.copy.assert_called_once_with(['page'] * 3)
+
+    @override_settings(EXPORT_RECUS_FUSION_MAX=2)
+    def test_pdf_fusionne_borne(self):
+        response = self.client.get('/api/soins/export/?sortie=pdf')
+        self.assertEqual(response.status_code, 400)
+
+
+@skipUnless(importlib.util.find_spec('pyarrow'), "pyarrow non installé")
+class ExportAnalytiqueTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('actuariat'))
+        self.adherent = creer_adherent()
+        self.soins = [creer_soin(self.adherent, montant_dossier=Decimal('12.34')), creer_soin(self.adherent)]
+
+    def test_parquet_types_et_incremental(self):
+        import pyarrow.parquet as pq
+
+        response = self.client.get('/api/soins/analytique/')
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(str(table.schema.field('montant_dossier').type), 'decimal128(10, 2)')
+        self.assertEqual(str(table.schema.field('date_soin').type), 'date32[day]')
+        self.assertEqual(table.column('montant_dossier')[0].as_py(), Decimal('12.34'))
+        self.assertEqual(table.num_rows, 2)
+
+        # Suite : lignes créées ou modifiées après le curseur du journal, anciens ids compris
+        nouveau = creer_soin(self.adherent)
+        self.soins[0].statut_dossier = 'rejet'
+        self.soins[0].save()
+        response = self.client.get(f"/api/soins/analytique/?curseur={response['X-Curseur']}")
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(table.column('id').to_pylist(), [self.soins[0].id, nouveau.id])
+        self.assertEqual(table.column('statut_dossier')[0].as_py(), 'rejet')
+        self.assertEqual(table.schema.metadata[b'curseur'].decode(), response['X-Curseur'])
+
+        response = self.client.get(f'/api/soins/analytique/?depuis={timezone.now().date().isoformat()}')
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(table.num_rows, 3)
+
+    def test_arrow_filtre(self):
+        import pyarrow as pa
+
+        creer_adherent(statut='retraite')
+        response = self.client.get('/api/adherents/analytique/?sortie=arrow&statut=actif')
+        table = pa.ipc.open_file(io.BytesIO(b''.join(response.streaming_content))).read_all()
+        self.assertEqual(table.column('cin').to_pylist(), [self.adherent.cin])
+
+    def test_authentification_et_parametres(self):
+        self.assertEqual(self.client.get('/api/soins/analytique/?sortie=csv').status_code, 400)
+        self.assertEqual(self.client.get('/api/soins/analytique/?depuis=hier').status_code, 400)
+        self.client.logout()
+        self.assertEqual(self.client.get('/api/soins/analytique/').status_code, 403)
+
+
+class PaginationTests(TestCase):
+    def test_pagination_par_curseur(self):
+        ids = [creer_adherent().id for _ in range(5)]
+        page = self.client.get('/api/adherents/', {'page_size': 2}).json()
+        self.assertEqual([a['id'] for a in page['results']], ids[:2])
+        suivante = self.client.get(page['next']).json()
+        self.assertEqual([a['id'] for a in suivante['results']], ids[2:4])
+
+    def test_export_ndjson(self):
+        adherent = creer_adherent()
+        for _ in range(3):
+            creer_soin(adherent)
+        response = self.client.get('/api/soins/', {'stream': '1', 'statut_dossier': 'recu'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lignes = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lignes), 3)
+        self.assertEqual(json.loads(lignes[0])['adherent']['id'], adherent.id)
+
+
+class QueryBudgetTests(TestCase):
+    """Le nombre de requêtes d'une liste ne doit pas dépendre du nombre de lignes."""
+
+    def compter_requetes(self, url):
+        with CaptureQueriesContext(connection) as requetes:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(requetes)
+
+    def verifier_budget(self, url, budget, ajouter):
+        ajouter()
+        une_ligne = self.compter_requetes(url)
+        for _ in range(10):
+            ajouter()
+        self.assertEqual(self.compter_requetes(url), une_ligne)
+        self.assertLessEqual(une_ligne, budget)
+
+    # Budget : la liste + la version des tables pour le cache des réponses (cache_reponses.py)
+    def test_liste_adherents(self):
+        self.verifier_budget('/api/adherents/', 2, creer_adherent)
+
+    def test_liste_cotisations(self):
+        self.verifier_budget('/api/cotisations/', 2, creer_adherent)
+
+    def test_liste_soins(self):
+        adherent = creer_adherent()
+        self.verifier_budget('/api/soins/', 2, lambda: creer_soin(adherent))
+
+
+class ListesLegeresTests(TestCase):
+    def setUp(self):
+        self.adherent = creer_adherent()
+        self.soin = creer_soin(self.adherent)
+
+    def test_fields_et_expand(self):
+        with CaptureQueriesContext(connection) as requetes:
+            response = self.client.get('/api/soins/?fields=id,montant_dossier,date_soin&expand=adherent')
+        # Version des tables (cache des réponses) + une requête avec jointure
+        self.assertEqual(len(requetes), 2)
+        self.assertEqual(response.json()['results'], [{
+            'id': self.soin.id, 'montant_dossier': '100.00', 'date_soin': '2025-03-10',
+            'adherent': {'id': self.adherent.id, 'nax': self.adherent.nax, 'nom': self.adherent.nom,
+                         'prenom': self.adherent.prenom, 'cin': self.adherent.cin, 'a_droit': 'ayant_droit'},
+        }])
+
+    def test_memes_valeurs_que_le_serializer(self):
+        complet = self.client.get('/api/adherents/').json()['results'][0]
+        champs = ['nax', 'cin', 'date_naissance', 'salaire', 'a_droit']
+        leger = self.client.get('/api/adherents/', {'fields': ','.join(champs)}).json()['results'][0]
+        self.assertEqual(leger, {champ: complet[champ] for champ in champs})
+
+        cotisation = self.client.get('/api/cotisations/').json()['results'][0]
+        compacte = self.client.get('/api/cotisations/?expand=adherent').json()['results'][0]
+        self.assertEqual(compacte['nax'], cotisation['nax'])
+        self.assertEqual(compacte['adherent']['cin'], self.adherent.cin)
+
+    def test_compact(self):
+        ligne = self.client.get('/api/adherents/?compact=1').json()['results'][0]
+        self.assertEqual(list(ligne), ['id', 'nax', 'nom', 'prenom', 'cin', 'statut', 'a_droit', 'organisme_employeur'])
+
+    def test_champ_inconnu(self):
+        self.assertEqual(self.client.get('/api/soins/?fields=id,rib').status_code, 400)
+        self.assertEqual(self.client.get('/api/adherents/?expand=adherent').status_code, 400)
+
+
+class CacheReponsesTests(TestCase):
+    def setUp(self):
+        self.adherent = creer_adherent()
+        self.soin = creer_soin(self.adherent)
+
+    def get(self, url, **entetes):
+        with CaptureQueriesContext(connection) as requetes:
+            response = self.client.get(url, **entetes)
+        return response, len(requetes)
+
+    def test_etag_et_cache(self):
+        for url in ('/api/soins/', f'/api/soins/{self.soin.id}/'):
+            premiere, _ = self.get(url)
+            etag = premiere['ETag']
+            inchangee, requetes = self.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual((inchangee.status_code, requetes), (304, 1))
+            # Sans ETag : données servies par le cache, seule la version est lue
+            en_cache, requetes = self.get(url)
+            self.assertEqual((en_cache.json(), requetes), (premiere.json(), 1))
+
+    def test_ecriture_invalide(self):
+        premiere, _ = self.get('/api/soins/')
+        # Le soin imbrique l'adhérent : une écriture sur l'adhérent change la réponse
+        self.adherent.nom = 'Renomme'
+        self.adherent.save()
+        response, _ = self.get('/api/soins/', HTTP_IF_NONE_MATCH=premiere['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], premiere['ETag'])
+        self.assertEqual(response.json()['results'][0]['adherent']['nom'], 'Renomme')
+
+        self.soin.delete()
+        self.assertEqual(self.client.get('/api/soins/').json()['results'], [])
+
+    @override_settings(ALLOWED_HOSTS=['interne', 'public.example'])
+    def test_cle_par_hote_et_schema(self):
+        creer_soin(self.adherent)
+        suivants = {
+            self.client.get('/api/soins/?page_size=1', HTTP_HOST=hote, secure=secure).json()['next']
+            for hote, secure in (('interne', False), ('public.example', False), ('public.example', True))
+        }
+        self.assertEqual({lien.split('/api/')[0] for lien in suivants},
+                         {'http://interne', 'http://public.example', 'https://public.example'})
+
+
+class RechercheTests(TestCase):
+    def test_recherche_sans_accents_par_prefixe(self):
+        helene = creer_adherent(nom='El Amrani', prenom='Hélène')
+        creer_adherent(nom='Amrani', prenom='Karim')
+        creer_adherent(nom='Tazi', prenom='Omar')
+
+        resultats = self.client.get('/api/adherents/', {'search': 'amra hele'}).json()['results']
+        self.assertEqual([a['id'] for a in resultats], [helene.id])
+
+        resultats = self.client.get('/api/adherents/', {'search': 'amrani'}).json()['results']
+        self.assertEqual(len(resultats), 2)
+
+    def test_correspondance_exacte_en_premier(self):
+        exact = creer_adherent(nom='Rami')
+        creer_adherent(nom='Ramirez')
+        resultats = self.client.get('/api/adherents/', {'search': 'rami'}).json()['results']
+        self.assertEqual(resultats[0]['id'], exact.id)
+
+    def test_resultats_classes_pagines(self):
+        exact = creer_adherent(nom='Rami')
+        autres = {creer_adherent(nom='Ramirez').id for _ in range(4)}
+        for params in ({}, {'compact': 1}):
+            ids, pages = [], []
+            url, donnees = '/api/adherents/', {'search': 'rami', 'page_size': 2, **params}
+            while url:
+                page = self.client.get(url, donnees).json()
+                pages.append(page)
+                ids += [a['id'] for a in page['results']]
+                url, donnees = page['next'], None
+            self.assertEqual([len(page['results']) for page in pages], [2, 2, 1])
+            self.assertEqual((ids[0], set(ids[1:])), (exact.id, autres))
+            self.assertIsNone(pages[1]['previous'])
+
+    def test_recherche_soins_et_reindexation(self):
+        adherent = creer_adherent(nom='Bennani')
+        soin = creer_soin(adherent)
+        adherent.nom = 'Lahlou'
+        adherent.save()
+
+        self.assertEqual(self.client.get('/api/soins/', {'search': 'bennani'}).json()['results'], [])
+        resultats = self.client.get('/api/soins/', {'search': 'lahlou'}).json()['results']
+        self.assertEqual([s['id'] for s in resultats], [soin.id])
+
+
+class LookupTests(TestCase):
+    def setUp(self):
+        recherche.cache_suggestions.clear()
+
+    def test_projection_compacte_et_cache(self):
+        adherent = creer_adherent(nom='Tazi', prenom='Salma')
+        response = self.client.get('/api/adherents/lookup/', {'q': adherent.nax})
+        self.assertEqual(response.json(), [{
+            'id': adherent.id, 'nax': adherent.nax, 'nom': 'Tazi', 'prenom': 'Salma', 'a_droit': 'ayant_droit',
+        }])
+        with self.assertNumQueries(0):
+            self.client.get('/api/adherents/lookup/', {'q': adherent.nax})
+
+    def test_invalidation_par_signal(self):
+        adherent = creer_adherent(nom='Tazi')
+        self.assertEqual(len(self.client.get('/api/adherents/lookup/', {'q': 'taz'}).json()), 1)
+        adherent.a_droit = 'sans_droit'
+        adherent.save()
+        resultat = self.client.get('/api/adherents/lookup/', {'q': 'taz'}).json()
+        self.assertEqual(resultat[0]['a_droit'], 'sans_droit')
+
+
+class ImportAdherentsTests(TestCase):
+    ENTETE = ('nom;prenom;date_naissance;cin;sexe;date_recrutement;statut;a_droit;numero_tel;'
+              'rib;ville;adresse;salaire;organisme_employeur;section_cotisation\n')
+
+    def ligne(self, cin, a_droit='ayant_droit', date_naissance='01/02/1985'):
+        return (f'Alaoui;Karim;{date_naissance};{cin};homme;;actif;{a_droit};0600000000;'
+                f'{"0" * 24};Agadir;Port;4500.00;marsa_maroc;marsa_maroc\n')
+
+    def test_import_csv(self):
+        creer_adherent(cin='EXISTE')
+        contenu = (self.ENTETE + self.ligne('AB1') + self.ligne('AB2', a_droit='sans_droit')
+                   + self.ligne('AB1') + self.ligne('EXISTE') + self.ligne('AB3', date_naissance='hier'))
+        fichier = SimpleUploadedFile('adherents.csv', contenu.encode('utf-8'), content_type='text/csv')
+
+        response = self.client.post('/api/adherents/import/', {'fichier': fichier})
+        rapport = response.json()
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((rapport['lignes'], rapport['crees']), (5, 2))
+        self.assertEqual([e['ligne'] for e in rapport['erreurs']], [4, 5, 6])
+        ab1 = Adherent.objects.get(cin='AB1')
+        self.assertEqual(ab1.nax, str(ab1.id).zfill(6))
+        self.assertEqual(ab1.cotisations.get().cotisation, 'oui')
+        self.assertEqual(Adherent.objects.get(cin='AB2').cotisations.get().date_debut, None)
+        self.assertEqual(TachePdf.objects.filter(type_document='carte').count(), 2)
+
+        incremental = stats.tableau_de_bord()
+        stats.reconstruire()
+        self.assertEqual(incremental, stats.tableau_de_bord())
+        self.assertEqual(self.client.get('/api/adherents/', {'search': 'alaoui'}).json()['results'][0]['cin'],
+                         'AB2')
+
+
+class RenouvellementTests(TestCase):
+    def setUp(self):
+        self.anp = creer_adherent(section_cotisation='anp')
+        self.marsa = creer_adherent(section_cotisation='marsa_maroc')
+        # Cotisations échues au 1er février 2025
+        Cotisation.objects.update(date_debut=date(2024, 12, 1), date_fin=date(2025, 1, 1))
+
+    def test_expiration_dry_run_puis_reelle(self):
+        url = '/api/cotisations/renouvellement/'
+        donnees = {'operation': 'expirer', 'section': 'anp', 'date': '2025-02-01', 'dry_run': True}
+        rapport = self.client.post(url, donnees, content_type='application/json').json()
+        self.assertEqual((rapport['cotisations'], rapport['adherents']), (1, 1))
+        self.assertEqual(Cotisation.objects.filter(cotisation='non').count(), 0)
+
+        donnees['dry_run'] = False
+        # Nombre de requêtes fixe : 3 UPDATE, compteurs (créés au premier passage), journal (2 lectures, 2 INSERT)
+        with CaptureQueriesContext(connection) as requetes:
+            self.client.post(url, donnees, content_type='application/json')
+        self.assertLessEqual(len(requetes), 19)
+        self.anp.refresh_from_db()
+        self.marsa.refresh_from_db()
+        self.assertEqual((self.anp.a_droit, self.marsa.a_droit), ('sans_droit', 'ayant_droit'))
+        self.assertEqual(self.anp.cotisations.get().cotisation, 'non')
+
+        incremental = stats.tableau_de_bord()
+        stats.reconstruire()
+        self.assertEqual(incremental, stats.tableau_de_bord())
+
+    def test_renouvellement(self):
+        call_command('renouveler_cotisations', section='marsa_maroc', date=date(2025, 2, 1),
+                     stdout=mock.MagicMock())
+        self.assertEqual(self.marsa.cotisations.get().date_fin, date(2025, 3, 1))
+        self.assertEqual(self.anp.cotisations.get().date_fin, date(2025, 1, 1))
+
+
+class AdhesionTests(ReconstructionMixin, TestCase):
+    """Droit de l'adhérent et cotisation : chaque ligne écrite une fois, sans relecture."""
+
+    def setUp(self):
+        # Compteurs déjà présents : le budget ne compte pas leur première création
+        self.avec_droit = creer_adherent()
+        self.sans_droit = creer_adherent(a_droit='sans_droit')
+
+    def donnees_adherent(self, **kwargs):
+        donnees = {
+            'nom': 'Berrada', 'prenom': 'Sara', 'date_naissance': '1985-06-01', 'cin': 'JK123456',
+            'sexe': 'femme', 'date_recrutement': '2019-09-01', 'statut': 'actif', 'a_droit': 'ayant_droit',
+            'numero_tel': '0611111111', 'rib': '1' * 24, 'ville': 'Agadir', 'adresse': 'Port d\'Agadir',
+            'salaire': '6000.00', 'organisme_employeur': 'anp', 'section_cotisation': 'anp',
+        }
+        donnees.update(kwargs)
+        return donnees
+
+    def requetes(self, methode, url, donnees):
+        with CaptureQueriesContext(connection) as requetes:
+            response = getattr(self.client, methode)(url, donnees, content_type='application/json')
+        self.assertLess(response.status_code, 300, response.content)
+        return [q['sql'] for q in requetes]
+
+    def ecritures(self, requetes, table):
+        return [sql for sql in requetes if sql.startswith(('INSERT', 'UPDATE', 'DELETE')) and f'"{table}"' in sql]
+
+    def verifier_budget(self, requetes, total, **ecritures):
+        """Budgets (maximums) : requêtes au total et écritures par table, pour voir d'où vient un dépassement."""
+        self.assertLessEqual(len(requetes), total, '\n'.join(requetes))
+        for table, maximum in ecritures.items():
+            self.assertLessEqual(len(self.ecritures(requetes, f'api_{table}')), maximum, table)
+
+    def test_creation(self):
+        requetes = self.requetes('post', '/api/adherents/', self.donnees_adherent())
+        # Unicité CIN, adhérent (INSERT + NAX), cotisation, compteurs (5 adhérent + 2 cotisation),
+        # index de recherche (DELETE + INSERT, savepoint), situation (lecture + upsert),
+        # tâche carte (recherche + INSERT), journal (adhérent + cotisation)
+        self.verifier_budget(requetes, 21, adherent=2, cotisation=1, statistique=7, motrecherche=2,
+                             etatadherent=1, tachepdf=1, modification=2)
+        adherent = Adherent.objects.get(cin='JK123456')
+        cotisation = adherent.cotisations.get()
+        self.assertEqual(cotisation.cotisation, 'oui')
+        self.assertEqual(cotisation.date_debut, date.today())
+        self.assertEqual(len(self.ecritures(requetes, 'api_cotisation')), 1)
+        self.verifier_compteurs()
+
+    def test_nax_pose_avant_les_autres_receveurs(self):
+        vus = []
+
+        def receveur(sender, instance, **kwargs):
+            vus.append(instance.nax)
+
+        post_save.connect(receveur, sender=Adherent)
+        self.addCleanup(post_save.disconnect, receveur, sender=Adherent)
+        adherent = creer_adherent()
+        self.assertEqual(vus, [f'{adherent.id:06d}'])
+        self.assertEqual(EtatAdherent.objects.get(pk=adherent.pk).nax, adherent.nax)
+        self.assertTrue(adherent.mots_recherche.filter(mot=adherent.nax).exists())
+
+    def test_modification_du_droit(self):
+        url = f'/api/adherents/{self.avec_droit.id}/'
+        requetes = self.requetes('patch', url, {'a_droit': 'sans_droit'})
+        # Lecture de l'adhérent puis de sa cotisation (aucune relecture), 2 UPDATE,
+        # compteurs (2 par côté), situation (lecture + upsert), journal (adhérent + cotisation)
+        self.verifier_budget(requetes, 12, statistique=4, etatadherent=1, modification=2)
+        cotisation = self.avec_droit.cotisations.get()
+        self.assertEqual((cotisation.cotisation, cotisation.date_fin), ('non', None))
+        self.assertEqual(len(self.ecritures(requetes, 'api_adherent')), 1)
+        self.assertEqual(len(self.ecritures(requetes, 'api_cotisation')), 1)
+        self.verifier_compteurs()
+
+    def test_bascule_cotisation(self):
+        cotisation = self.sans_droit.cotisations.get()
+        requetes = self.requetes('patch', f'/api/cotisations/{cotisation.id}/',
+                                 {'cotisation': 'oui', 'date_debut': '2025-02-01'})
+        # Lecture (jointure), 2 UPDATE, compteurs (2 par côté), situation (lecture + upsert),
+        # journal (cotisation + adhérent)
+        self.verifier_budget(requetes, 11, statistique=4, etatadherent=1, modification=2)
+        self.sans_droit.refresh_from_db()
+        self.assertEqual(self.sans_droit.a_droit, 'ayant_droit')
+        self.assertEqual(len(self.ecritures(requetes, 'api_adherent')), 1)
+        self.assertEqual(len(self.ecritures(requetes, 'api_cotisation')), 1)
+        self.verifier_compteurs()
+
+
+class EtatAdherentTests(TestCase):
+    def setUp(self):
+        aujourd_hui = date.today()
+        self.a_jour = creer_adherent(organisme_employeur='anp')
+        self.expire_bientot = creer_adherent(organisme_employeur='marsa_maroc')
+        self.echu = creer_adherent(organisme_employeur='anp')
+        self.sans_droit = creer_adherent(a_droit='sans_droit')
+        for adherent, date_fin in ((self.expire_bientot, aujourd_hui + timedelta(days=3)),
+                                   (self.echu, aujourd_hui - timedelta(days=1))):
+            cotisation = adherent.cotisations.get()
+            cotisation.date_debut = date_fin - relativedelta(months=1)
+            cotisation.save()
+
+    def ids(self, params):
+        response = self.client.get('/api/adherents/etat/', params)
+        self.assertEqual(response.status_code, 200)
+        return {ligne['adherent'] for ligne in response.json()['results']}
+
+    def test_suivie_par_les_ecritures(self):
+        cotisation = self.sans_droit.cotisations.get()
+        self.client.patch(f'/api/cotisations/{cotisation.id}/', {'cotisation': 'oui', 'date_debut': str(date.today())},
+                          content_type='application/json')
+        self.echu.nom = 'Renomme'
+        self.echu.save()
+        incremental = list(EtatAdherent.objects.order_by('adherent_id').values())
+        etat_adherents.reconstruire()
+        self.assertEqual(incremental, list(EtatAdherent.objects.order_by('adherent_id').values()))
+        self.assertEqual(EtatAdherent.objects.get(pk=self.sans_droit.pk).a_droit, 'ayant_droit')
+        self.assertEqual(EtatAdherent.objects.get(pk=self.echu.pk).nax, self.echu.nax)
+
+    def test_filtres(self):
+        self.assertEqual(self.ids({'a_jour': '1'}), {self.a_jour.id, self.expire_bientot.id})
+        self.assertEqual(self.ids({'a_jour': '1', 'organisme': 'anp'}), {self.a_jour.id})
+        self.assertEqual(self.ids({'expire_dans': '7'}), {self.expire_bientot.id})
+        self.assertEqual(self.ids({'echus': '1'}), {self.echu.id})
+        self.assertEqual(self.ids({'a_jour': '0'}), {self.echu.id, self.sans_droit.id})
+
+    def test_renouvellement_et_eligibilite(self):
+        renouvellement.expirer()
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/adherents/{self.echu.id}/eligibilite/')
+        self.assertEqual((response.json()['a_jour'], response.json()['a_droit']), (False, 'sans_droit'))
+
+        renouvellement.renouveler(date_debut=date.today())
+        self.assertTrue(self.client.get(f'/api/adherents/{self.a_jour.id}/eligibilite/').json()['a_jour'])
+        self.assertEqual(self.ids({'echus': '1'}), set())
+
+
+class BalayageTests(TestCase):
+    def setUp(self):
+        self.jour = date(2025, 3, 10)
+        self.adherents = {}
+        for nom, date_fin in (('echu', date(2025, 3, 9)), ('jour', date(2025, 3, 10)), ('plus_tard', date(2025, 3, 17))):
+            adherent = creer_adherent()
+            Cotisation.objects.filter(adherent=adherent).update(
+                date_debut=date_fin - relativedelta(months=1), date_fin=date_fin)
+            self.adherents[nom] = adherent
+
+    def statuts(self):
+        return {nom: a.cotisations.get().cotisation for nom, a in self.adherents.items()}
+
+    def test_incremental_et_idempotent(self):
+        rapport = balayage.balayer(self.jour)
+        self.assertEqual((rapport['depuis'], rapport['cotisations']), (None, 1))
+        self.assertEqual(self.statuts(), {'echu': 'non', 'jour': 'oui', 'plus_tard': 'oui'})
+
+        # Même jour : seule la marque est lue
+        with CaptureQueriesContext(connection) as requetes:
+            self.assertEqual(balayage.balayer(self.jour)['cotisations'], 0)
+        self.assertFalse([q for q in requetes if 'api_cotisation' in q['sql']])
+
+        rapport = balayage.balayer(self.jour + timedelta(days=8))
+        self.assertEqual((rapport['depuis'], rapport['cotisations']), (self.jour, 2))
+        self.assertEqual(set(self.statuts().values()), {'non'})
+        self.assertFalse(EtatAdherent.objects.filter(a_droit='ayant_droit').exists())
+
+    def test_ecriture_sous_la_marque_expiree_au_passage_suivant(self):
+        balayage.balayer(self.jour)
+        # Date de début ancienne saisie par l'API : date_fin déjà sous la marque
+        cotisation = self.adherents['plus_tard'].cotisations.get()
+        response = self.client.patch(f'/api/cotisations/{cotisation.id}/', {
+            'date_debut': (self.jour - timedelta(days=60)).isoformat(),
+            'date_fin': (self.jour - timedelta(days=30)).isoformat(),
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(balayage.balayer(self.jour + timedelta(days=1))['cotisations'], 2)
+        self.assertEqual(self.statuts(), {'echu': 'non', 'jour': 'non', 'plus_tard': 'non'})
+        self.assertEqual(EtatAdherent.objects.get(adherent=self.adherents['plus_tard']).a_droit, 'sans_droit')
+
+    def test_compaction_quotidienne_du_journal(self):
+        cotisation = self.adherents['plus_tard'].cotisations.get()
+        for _ in range(3):
+            cotisation.save()
+        call_command('balayer_cotisations', date=self.jour, stdout=mock.MagicMock())
+        self.assertEqual(Modification.objects.filter(table='cotisations', objet_id=cotisation.id).count(), 1)
+
+        # Une seule compaction par jour
+        cotisation.save()
+        call_command('balayer_cotisations', date=self.jour, stdout=mock.MagicMock())
+        self.assertEqual(Modification.objects.filter(table='cotisations', objet_id=cotisation.id).count(), 2)
+        call_command('balayer_cotisations', date=self.jour + timedelta(days=1), stdout=mock.MagicMock())
+        self.assertEqual(Modification.objects.filter(table='cotisations', objet_id=cotisation.id).count(), 1)
+
+    def test_complet_rattrape_une_date_anterieure(self):
+        balayage.balayer(self.jour)
+        # Date de fin reculée sous la marque par un UPDATE direct, hors journal : hors de l'intervalle incrémental
+        Cotisation.objects.filter(adherent=self.adherents['plus_tard']).update(date_fin=date(2025, 3, 1))
+        self.assertEqual(balayage.balayer(self.jour + timedelta(days=1))['cotisations'], 1)
+        self.assertEqual(self.statuts()['plus_tard'], 'oui')
+
+        call_command('balayer_cotisations', date=self.jour + timedelta(days=1), complet=True,
+                     stdout=mock.MagicMock())
+        self.assertEqual(self.statuts()['plus_tard'], 'non')
+
+
+class RapportsSoinsTests(ReconstructionMixin, TestCase):
+    def setUp(self):
+        self.anp = creer_adherent(organisme_employeur='anp', section_cotisation='anp')
+        self.marsa = creer_adherent(organisme_employeur='marsa_maroc', section_cotisation='marsa_maroc')
+        creer_soin(self.anp, montant_dossier=Decimal('100.00'), date_soin=date(2025, 1, 15))
+        creer_soin(self.anp, montant_dossier=Decimal('300.00'), date_soin=date(2025, 2, 3))
+        creer_soin(self.marsa, montant_dossier=Decimal('50.00'), date_soin=date(2025, 2, 20), statut_dossier='rejet')
+
+    def test_suit_les_ecritures(self):
+        soin = Soin.objects.get(montant_dossier=Decimal('300.00'))
+        soin.date_soin = date(2025, 3, 1)
+        soin.montant_dossier = Decimal('320.00')
+        soin.save()
+        Soin.objects.get(statut_dossier='rejet').delete()
+        self.marsa.organisme_employeur = 'modep'
+        self.marsa.save()
+        creer_soin(self.marsa)
+        self.anp.section_cotisation = 'modep'
+        self.anp.save()
+        self.verifier_synthese()
+
+    def test_endpoint(self):
+        response = self.client.get('/api/soins/rapport/', {
+            'debut': '2025-01', 'fin': '2025-12', 'grouper': 'organisme', 'statut': 'recu'})
+        self.assertEqual(response.status_code, 200)
+        donnees = response.json()
+        self.assertEqual(donnees['lignes'], [
+            {'mois': '2025-01', 'organisme_employeur': 'anp', 'nombre': 1, 'montant': '100.00', 'moyenne': '100.00'},
+            {'mois': '2025-02', 'organisme_employeur': 'anp', 'nombre': 1, 'montant': '300.00', 'moyenne': '300.00'},
+        ])
+        self.assertEqual(donnees['total'], {'nombre': 2, 'montant': '400.00', 'moyenne': '200.00'})
+
+        annuel = self.client.get('/api/soins/rapport/', {'debut': '2025-01', 'fin': '2025-12',
+                                                         'periode': 'trimestre'}).json()
+        self.assertEqual(annuel['lignes'], [
+            {'annee': 2025, 'trimestre': 1, 'nombre': 3, 'montant': '450.00', 'moyenne': '150.00'}])
+        self.assertEqual(self.client.get('/api/soins/rapport/', {'grouper': 'inconnu'}).status_code, 400)
+
+
+class ModificationsTests(TestCase):
+    def setUp(self):
+        self.adherent = creer_adherent()
+        self.soins = [creer_soin(self.adherent), creer_soin(self.adherent)]
+
+    def delta(self, liste, curseur, **params):
+        return self.client.get(f'/api/{liste}/delta/', {'curseur': curseur, **params}).json()
+
+    def test_delta_modifies_et_supprimes(self):
+        curseur = self.client.get('/api/soins/delta/').json()['curseur']
+        self.assertEqual(self.delta('soins', curseur)['modifies'], [])
+
+        self.soins[0].montant_dossier = Decimal('150.00')
+        self.soins[0].save()
+        self.soins[0].save()
+        supprime = self.soins[1].id
+        self.soins[1].delete()
+        nouveau = creer_soin(self.adherent)
+        donnees = self.delta('soins', curseur)
+        self.assertEqual([soin['id'] for soin in donnees['modifies']], [self.soins[0].id, nouveau.id])
+        self.assertEqual(donnees['modifies'][0]['montant_dossier'], '150.00')
+        self.assertEqual(donnees['supprimes'], [supprime])
+        self.assertFalse(donnees['suite'])
+        self.assertEqual(self.delta('soins', donnees['curseur'])['modifies'], [])
+
+        # Par pages : la limite atteinte, le client rappelle avec le nouveau curseur
+        premiere = self.delta('soins', curseur, limite=2)
+        self.assertTrue(premiere['suite'])
+        suivante = self.delta('soins', premiere['curseur'], limite=2)
+        self.assertEqual(suivante['supprimes'], [supprime])
+
+    @override_settings(MODIFICATIONS_MARGE=60)
+    def test_curseur_tenu_avant_la_marge(self):
+        Modification.objects.update(date=timezone.now() - timedelta(minutes=5))
+        curseur = modifications.curseur_actuel()
+        self.assertEqual(curseur, Modification.objects.latest('id').id)
+
+        self.soins[0].save()
+        # Écriture récente : renvoyée, mais le curseur ne la dépasse pas (ids validés plus tard possibles)
+        self.assertEqual(modifications.curseur_actuel(), curseur)
+        donnees = self.delta('soins', curseur)
+        self.assertEqual([soin['id'] for soin in donnees['modifies']], [self.soins[0].id])
+        self.assertEqual((donnees['curseur'], donnees['suite']), (curseur, False))
+
+        Modification.objects.update(date=timezone.now() - timedelta(minutes=5))
+        donnees = self.delta('soins', curseur)
+        self.assertEqual(donnees['curseur'], Modification.objects.latest('id').id)
+
+    def test_filtres_de_liste_ignores(self):
+        curseur = modifications.curseur_actuel()
+        cotisation = self.adherent.cotisations.get()
+        cotisation.cotisation = 'non'
+        cotisation.save()
+        # ?cotisation=oui filtre la liste, pas le delta : la cotisation passée à 'non' n'est pas supprimée
+        donnees = self.delta('cotisations', curseur, cotisation='oui')
+        self.assertEqual([c['id'] for c in donnees['modifies']], [cotisation.id])
+        self.assertEqual(donnees['supprimes'], [])
+
+    def test_chemins_ensemblistes_et_compactage(self):
+        curseur = modifications.curseur_actuel()
+        Cotisation.objects.update(date_debut=date(2024, 12, 1), date_fin=date(2025, 1, 1))
+        renouvellement.expirer(date_reference=date(2025, 2, 1))
+        self.assertEqual([a['id'] for a in self.delta('adherents', curseur)['modifies']], [self.adherent.id])
+        self.assertEqual(len(self.delta('cotisations', curseur)['modifies']), 1)
+
+        adherent_id = self.adherent.id
+        self.adherent.delete()
+        self.assertEqual(self.delta('adherents', curseur)['supprimes'], [adherent_id])
+        self.assertEqual(len(self.delta('soins', curseur)['supprimes']), 2)
+
+        modifications.compacter()
+        self.assertEqual(Modification.objects.filter(table='adherents').count(), 1)
+        self.assertEqual(self.delta('adherents', 0)['supprimes'], [adherent_id])
+
+
+class BenchmarksTests(ReconstructionMixin, TestCase):
+    def test_suite_et_comparaison(self):
+        sortie, stdout = os.path.join(tempfile.mkdtemp(), 'bench.json'), io.StringIO()
+        self.addCleanup(shutil.rmtree, os.path.dirname(sortie), ignore_errors=True)
+        with rendu_simule():
+            call_command('bench_api', adherents=20, soins=50, repetitions=2, sortie=sortie, stdout=stdout)
+        with open(sortie, encoding='utf-8') as fichier:
+            resultats = json.load(fichier)
+        self.assertEqual(set(resultats['scenarios']), set(benchmarks.SCENARIOS))
+        self.assertEqual(resultats['scenarios']['dashboard']['requetes'], 1)
+        # Données du benchmark annulées
+        self.assertEqual(Soin.objects.count(), 0)
+        # La référence versionnée (échelle 10k) ne se compare pas à ce petit jeu
+        self.assertIn('Référence non comparable (adherents 1000 -> 20', stdout.getvalue())
+
+        reference = json.loads(json.dumps(resultats))
+        reference['scenarios']['dashboard']['requetes'] = 0
+        reference['scenarios']['liste_soins']['p50_ms'] = resultats['scenarios']['liste_soins']['p50_ms'] / 10 - 1
+        regressions = benchmarks.comparer(resultats, reference)
+        self.assertEqual({(r['scenario'], r['mesure']) for r in regressions},
+                         {('dashboard', 'requetes'), ('liste_soins', 'p50_ms')})
+
+    def test_donnees_comme_l_import(self):
+        adherents = donnees_synthetiques.creer_adherents(30, lot=20)
+        donnees_synthetiques.creer_soins(adherents, 60, lot=40)
+        self.assertFalse(Adherent.objects.filter(nax__isnull=True).exists())
+        self.assertEqual(Adherent.objects.get(id=adherents[0].id).nax, adherents[0].nax)
+        self.assertEqual(TachePdf.objects.count(), 0)
+        self.assertEqual(self.verifier_compteurs()['total_adherents'], 30)
+
+
+class MesuresTests(TestCase):
+    def setUp(self):
+        instrumentation.registre.vider()
+        dossier = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, dossier)
+        self.fichier = os.path.join(dossier, 'requetes.jsonl')
+        self.dossier = os.path.join(dossier, 'processus')
+        reglages = override_settings(MESURES_FICHIER=self.fichier, MESURES_DOSSIER=self.dossier,
+                                     MESURES_JETON='jeton-collecteur')
+        reglages.enable()
+        self.addCleanup(reglages.disable)
+
+    def test_requete_mesuree(self):
+        creer_soin(creer_adherent())
+        self.client.get('/api/soins/')
+        self.client.get('/api/soins/', {'compact': 1})
+
+        with open(self.fichier, encoding='utf-8') as fichier:
+            lignes = [json.loads(ligne) for ligne in fichier]
+        self.assertEqual([ligne['route'] for ligne in lignes], ['GET soin-list'] * 2)
+        self.assertEqual(lignes[0]['sql'], 2)
+        self.assertIn('serialisation', lignes[0]['phases_ms'])
+
+        texte = self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer jeton-collecteur').content.decode()
+        self.assertIn('api_requete_duree_secondes_count{route="GET soin-list"} 2', texte)
+        self.assertIn('api_requetes_total{route="GET soin-list",statut="200"} 2', texte)
+        self.assertIn('api_sql_requetes_total{route="GET soin-list"} 4', texte)
+        self.assertIn('api_phase_total{route="GET soin-list",phase="serialisation"} 2', texte)
+
+    def test_agregats_de_tous_les_processus(self):
+        self.client.get('/api/soins/')
+        instrumentation.publier(forcer=True)
+        # Fichier publié par un autre worker
+        with open(os.path.join(self.dossier, '4242-autre.json'), 'w', encoding='utf-8') as fichier:
+            json.dump(instrumentation.registre.etat(), fichier)
+
+        self.client.force_login(User.objects.create_user('exploitation', is_staff=True))
+        texte = self.client.get('/api/metrics/').content.decode()
+        self.assertIn('api_requetes_total{route="GET soin-list",statut="200"} 2', texte)
+
+    def test_acces_reserve(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+        self.assertEqual(self.client.get('/api/metrics/', HTTP_AUTHORIZATION='Bearer autre').status_code, 403)
+        self.client.force_login(User.objects.create_user('agent'))
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+    def test_n_plus_un(self):
+        for _ in range(3):
+            creer_soin(creer_adherent())
+        mesure = instrumentation.Mesure()
+        with connection.execute_wrapper(mesure):
+            noms = [soin.adherent.nom for soin in Soin.objects.all()]
+        self.assertEqual((len(noms), mesure.requetes), (3, 4))
+        (empreinte, nombre), = mesure.n_plus_un(seuil=3)
+        self.assertEqual(nombre, 3)
+        self.assertIn('FROM "api_adherent"', empreinte)
+        self.assertEqual(instrumentation.empreinte_sql("SELECT 1 FROM t WHERE id IN (%s, %s) AND c = 'x'"),
+                         'SELECT ? FROM t WHERE id IN (...) AND c = ?')
+
+    def test_phase_hors_requete(self):
+        with instrumentation.phase('pdf'):
+            pass
+        self.assertIn('api_phase_total{route="-",phase="pdf"} 1', instrumentation.registre.prometheus())
+
+
+@skipUnless(connection.vendor == 'sqlite', "Réglages propres à SQLite")
+class ProfilSqliteTests(TestCase):
+    def test_pragmas_appliques(self):
+        with connection.cursor() as curseur:
+            curseur.execute('PRAGMA synchronous')
+            self.assertEqual(curseur.fetchone()[0], 1)  # NORMAL
+            curseur.execute('PRAGMA temp_store')
+            self.assertEqual(curseur.fetchone()[0], 2)  # MEMORY
+
+
+class DemarrageTests(SimpleTestCase):
+    """Chargement d'un worker API (application WSGI et URLs) dans un processus neuf."""
+    MODULES_DIFFERES = ('weasyprint', 'pyarrow', 'openpyxl', 'concurrent.futures.process')
+    BUDGET_API_MS = 200  # import des modules api.* eux-mêmes, hors Django et DRF
+
+    def test_imports_differes_et_budget(self):
+        script = (
+            "import json, sys, django; django.setup(); "
+            "from importlib import import_module; from django.conf import settings; "
+            "from django.core.wsgi import get_wsgi_application; "
+            "get_wsgi_application(); import_module(settings.ROOT_URLCONF); "
+            "print(json.dumps(sorted(sys.modules)))"
+        )
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings.SETTINGS_MODULE,
+               'PYTHONPATH': os.pathsep.join(chemin for chemin in sys.path if chemin)}
+        resultat = subprocess.run([sys.executable, '-X', 'importtime', '-c', script],
+                                  capture_output=True, text=True, env=env, check=True)
+
+        modules = set(json.loads(resultat.stdout))
+        self.assertEqual([nom for nom in self.MODULES_DIFFERES if nom in modules], [])
+        # Lignes « import time: <self µs> | <cumulé µs> | <module> »
+        duree_api = sum(
+            int(ligne.split('|')[0].split(':')[1]) for ligne in resultat.stderr.splitlines()
+            if ligne.startswith('import time:') and ligne.split('|')[2].strip().startswith('api.')
+        ) / 1000
+        self.assertLess(duree_api, self.BUDGET_API_MS)
+
+
+class SaisieSoinsTests(ReconstructionMixin, TestCase):
+    def setUp(self):
+        self.anp = creer_adherent(organisme_employeur='anp', section_cotisation='anp')
+        self.marsa = creer_adherent(organisme_employeur='marsa_maroc', section_cotisation='marsa_maroc')
+
+    def ligne(self, adherent_id, numero, **kwargs):
+        return {'adherent_id': adherent_id, 'num_recu': f'L{numero}', 'statut_dossier': 'recu',
+                'montant_dossier': '120.00', 'type_beneficier': 'Adherent', 'date_soin': '2025-03-10',
+                'date_fin_soin': '2025-03-12', **kwargs}
+
+    def envoyer(self, methode, lignes):
+        with CaptureQueriesContext(connection) as requetes:
+            response = getattr(self.client, methode)('/api/soins/lot/', lignes, content_type='application/json')
+        return response, len(requetes)
+
+    def test_creation(self):
+        lignes = [self.ligne(self.anp.id, 1), self.ligne(self.marsa.id, 2, statut_dossier='inconnu'),
+                  self.ligne(999999, 3), self.ligne(self.marsa.id, 4, date_soin='2025-04-02')]
+        response, _ = self.envoyer('post', lignes)
+        rapport = response.json()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((rapport['crees'], rapport['erreurs']), (2, 2))
+        self.assertEqual([sorted(r) for r in rapport['resultats']],
+                         [['id', 'index', 'tache_pdf'], ['erreurs', 'index'], ['erreurs', 'index'],
+                          ['id', 'index', 'tache_pdf']])
+        self.assertIn('adherent_id', rapport['resultats'][2]['erreurs'])
+        self.assertEqual(TachePdf.objects.filter(type_document='recu').count(), 2)
+        self.assertEqual(Modification.objects.filter(table='soins').count(), 2)
+        self.verifier_compteurs()
+        self.verifier_synthese()
+
+        # Même nombre de requêtes quelle que soit la taille du lot
+        _, deux = self.envoyer('post', [self.ligne(self.anp.id, 10 + i) for i in range(2)])
+        _, quarante = self.envoyer('post', [self.ligne(self.anp.id, 20 + i) for i in range(40)])
+        self.assertEqual(deux, quarante)
+
+    def test_modification(self):
+        soins = [creer_soin(self.anp), creer_soin(self.anp), creer_soin(self.marsa)]
+        lignes = [
+            {'id': soins[0].id, 'montant_dossier': '80.00', 'statut_dossier': 'rejet'},
+            {'id': soins[1].id, 'adherent_id': self.marsa.id, 'date_soin': '2025-05-01'},
+            {'id': soins[0].id, 'montant_dossier': '1.00'},
+            {'id': 999999, 'montant_dossier': '1.00'},
+        ]
+        response, _ = self.envoyer('patch', lignes)
+        rapport = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((rapport['modifies'], rapport['erreurs']), (2, 2))
+        soins[0].refresh_from_db()
+        self.assertEqual((soins[0].montant_dossier, soins[0].statut_dossier), (Decimal('80.00'), 'rejet'))
+        self.assertEqual(Soin.objects.get(id=soins[1].id).adherent_id, self.marsa.id)
+        self.verifier_compteurs()
+        self.verifier_synthese()
+
+        # Reçu à refaire : la tâche qui attend encore le worker est réutilisée
+        tache = TachePdf.objects.get(type_document='recu', objet_id=soins[0].id, statut='en_attente')
+        response, _ = self.envoyer('patch', lignes[:1])
+        self.assertEqual(response.json()['resultats'][0]['tache_pdf'], tache.id)
+
+    def test_corps_invalide(self):
+        self.assertEqual(self.envoyer('post', {'num_recu': 'L1'})[0].status_code, 400)
@@ -1,16 +1,19 @@
-# backend/urls.py
-
-from django.contrib import admin
-from django.urls import path, include
-from django.conf import settings
-from django.conf.urls.static import static
-
-urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('api/', include('api.urls')),  # accès via /api/adherents/ etc.
-    path('', include('api.urls')),      # accès direct à /recu/<id>/
-    
-    
-]
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+# backend/urls.py
+
+from django.contrib import admin
+from django.urls import path, include
+from django.conf import settings
+from django.conf.urls.static import static
+from api import views as api_views
+
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('api/dashboard/stats/', api_views.dashboard_stats, name='dashboard-stats'),
+    path('api/metrics/', api_views.metriques, name='metriques'),
+    path('api/', include('api.urls')),  # accès via /api/adherents/ etc.
+    path('', include('api.urls')),      # accès direct à /recu/<id>/
+    
+    
+]
+
+urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,179 +1,306 @@
-from datetime import timedelta
-from django.template.loader import render_to_string
-from django.http import HttpResponse
-from rest_framework import viewsets, status
-from rest_framework.response import Response
-from django_filters.rest_framework import DjangoFilterBackend
-
-from .models import Adherent, Cotisation, Soin
-from .serializers import AdherentSerializer, CotisationSerializer, SoinSerializer
-from .cotisation_filters import CotisationFilter
-from .utils import generer_carte_mutuelle_pdf
-from weasyprint import HTML
-from django.http import HttpResponse, Http404
-# Create your views here.
-
-from django.utils import timezone
-from dateutil.relativedelta import relativedelta
-from rest_framework import viewsets
-from django_filters.rest_framework import DjangoFilterBackend
-from .models import Adherent, Cotisation
-from .serializers import AdherentSerializer
-from .utils import generer_carte_mutuelle_pdf
-from django.shortcuts import get_object_or_404
-
-class AdherentViewSet(viewsets.ModelViewSet):
-    queryset = Adherent.objects.all()
-    serializer_class = AdherentSerializer
-    filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['nom', 'prenom', 'cin', 'statut', 'a_droit', 'nax']
-
-    def perform_create(self, serializer):
-        adherent = serializer.save()
-
-        generer_carte_mutuelle_pdf(adherent)
-
-        # Supprimer les cotisations existantes si jamais
-        Cotisation.objects.filter(cin=adherent.cin).delete()
-
-        if adherent.a_droit == 'ayant_droit':
-            # Créer cotisation active avec dates
-            date_debut = timezone.now().date()
-            Cotisation.objects.create(
-                adherent=adherent,
-                cin=adherent.cin,
-                cotisation='oui',
-                date_debut=date_debut,
-                # date_fin sera calculée automatiquement dans save()
-            )
-        else:
-            # Créer cotisation inactive sans dates
-            Cotisation.objects.create(
-                adherent=adherent,
-                cin=adherent.cin,
-                cotisation='non',
-                date_debut=None,
-                date_fin=None
-            )
-
-    def perform_update(self, serializer):
-        adherent = self.get_object()
-        old_a_droit = adherent.a_droit
-        adherent = serializer.save()
-        new_a_droit = adherent.a_droit
-
-        cotisation_qs = Cotisation.objects.filter(cin=adherent.cin)
-        cotisation = cotisation_qs.first() if cotisation_qs.exists() else None
-
-        if old_a_droit != new_a_droit:
-            if new_a_droit == 'ayant_droit':
-                if not cotisation:
-                    date_debut = timezone.now().date()
-                    Cotisation.objects.create(
-                        adherent=adherent,
-                        cin=adherent.cin,
-                        cotisation='oui',
-                        date_debut=date_debut,
-                    )
-                else:
-                    cotisation.cotisation = 'oui'
-                    cotisation.date_debut = timezone.now().date()
-                    cotisation.save()
-            else:  # new_a_droit == 'sans_droit'
-                if cotisation:
-                    cotisation.cotisation = 'non'
-                    cotisation.date_debut = None
-                    cotisation.date_fin = None
-                    cotisation.save()
-
-                    
-class CotisationViewSet(viewsets.ModelViewSet):
-    queryset = Cotisation.objects.all()
-    serializer_class = CotisationSerializer
-
-    def get_queryset(self):
-        queryset = Cotisation.objects.all()
-
-        cin = self.request.query_params.get('cin')
-        nax = self.request.query_params.get('nax')
-        cotisation = self.request.query_params.get('cotisation')
-
-        if cin:
-            queryset = queryset.filter(adherent__cin__icontains=cin)
-
-        if nax:
-            try:
-                queryset = queryset.filter(adherent__id=int(nax))
-            except ValueError:
-                pass  # au cas où nax n'est pas un entier
-
-        if cotisation in ['oui', 'non']:
-            queryset = queryset.filter(cotisation=cotisation)
-
-        return queryset
-        
-
-from .utils import generer_recu_pdf  # Assure-toi d’avoir cette fonction dans utils.py
-
-class SoinViewSet(viewsets.ModelViewSet):
-    queryset = Soin.objects.all()
-    serializer_class = SoinSerializer
-    filter_backends = [DjangoFilterBackend]
-    filterset_fields = {
-        'adherent__cin': ['exact'],
-        'adherent__nom': ['icontains'],
-        'adherent__prenom': ['icontains'],
-        'adherent__nax': ['exact'],
-        'num_recu': ['icontains'],
-        'statut_dossier': ['exact'],
-    }
-
-    def create(self, request, *args, **kwargs):
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        soin = serializer.save()
-        headers = self.get_success_headers(serializer.data)
-
-        # ✅ Génération PDF après création
-        generer_recu_pdf(soin)
-
-        return Response(
-            {'message': 'Soin ajouté avec succès', 'id': soin.id},
-            status=status.HTTP_201_CREATED,
-            headers=headers
-        )
-
-    def update(self, request, *args, **kwargs):
-        partial = kwargs.pop('partial', False)
-        instance = self.get_object()
-
-        serializer = self.get_serializer(instance, data=request.data, partial=partial)
-        serializer.is_valid(raise_exception=True)
-        soin = serializer.save()
-
-        # ✅ Génération PDF après modification
-        generer_recu_pdf(soin)
-
-        return Response(
-            {'message': 'Soin mis à jour avec succès', 'id': soin.id},
-            status=status.HTTP_200_OK
-        )
-
-def recu_pdf(request, soin_id):
-    soin = get_object_or_404(Soin, id=soin_id)
-
-    html_string = render_to_string('recu_template.html', {'soin': soin})
-    html = HTML(string=html_string)
-    pdf = html.write_pdf()
-
-    response = HttpResponse(pdf, content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="recu_{soin.num_recu}.pdf"'  # ✅ download automatique
-    return response
-
-
-
-
-
-
-
-
+import tempfile
+
+from django.http import HttpResponse, HttpResponseForbidden, FileResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from rest_framework import viewsets, status
+from rest_framework.response import Response
+from rest_framework.decorators import action, api_view
+from rest_framework.parsers import MultiPartParser
+from django_filters.rest_framework import DjangoFilterBackend
+
+from .models import Adherent, Cotisation, EtatAdherent, Soin
+from .serializers import (
+    AdherentSerializer, CotisationSerializer, EtatAdherentSerializer, RenouvellementSerializer, SoinSerializer,
+    TachePdfSerializer,
+)
+from .cotisation_filters import CotisationFilter
+from .cache_reponses import CacheReponseMixin
+from .instrumentation import MesureSerializerMixin
+from .listes_legeres import ListeLegereMixin
+from .export_analytique import ExportAnalytiqueMixin
+from .modifications import DeltaMixin
+from .pagination import EtatCursorPagination, StreamingListMixin
+from .recherche import RechercheAdherentFilter, suggestions
+# rendu_pdf n'importe WeasyPrint qu'au premier rendu : les processus API ne le chargent pas
+from . import (
+    cache_pdf, etat_adherents, export_recus, import_adherents, instrumentation, listes_legeres, rapports_soins,
+    rendu_pdf, renouvellement, saisie_soins, stats, taches_pdf,
+)
+
+class AdherentViewSet(DeltaMixin, ExportAnalytiqueMixin, CacheReponseMixin, ListeLegereMixin, StreamingListMixin,
+                        MesureSerializerMixin, viewsets.ModelViewSet):
+    queryset = Adherent.objects.all()
+    serializer_class = AdherentSerializer
+    colonnes = listes_legeres.COLONNES_ADHERENT
+    colonnes_liste = ('id', 'nax', 'nom', 'prenom', 'cin', 'statut', 'a_droit', 'organisme_employeur')
+    filter_backends = [DjangoFilterBackend, RechercheAdherentFilter]
+    filterset_fields = ['nom', 'prenom', 'cin', 'statut', 'a_droit', 'nax']
+    search_adherent_field = ''
+
+    def perform_create(self, serializer):
+        # La cotisation initiale est créée par le signal post_save (voir adhesion.py)
+        adherent = serializer.save()
+
+        # Carte rendue en arrière-plan par `manage.py pdf_worker`
+        taches_pdf.planifier('carte', adherent.id)
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def importer(self, request):
+        # Import CSV/XLSX par lots (voir import_adherents.py) ; cartes rendues par le worker
+        fichier = request.FILES.get('fichier')
+        if fichier is None:
+            return Response({'detail': 'Fichier manquant (champ "fichier")'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            rapport = import_adherents.importer(import_adherents.lire_fichier(fichier, fichier.name))
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(rapport, status=status.HTTP_201_CREATED if rapport['crees'] else status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'])
+    def lookup(self, request):
+        # Saisie semi-automatique (formulaire soins) : projection compacte, sans pagination
+        try:
+            limite = min(int(request.query_params.get('limit', 10)), 50)
+        except ValueError:
+            limite = 10
+        return Response(suggestions(request.query_params.get('q', ''), limite))
+
+    @action(detail=False, methods=['get'])
+    def etat(self, request):
+        # Situation dénormalisée : ?a_jour=1, ?echus=1, ?expire_dans=30, ?organisme=anp, ?section=, ?statut=
+        jour = timezone.now().date()
+        try:
+            queryset = etat_adherents.filtrer(EtatAdherent.objects.all(), request.query_params, jour)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        paginator = EtatCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = EtatAdherentSerializer(page, many=True, context={'jour': jour})
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'])
+    def eligibilite(self, request, pk=None):
+        # Contrôle au guichet : une lecture par clé primaire, sans jointure
+        etat = get_object_or_404(EtatAdherent, pk=pk)
+        return Response(EtatAdherentSerializer(etat, context={'jour': timezone.now().date()}).data)
+
+    @action(detail=True, methods=['get'])
+    def pdf(self, request, pk=None):
+        # Statut du dernier rendu de la carte mutuelle
+        tache = taches_pdf.derniere_tache('carte', self.get_object().id)
+        if tache is None:
+            return Response({'detail': 'Aucune carte planifiée'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(TachePdfSerializer(tache).data)
+                    
+COTISATION_LIST_FIELDS = [
+    'id', 'cin', 'cotisation', 'date_debut', 'date_fin', 'adherent',
+    'adherent__id', 'adherent__nax', 'adherent__nom', 'adherent__prenom',
+    'adherent__rib', 'adherent__date_recrutement', 'adherent__a_droit',
+]
+
+
+class CotisationViewSet(DeltaMixin, ExportAnalytiqueMixin, CacheReponseMixin, ListeLegereMixin, StreamingListMixin,
+                          MesureSerializerMixin, viewsets.ModelViewSet):
+    queryset = Cotisation.objects.all()
+    serializer_class = CotisationSerializer
+    tables_cache = ('adherents',)
+    relations_delta = ('adherent',)
+    colonnes = listes_legeres.COLONNES_COTISATION
+    colonnes_liste = ('id', 'nax', 'nom', 'prenom', 'cin', 'cotisation', 'date_debut', 'date_fin')
+    expansions = {'adherent': listes_legeres.ADHERENT_RESUME}
+    filter_backends = [RechercheAdherentFilter]
+    search_adherent_field = 'adherent'
+
+    def get_queryset(self):
+        # Une seule requête (jointure) avec les seules colonnes lues par CotisationSerializer
+        queryset = Cotisation.objects.select_related('adherent').only(*COTISATION_LIST_FIELDS)
+
+        cin = self.request.query_params.get('cin')
+        nax = self.request.query_params.get('nax')
+        cotisation = self.request.query_params.get('cotisation')
+
+        if cin:
+            queryset = queryset.filter(adherent__cin__icontains=cin)
+
+        if nax:
+            try:
+                queryset = queryset.filter(adherent__id=int(nax))
+            except ValueError:
+                pass  # au cas où nax n'est pas un entier
+
+        if cotisation in ['oui', 'non']:
+            queryset = queryset.filter(cotisation=cotisation)
+
+        return queryset
+
+    @action(detail=False, methods=['post'])
+    def renouvellement(self, request):
+        # Renouvellement / expiration de toute une section en requêtes ensemblistes
+        serializer = RenouvellementSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        donnees = serializer.validated_data
+        if donnees['operation'] == 'renouveler':
+            rapport = renouvellement.renouveler(donnees.get('section'), donnees.get('date'), donnees['dry_run'])
+        else:
+            rapport = renouvellement.expirer(donnees.get('section'), donnees.get('date'), donnees['dry_run'])
+        return Response(rapport)
+
+
+class SoinViewSet(DeltaMixin, ExportAnalytiqueMixin, CacheReponseMixin, ListeLegereMixin, StreamingListMixin,
+                    MesureSerializerMixin, viewsets.ModelViewSet):
+    # SoinSerializer imbrique l'adhérent complet : jointure plutôt qu'une requête par soin
+    queryset = Soin.objects.select_related('adherent')
+    serializer_class = SoinSerializer
+    tables_cache = ('adherents',)
+    relations_delta = ('adherent',)
+    colonnes = listes_legeres.COLONNES_SOIN
+    colonnes_liste = ('id', 'adherent_id', 'num_recu', 'statut_dossier', 'montant_dossier', 'date_soin')
+    expansions = {'adherent': listes_legeres.ADHERENT_RESUME}
+    filter_backends = [DjangoFilterBackend, RechercheAdherentFilter]
+    search_adherent_field = 'adherent'
+    filterset_fields = {
+        'adherent__cin': ['exact'],
+        'adherent__nom': ['icontains'],
+        'adherent__prenom': ['icontains'],
+        'adherent__nax': ['exact'],
+        'num_recu': ['icontains'],
+        'statut_dossier': ['exact'],
+        'date_soin': ['exact', 'gte', 'lte', 'year', 'month'],
+    }
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        soin = serializer.save()
+        headers = self.get_success_headers(serializer.data)
+
+        # ✅ Génération PDF après création (en arrière-plan)
+        tache = taches_pdf.planifier('recu', soin.id)
+
+        return Response(
+            {'message': 'Soin ajouté avec succès', 'id': soin.id, 'tache_pdf': tache.id},
+            status=status.HTTP_201_CREATED,
+            headers=headers
+        )
+
+    def update(self, request, *args, **kwargs):
+        partial = kwargs.pop('partial', False)
+        instance = self.get_object()
+
+        serializer = self.get_serializer(instance, data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        soin = serializer.save()
+
+        # ✅ Génération PDF après modification (en arrière-plan)
+        tache = taches_pdf.planifier('recu', soin.id)
+
+        return Response(
+            {'message': 'Soin mis à jour avec succès', 'id': soin.id, 'tache_pdf': tache.id},
+            status=status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['post', 'patch'])
+    def lot(self, request):
+        # Saisie par lot (voir saisie_soins.py) : POST crée, PATCH modifie ; reçus rendus par le worker
+        try:
+            if request.method == 'POST':
+                rapport = saisie_soins.creer(request.data)
+            else:
+                rapport = saisie_soins.modifier(request.data)
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        cree = request.method == 'POST' and rapport['crees']
+        return Response(rapport, status=status.HTTP_201_CREATED if cree else status.HTTP_200_OK)
+
+    @action(detail=True, methods=['get'])
+    def pdf(self, request, pk=None):
+        # Statut du dernier rendu du reçu
+        tache = taches_pdf.derniere_tache('recu', self.get_object().id)
+        if tache is None:
+            return Response({'detail': 'Aucun reçu planifié'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(TachePdfSerializer(tache).data)
+
+    @action(detail=False, methods=['get'])
+    def rapport(self, request):
+        # Totaux lus dans SyntheseSoins (une ligne par mois et dimension), pas dans la table des soins
+        try:
+            parametres = rapports_soins.depuis_requete(request.query_params, timezone.now().date())
+            lignes = rapports_soins.rapport(**parametres)
+            total = rapports_soins.rapport(parametres['debut'], parametres['fin'], 'total',
+                                           filtres=parametres['filtres'])
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        def formater(ligne):
+            return {**ligne, 'montant': str(ligne['montant']), 'moyenne': str(ligne['moyenne'])}
+
+        return Response({
+            'debut': f"{parametres['debut']:%Y-%m}",
+            'fin': f"{parametres['fin']:%Y-%m}",
+            'periode': parametres['periode'],
+            'grouper': parametres['grouper'],
+            'filtres': parametres['filtres'],
+            'lignes': [formater(ligne) for ligne in lignes],
+            'total': formater(total[0]) if total else {'nombre': 0, 'montant': '0.00', 'moyenne': '0.00'},
+        })
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        # Reçus filtrés comme la liste (?date_soin__year=&date_soin__month=, ?statut_dossier=, ...)
+        # ?sortie=zip (flux, sans limite) ou ?sortie=pdf (un seul document, nombre borné)
+        queryset = self.filter_queryset(self.get_queryset())
+        if request.query_params.get('sortie', 'zip') != 'pdf':
+            response = StreamingHttpResponse(export_recus.flux_zip(queryset), content_type='application/zip')
+            response['Content-Disposition'] = 'attachment; filename="recus.zip"'
+            return response
+
+        fichier = tempfile.TemporaryFile(suffix='.pdf')
+        try:
+            export_recus.ecrire_pdf_fusionne(queryset, fichier)
+        except ValueError as exc:
+            fichier.close()
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        fichier.seek(0)
+        return FileResponse(fichier, content_type='application/pdf', as_attachment=True, filename='recus.pdf')
+
+def recu_pdf(request, soin_id):
+    soin = get_object_or_404(Soin.objects.select_related('adherent'), id=soin_id)
+
+    # Le template est rendu (rapide) pour calculer l'empreinte ; WeasyPrint
+    # n'intervient que si ce PDF n'est pas encore dans le cache.
+    html_string = rendu_pdf.html('recu_template.html', {'soin': soin})
+    cle = cache_pdf.empreinte('recu_template.html', html_string)
+    # ETag seul : l'empreinte couvre les données et le template (pas de date de modification fiable)
+    etag = f'"{cle}"'
+    non_modifie = get_conditional_response(request, etag=etag)
+    if non_modifie is not None:
+        # Revalidé : compte comme un accès pour la purge
+        cache_pdf.marquer_acces(cache_pdf.chemin_cache(cle))
+        return non_modifie
+
+    chemin = cache_pdf.obtenir(cle, 'recu_template.html', html_string)
+    response = FileResponse(
+        open(chemin, 'rb'),
+        content_type='application/pdf',
+        as_attachment=True,  # ✅ download automatique
+        filename=f"recu_{soin.num_recu}.pdf",
+    )
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@api_view(['GET'])
+def dashboard_stats(request):
+    # Compteurs pré-agrégés : coût constant quelle que soit la taille des tables
+    return Response(stats.tableau_de_bord())
+
+
+def metriques(request):
+    # Format texte Prometheus : agrégats de tous les processus (voir instrumentation.py)
+    if not instrumentation.acces_autorise(request):
+        return HttpResponseForbidden()
+    return HttpResponse(instrumentation.agreger().prometheus(),
+                        content_type='text/plain; version=0.0.4; charset=utf-8')